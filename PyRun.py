@@ -5,20 +5,79 @@
 # 주요 기능:
 #   - 엑셀 기반 수용가 단말기 등록용 SQL VALUES 자동 생성
 #   - 수용가 통계 분석 (수량, 항목 분류 등)
-#   - 수용가번호 중복 항목 적색 표시 후 저장
+#   - 수용가번호 중복 항목 적색 표시 후 저장 (주소/수용가명 유사 중복, 근접 좌표 포함)
+#   - 여러 엑셀 파일 일괄 처리 (python PyRun.py batch <폴더|패턴> --account 계정명)
+#   - 큰 파일 청크 단위 SQL 생성 (python PyRun.py sql <파일> --account 계정명), 읽기 백엔드 비교 (read-bench)
+#   - 큰 파일 청크 단위 통계/교차표 (python PyRun.py stats <파일> --crosstab-xlsx 교차표.xlsx)
+#   - 감시 폴더 자동 처리 (python PyRun.py watch <폴더> --account 계정명 -o 결과폴더)
+#   - 성능 측정 (python PyRun.py bench --rows 1k,10k,100k,1M --compare 이전결과.json)
 # =============================================
 
 import time
+STARTUP_STARTED = time.perf_counter()   # 시작 시간 측정 기준 (첫 화면 표시까지)
 import os
-import requests
-import gspread
-import pandas as pd
+import sys
+import glob
+import argparse
+import json
+import re
+import unicodedata
+import queue
+import hashlib
+import bisect
+import shutil
+import tempfile
+import importlib
+import importlib.util
+import sqlite3
+import itertools
+from array import array
+from collections import Counter
+import threading
+import cProfile
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from datetime import datetime
+from datetime import datetime, timedelta
 from tkinter import ttk
-from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill
+import tkinter.font as tkfont
+
+def lazy_import(name):
+    """처음 속성에 접근할 때 실제로 읽히는 모듈 (이미 읽혀 있으면 그 모듈)
+
+    pandas/numpy/openpyxl/gspread는 합쳐서 0.5초 가까이 걸리므로 GUI 창을 먼저 띄우고 읽는다.
+    여러 스레드가 동시에 처음 접근하면 안 되므로 GUI에서는 load_heavy_modules로 한 번에 읽는다.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+gspread = lazy_import('gspread')
+openpyxl = lazy_import('openpyxl')
+
+heavy_modules_lock = threading.Lock()
+heavy_modules_ready = threading.Event()
+
+def load_heavy_modules():
+    """지연 import한 모듈을 지금 읽음 (여러 스레드에서 불러도 한 번만) → 걸린 시간(초)"""
+    started = time.perf_counter()
+    with heavy_modules_lock:
+        for module in (np, pd, openpyxl, gspread):
+            getattr(module, '__file__')
+        for name in ('openpyxl.styles', 'openpyxl.formatting.rule', 'openpyxl.utils'):
+            importlib.import_module(name)
+        heavy_modules_ready.set()
+    return time.perf_counter() - started
 
 # 📌 엑셀 컬럼명 정의 (20개 항목)
 COLUMNS = [
@@ -27,8 +86,2700 @@ COLUMNS = [
     '구경', '통신', '단말 부번호', '단말 주번호', '단말 회사', '단말 설치일'
 ]
 
-SITE_SQ = 4
-COMPANY_SQ = 9
+SITE_SQ = 4
+COMPANY_SQ = 9
+
+# 📌 SQL VALUES 한 행 포맷 (20개 값)
+VALUES_ROW_FORMAT = "('{}', '{}', '{}', '{}', {}, {}, '{}', {}, {}, '{}', '{}', '{}', {}, '{}', {}, '{}', '{}', '{}', {}, '{}'::timestamp)"
+
+# 📌 SQL VALUES에 들어가는 값 순서 (엑셀 컬럼명 또는 상수)
+SQL_VALUE_FIELDS = [
+    '수용가명', '수용가번호', '구주소', '신주소', '경도', '위도', '업종', 'SITE_SQ', 'COMPANY_SQ',
+    '수용가 전화번호', '수용가 대상 년도', '검침원', '검침일', '계량기번호',
+    '구경', '통신', '단말 부번호', '단말 주번호', 'COMPANY_SQ', '단말 설치일'
+]
+
+# 📌 SQL 출력 형식: VALUES 목록/INSERT 문, 또는 COPY FROM STDIN용 데이터 파일 (csv / text 형식 tsv)
+OUTPUT_FORMATS = ('values', 'csv', 'tsv')
+
+SQL_CHUNK_ROWS = 5000   # 파일 저장 시 한 번에 포맷/기록하는 행 수
+PREVIEW_LINES = 300     # 파일 저장 시 결과창에 보여줄 줄 수
+
+# 📌 임포트 이력 인덱스 (이전에 SQL 생성된 키와의 중복 확인)
+IMPORT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".importchecker", "imported_keys.sqlite3")
+IMPORT_KEY_COLUMNS = ['수용가번호', '계량기번호', '단말 주번호']
+
+def safe_float(val, col):
+    if val == '':
+        raise ValueError(f"{col} 값이 비어있음")
+    return float(val)
+
+def safe_int(val, col):
+    if val == '':
+        raise ValueError(f"{col} 값이 비어있음")
+    return int(val)
+
+def parse_install_date(val):
+    return pd.to_datetime(val).date()
+
+# 단말 설치일 형식 (정규식, strptime 형식), 앞에서부터 시도. 공백 정리 후 값 전체가 맞아야 함
+# 시각이 붙은 형식 외에는 공백과 끝의 '.'을 지운 값에 맞춘다 ('2023. 1. 5.' → '2023.1.5')
+INSTALL_DATE_FORMATS = [
+    (r"\d{4}-\d{1,2}-\d{1,2}", '%Y-%m-%d'),
+    (r"\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{2}:\d{2}", '%Y-%m-%d %H:%M:%S'),
+    (r"\d{4}\.\d{1,2}\.\d{1,2}", '%Y.%m.%d'),
+    (r"\d{4}/\d{1,2}/\d{1,2}", '%Y/%m/%d'),
+    (r"\d{8}", '%Y%m%d'),
+    (r"\d{4}년\d{1,2}월\d{1,2}일", '%Y년%m월%d일'),
+]
+EXCEL_SERIAL_PATTERN = r"\d{5}(?:\.\d+)?"     # 엑셀 날짜 일련번호 (10000~99999 → 1927~2173년)
+EXCEL_EPOCH = '1899-12-30'
+
+def parse_install_dates(values):
+    """단말 설치일 고유값 배열 → ({값: 'YYYY-MM-DD'}, {값: 오류 메시지})
+
+    INSTALL_DATE_FORMATS와 엑셀 일련번호를 형식마다 한 번에 파싱하고,
+    어느 형식에도 맞지 않는 값만 parse_install_date(형식 추론)로 하나씩 처리한다.
+    그래서 예전에 읽히던 값은 같은 날짜로, 읽히지 않던 값은 같은 오류 메시지로 나온다.
+    """
+    keys = pd.Series(values, dtype=object).astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    compact = keys.str.replace(" ", "", regex=False).str.rstrip('.')
+    parsed = pd.Series(pd.NaT, index=keys.index, dtype='datetime64[s]')
+
+    for pattern, date_format in INSTALL_DATE_FORMATS:
+        source = keys if ' ' in date_format else compact
+        pending = parsed.isna() & source.str.fullmatch(pattern)
+        if pending.any():
+            parsed[pending] = pd.to_datetime(source[pending], format=date_format, errors='coerce')
+
+    pending = parsed.isna() & keys.str.fullmatch(EXCEL_SERIAL_PATTERN)
+    if pending.any():
+        parsed[pending] = pd.Timestamp(EXCEL_EPOCH) + pd.to_timedelta(np.floor(keys[pending].astype(float)), unit='D')
+
+    converted = {values[i]: f"{parsed[i].date()}" for i in np.flatnonzero(parsed.notna().to_numpy())}
+    errors = {}
+    for i in np.flatnonzero(parsed.isna().to_numpy()):
+        try:
+            converted[values[i]] = f"{parse_install_date(values[i])}"
+        except Exception as e:
+            errors[values[i]] = str(e)
+    return converted, errors
+
+def convert_column(series, convert, parse_values=None):
+    """고유값마다 한 번만 변환 → (변환된 문자열 Series, 오류 메시지 Series)
+
+    parse_values(고유값 배열 → (변환 dict, 오류 dict))를 주면 값마다 convert를 부르는 대신 한 번에 변환한다.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # 범주형이면 범주마다 한 번 변환하고 코드로 펼침
+        text, error = convert_column(pd.Series(series.cat.categories, dtype=object), convert, parse_values)
+        codes = series.cat.codes.to_numpy()
+        return (pd.Series(text.to_numpy()[codes], index=series.index, dtype=object),
+                pd.Series(error.to_numpy()[codes], index=series.index, dtype=object))
+    if parse_values is not None:
+        converted, errors = parse_values(series.unique())
+    else:
+        converted = {}
+        errors = {}
+        for value in series.unique():
+            try:
+                converted[value] = f"{convert(value)}"
+            except Exception as e:
+                errors[value] = str(e)
+    text = series.map(converted).fillna('').astype(object)
+    error = series.map(errors).fillna('').astype(object)
+    return text, error
+
+# 숫자/날짜 변환 (튜플 생성 시 평가되던 순서 유지)
+CONVERSIONS = {
+    '경도': lambda v: safe_float(v, '경도'),
+    '위도': lambda v: safe_float(v, '위도'),
+    '검침일': lambda v: safe_int(v, '검침일'),
+    '구경': lambda v: safe_int(v, '구경'),
+    '단말 설치일': parse_install_date,
+}
+# 컬럼 전체를 한 번에 변환하는 파서 (있으면 CONVERSIONS의 값별 함수 대신 사용)
+COLUMN_PARSERS = {
+    '단말 설치일': parse_install_dates,
+}
+VALUES_COLUMN = 'VALUES'            # 재검증 캐시 사용 시 sql_df에 붙는 행별 VALUES 문자열
+CONVERT_ERROR_COLUMN = '변환오류'    # 재검증 캐시 사용 시 sql_df에 붙는 행별 첫 번째 변환 오류
+
+def convert_rows(df):
+    """숫자/날짜 변환 → (변환된 값 DataFrame, 행별 첫 번째 변환 오류 Series)"""
+    converted = pd.DataFrame(index=df.index)
+    error = pd.Series('', index=df.index, dtype=object)
+    for col, convert in CONVERSIONS.items():
+        text, col_error = convert_column(df[col], convert, COLUMN_PARSERS.get(col))
+        converted[col] = text
+        error = error.where(error != '', col_error)
+    return converted, error
+
+def prepare_sql_rows(df, selected_num_len, imported_masks=None, duplicated_admin_nos=None, cached=None):
+    """컬럼 단위 검증/변환 → (SQL 값 DataFrame, 행별 오류 메시지 Series)
+
+    행 단위 루프와 같은 순서(CASE #1~#3 → 경도 → 위도 → 검침일 → 구경 → 설치일)로
+    첫 번째 오류만 기록한다. 오류가 없는 행은 빈 문자열.
+    imported_masks({컬럼명: bool Series}, find_imported_keys 결과)를 주면
+    이전 임포트와 겹치는 키를 CASE #4~#6으로 추가 검사한다.
+    duplicated_admin_nos를 주면 (청크 단위 처리 시 파일 전체 기준) 그 집합으로 중복을 판단한다.
+    cached(cached_rows 결과, 캐시에 없는 행은 NaN)를 주면 캐시에 있는 행은 변환/VALUES 포맷을 건너뛰고,
+    sql_df에 VALUES/변환오류 컬럼을 붙여 돌려준다 (save_row_cache로 저장).
+    selected_num_len은 수용가번호길이(int) 또는 계정 검증 계획(get_rule_plan 결과)이며,
+    계획에 고객번호구조가 있으면 길이가 맞는 행도 구조가 다르면 CASE #1로 기록한다.
+    """
+    plan = as_rule_plan(selected_num_len)
+    admin_no = df['수용가번호']
+    if duplicated_admin_nos is None:
+        admin_no_counts = admin_no.value_counts()
+        duplicated_admin_nos = admin_no_counts[admin_no_counts > 1].index
+
+    errors = pd.Series('', index=df.index, dtype=object)
+
+    def record(failed, messages):
+        target = failed & (errors == '')
+        errors[target] = messages[target]
+
+    # 검증 케이스 (번호는 기존 [CASE #n] 메시지와 동일)
+    validation_cases = [
+        (1, admin_no.str.len() == plan['num_len'], "수용가번호 길이 불일치"),
+        (2, ~admin_no.isin(list(duplicated_admin_nos)), "수용가번호 중복"),
+        (3, df['수용가 전화번호'].str.len() < 14, "수용가 전화번호 13자리 초과"),
+    ]
+    if plan['pattern'] is not None:
+        validation_cases.insert(1, (1, ~structure_mismatch(admin_no, plan['pattern']), f"수용가번호 구조 불일치 (구조: {plan['structure']})"))
+    for case_num, passed, err_msg in validation_cases:
+        record(~passed, f"[CASE #{case_num}] {err_msg} (값: " + admin_no.astype(object) + ")")
+
+    # 이전 임포트 중복 검사 (임포트 이력 인덱스 사용 시)
+    if imported_masks:
+        for case_num, col in enumerate(IMPORT_KEY_COLUMNS, 4):
+            if col in imported_masks:
+                record(imported_masks[col], f"[CASE #{case_num}] {col} 이전 임포트와 중복 (값: " + df[col].astype(object) + ")")
+
+    # 숫자/날짜 변환 (캐시를 쓰면 캐시에 없는 행만)
+    if cached is None:
+        converted, convert_error = convert_rows(df)
+    else:
+        converted = cached[list(CONVERSIONS)].astype(object)
+        convert_error = cached[CONVERT_ERROR_COLUMN].astype(object)
+        missing = convert_error.isna()
+        if missing.any():
+            new_converted, new_error = convert_rows(df[missing])
+            converted.loc[missing] = new_converted
+            convert_error[missing] = new_error
+    record(convert_error != '', convert_error)
+
+    # 변환하지 않는 컬럼은 읽은 dtype 그대로 (범주형이면 VALUES 포맷 시 범주 단위로 처리됨)
+    sql_df = pd.DataFrame(index=df.index)
+    for col in COLUMNS:
+        sql_df[col] = converted[col] if col in CONVERSIONS else df[col]
+    sql_df['SITE_SQ'] = str(SITE_SQ)
+    sql_df['COMPANY_SQ'] = str(COMPANY_SQ)
+
+    # 캐시 저장용: 행 안 변환까지 통과한 행은 (전체 기준 검증 결과와 상관없이) VALUES 문자열을 만들어 둠
+    if cached is not None:
+        values = cached[VALUES_COLUMN].astype(object)
+        pending = values.isna() & (convert_error == '')
+        values[pending] = values_text(sql_df[pending])
+        sql_df[VALUES_COLUMN] = values
+        sql_df[CONVERT_ERROR_COLUMN] = convert_error
+    return sql_df, errors
+
+def quote_sql_list(values):
+    """값 목록 → "'a','b'" 형식 (작은따옴표는 두 번 써서 이스케이프)"""
+    return ",".join("'" + str(x).replace("'", "''") + "'" for x in values)
+
+def values_text(sql_df):
+    """SQL 값 DataFrame → 행별 VALUES 문자열 Series"""
+    columns = [sql_df[field].str.replace("'", "''", regex=False).tolist() for field in SQL_VALUE_FIELDS]
+    return pd.Series([VALUES_ROW_FORMAT.format(*values) for values in zip(*columns)], index=sql_df.index, dtype=object)
+
+def format_sql_values(sql_df, errors):
+    """준비된 값/오류로 VALUES 행 또는 '-- [ERROR #n]' 주석 목록 생성
+
+    sql_df에 VALUES 컬럼이 있으면 (재검증 캐시 사용 시) 다시 포맷하지 않고 그 문자열을 쓴다.
+    """
+    values = sql_df[VALUES_COLUMN] if VALUES_COLUMN in sql_df.columns else values_text(sql_df)
+    return [
+        f"-- [ERROR #{idx_row+1}] {err}" if err else value
+        for idx_row, err, value in zip(sql_df.index, errors.tolist(), values.tolist())
+    ]
+
+def copy_text(rows, output_format):
+    """성공 행 값(SQL_VALUE_FIELDS 순서) → COPY FROM STDIN 데이터 문자열
+
+    - csv: 모든 값을 큰따옴표로 감싸고 내부 큰따옴표는 두 번 (빈 문자열이 NULL로 읽히지 않게)
+    - tsv: PostgreSQL text 형식 (역슬래시/탭/줄바꿈을 \\, \\t, \\n, \\r로 이스케이프)
+    """
+    if rows.empty:
+        return ''
+    if output_format == 'csv':
+        columns = ['"' + rows.iloc[:, i].astype(str).str.replace('"', '""', regex=False) + '"' for i in range(rows.shape[1])]
+        sep = ','
+    else:
+        columns = [
+            rows.iloc[:, i].astype(str).str.replace('\\', '\\\\', regex=False).str.replace('\t', '\\t', regex=False)
+            .str.replace('\n', '\\n', regex=False).str.replace('\r', '\\r', regex=False)
+            for i in range(rows.shape[1])
+        ]
+        sep = '\t'
+    return "\n".join(columns[0].str.cat(columns[1:], sep=sep).tolist()) + "\n"
+
+def iter_prepared_chunks(df, selected_num_len, chunk_rows=SQL_CHUNK_ROWS, prepared=None):
+    """chunk_rows 행씩 (원본 청크, SQL 값 청크, 오류 청크) 생성 (검증은 파일 전체 기준)
+
+    prepared는 미리 계산한 prepare_sql_rows 결과 (생략 시 여기서 계산)
+    """
+    sql_df, errors = prepared or prepare_sql_rows(df, selected_num_len)
+    for start in range(0, len(df), chunk_rows):
+        end = start + chunk_rows
+        yield df.iloc[start:end], sql_df.iloc[start:end], errors.iloc[start:end]
+
+def value_chunks(prepared_chunks):
+    """(원본, SQL 값, 오류) 청크 → (values_list, success_admin_no_list) 청크"""
+    for df, sql_df, errors in prepared_chunks:
+        yield format_sql_values(sql_df, errors), df['수용가번호'][errors == ''].tolist()
+
+def build_sql_values(df, selected_num_len):
+    """SQL VALUES 행 목록 생성 → (values_list, success_admin_no_list, success_count, fail_count)
+
+    예전 행 단위 루프와 같은 형태의 결과 (tests/test_sql_values.py에서 비교)
+    """
+    sql_df, errors = prepare_sql_rows(df, selected_num_len)
+    values_list = format_sql_values(sql_df, errors)
+    success_mask = errors == ''
+    success_admin_no_list = df.loc[success_mask, '수용가번호'].tolist()
+    success_count = int(success_mask.sum())
+    fail_count = len(df) - success_count
+    return values_list, success_admin_no_list, success_count, fail_count
+
+def write_sql_file(df, selected_num_len, sql_path, insert_prefix='', batch_rows=0, preview_lines=PREVIEW_LINES, progress=None, prepared=None,
+                   output_format='values'):
+    """VALUES를 청크 단위로 .sql 파일에 바로 기록 (메모리에 전체 문자열을 만들지 않음)
+
+    - insert_prefix가 비어 있으면 VALUES 목록만 기록
+    - insert_prefix와 batch_rows가 있으면 batch_rows행마다 'INSERT ... VALUES ...;' 문으로 분할
+    - output_format이 'csv'/'tsv'면 COPY 문과 데이터 파일로 기록 (write_copy_chunks 참고)
+    - 성공한 수용가번호 목록은 '<파일명>_수용가목록.txt'에 따로 기록
+    - progress(status, detail, value, maximum)는 청크마다 호출 (생략 가능)
+    - prepared는 미리 계산한 prepare_sql_rows 결과 (생략 가능)
+    반환: (success_count, fail_count, preview, admin_list_path)
+    """
+    chunks = iter_prepared_chunks(df, selected_num_len, prepared=prepared)
+    return write_output(chunks, sql_path, len(df), output_format, insert_prefix, batch_rows, preview_lines, progress)
+
+def write_output(prepared_chunks, sql_path, total_rows=None, output_format='values', insert_prefix='', batch_rows=0,
+                 preview_lines=PREVIEW_LINES, progress=None):
+    """(원본, SQL 값, 오류) 청크들을 출력 형식에 맞게 기록 (write_sql_file 참고)"""
+    if output_format == 'values':
+        return write_sql_chunks(value_chunks(prepared_chunks), sql_path, total_rows, insert_prefix, batch_rows, preview_lines, progress)
+    return write_copy_chunks(prepared_chunks, sql_path, total_rows, output_format, insert_prefix, preview_lines, progress)
+
+def write_sql_chunks(chunks, sql_path, total_rows=None, insert_prefix='', batch_rows=0, preview_lines=PREVIEW_LINES, progress=None):
+    """(values_list, success_admin_no_list) 청크들을 .sql 파일로 기록 (write_sql_file 참고)"""
+    admin_list_path = os.path.splitext(sql_path)[0] + "_수용가목록.txt"
+    success_count = 0
+    fail_count = 0
+    preview = []
+    rows_in_statement = 0
+    statement_open = False
+
+    with open(sql_path, 'w', encoding='utf-8') as sql_file, open(admin_list_path, 'w', encoding='utf-8') as admin_file:
+        def write_line(line):
+            sql_file.write(line + "\n")
+            if len(preview) < preview_lines:
+                preview.append(line)
+
+        first_admin = True
+        for values_list, success_admin_no_list in chunks:
+            for line in values_list:
+                if line.startswith("-- [ERROR #"):
+                    write_line(line)
+                    fail_count += 1
+                    continue
+                if insert_prefix and not statement_open:
+                    write_line(insert_prefix)
+                    statement_open = True
+                    rows_in_statement = 0
+                # 쉼표를 앞에 붙여 오류 주석 줄이 사이에 끼어도 SQL이 깨지지 않게 함
+                write_line((" " if rows_in_statement == 0 else ",") + line)
+                rows_in_statement += 1
+                success_count += 1
+                if insert_prefix and batch_rows and rows_in_statement >= batch_rows:
+                    write_line(";")
+                    statement_open = False
+            if success_admin_no_list:
+                admin_file.write(("" if first_admin else ",") + quote_sql_list(success_admin_no_list))
+                first_admin = False
+            if progress:
+                done = success_count + fail_count
+                progress("SQL 파일 기록 중...", f"{done}/{total_rows or '?'}행", done, total_rows)
+        if statement_open:
+            write_line(";")
+
+    return success_count, fail_count, preview, admin_list_path
+
+def write_copy_chunks(prepared_chunks, sql_path, total_rows=None, output_format='csv', insert_prefix='', preview_lines=PREVIEW_LINES, progress=None):
+    """COPY 적재용 출력: sql_path에 psql '\\copy ... FROM '<데이터 파일>'' 명령과 오류 주석, '<파일명>.csv|.tsv'에 성공 행 데이터
+
+    sql 파일은 데이터 파일이 있는 폴더에서 'psql -f'로 바로 실행할 수 있다.
+    (COPY ... FROM STDIN을 두면 psql이 뒤따르는 오류 주석을 데이터로 읽으므로 쓰지 않음)
+    대상 테이블/컬럼은 insert_prefix('INSERT INTO 테이블 (컬럼, ...) VALUES')에서 가져온다.
+    반환: write_sql_file과 같음 (미리보기는 \\copy 명령, 오류 주석, 데이터 앞부분 순)
+    """
+    stem = os.path.splitext(sql_path)[0]
+    data_path = f"{stem}.{output_format}"
+    data_name = os.path.basename(data_path)
+    admin_list_path = stem + "_수용가목록.txt"
+    success_count = 0
+    fail_count = 0
+    statement = copy_statement(insert_prefix, output_format)
+    header = [
+        f"-- {data_name} 적재: 이 폴더에서 psql -d <DB> -f {os.path.basename(sql_path)}",
+        f"--   (또는 psql -d <DB> -c \"{statement}\" < {data_name})",
+        "\\copy" + copy_statement(insert_prefix, output_format, source="'" + data_name.replace("'", "''") + "'")[len("COPY"):],
+    ]
+    preview = header[:preview_lines]
+    data_preview = []
+
+    with open(sql_path, 'w', encoding='utf-8') as sql_file, \
+            open(data_path, 'w', encoding='utf-8', newline='') as data_file, \
+            open(admin_list_path, 'w', encoding='utf-8') as admin_file:
+        sql_file.write("\n".join(header) + "\n")
+        first_admin = True
+        for df, sql_df, errors in prepared_chunks:
+            failed = errors[errors != '']
+            for idx_row, err in zip(failed.index, failed.tolist()):
+                line = f"-- [ERROR #{idx_row+1}] {err}"
+                sql_file.write(line + "\n")
+                if len(preview) < preview_lines:
+                    preview.append(line)
+            fail_count += len(failed)
+
+            success_mask = errors == ''
+            data = copy_text(sql_df.loc[success_mask, SQL_VALUE_FIELDS], output_format)
+            data_file.write(data)
+            if len(data_preview) < preview_lines:
+                data_preview += data.splitlines()[:preview_lines - len(data_preview)]
+            success_count += int(success_mask.sum())
+
+            success_admin_no_list = df['수용가번호'][success_mask].tolist()
+            if success_admin_no_list:
+                admin_file.write(("" if first_admin else ",") + quote_sql_list(success_admin_no_list))
+                first_admin = False
+            if progress:
+                done = success_count + fail_count
+                progress("COPY 파일 기록 중...", f"{done}/{total_rows or '?'}행", done, total_rows)
+
+    preview += [f"-- {os.path.basename(data_path)}"] + data_preview
+    return success_count, fail_count, preview[:preview_lines], admin_list_path
+
+def to_import_columns(raw_df):
+    """원본 시트(dtype=str)에서 20개 임포트 컬럼만 잘라 COLUMNS 이름을 붙임"""
+    df = raw_df.iloc[:, 1:1+len(COLUMNS)]
+    df.columns = COLUMNS
+    return df
+
+# =============================================
+# 📌 재검증 캐시 (행 내용 해시)
+# =============================================
+# 같은 파일을 몇 행만 고쳐서 다시 보내는 경우, 이전 실행에서 변환/포맷한 결과를 행 내용 해시로 찾아 재사용.
+# 캐시는 파일 경로별로 마지막 실행 한 번만 보관한다 (변경된 행 안내용). 값은 행 내용만으로 정해지므로
+# 다른 파일과 해시가 겹쳐도 결과는 같다.
+
+ROW_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".importchecker", "row_cache")
+ROW_CACHE_ENABLED = os.environ.get('IMPORTCHECKER_ROW_CACHE', '1') != '0'
+ROW_CACHE_VERSION = 3       # 변환/포맷 규칙이 바뀌면 올려서 이전 캐시를 무시
+ROW_CACHE_MAX_FILES = 50    # 보관할 캐시 파일 수 (오래된 것부터 삭제)
+ROW_CACHE_COLUMNS = list(CONVERSIONS) + [CONVERT_ERROR_COLUMN, VALUES_COLUMN]
+CHANGED_ROWS_SHOWN = 20     # 변경된 행 안내에 표시할 엑셀 행 번호 수
+
+def row_hashes(df, columns=None):
+    """행 내용 해시 (uint64 배열, 행 위치와 무관)"""
+    # 값이 대부분 고유해서 categorize(고유값 먼저 추림)를 끄는 편이 빠름
+    return pd.util.hash_pandas_object(df[columns or COLUMNS], index=False, categorize=False).to_numpy()
+
+def row_cache_path(file_path, kind, cache_dir=ROW_CACHE_DIR):
+    # 폴더가 다른 같은 이름 파일(2024/고객.xlsx, 2025/고객.xlsx)이 서로 덮어쓰지 않게 전체 경로로 구분
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(file_path)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{kind}.{digest}.pkl")
+
+def load_row_cache(file_path, kind, cache_dir=ROW_CACHE_DIR):
+    """이전 실행 캐시 {'hashes': 행 해시 배열, 'table': 해시별 결과 DataFrame 또는 None} (없으면 None)"""
+    try:
+        cache = pd.read_pickle(row_cache_path(file_path, kind, cache_dir))
+    except Exception:
+        # 없거나 깨진 캐시는 처음 실행과 같게 처리
+        return None
+    if not isinstance(cache, dict) or cache.get('version') != ROW_CACHE_VERSION:
+        return None
+    return cache
+
+def save_row_cache(file_path, kind, hashes, table=None, cache_dir=ROW_CACHE_DIR):
+    """이번 실행의 행 해시 (및 결과 표)를 저장하고 오래된 캐시 파일 정리"""
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = row_cache_path(file_path, kind, cache_dir)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    pd.to_pickle({'version': ROW_CACHE_VERSION, 'file': os.path.abspath(file_path), 'saved_at': time.time(),
+                  'hashes': hashes, 'table': table}, tmp_path)
+    os.replace(tmp_path, cache_path)
+
+    cache_files = sorted(glob.glob(os.path.join(cache_dir, "*.pkl")), key=os.path.getmtime, reverse=True)
+    for old_path in cache_files[ROW_CACHE_MAX_FILES:]:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+
+def cached_rows(cache, hashes, index):
+    """캐시 표에서 행 해시로 찾은 결과를 df 행 순서로 정렬 (캐시에 없는 행은 NaN)"""
+    table = cache['table'] if cache and cache.get('table') is not None else pd.DataFrame(columns=ROW_CACHE_COLUMNS, dtype=object)
+    rows = table.reindex(hashes)
+    rows.index = index
+    return rows
+
+def row_cache_table(hashes, sql_df):
+    """prepare_sql_rows(cached=...) 결과 → 저장할 해시별 결과 표 (같은 내용의 행은 하나만)"""
+    table = sql_df[ROW_CACHE_COLUMNS].set_axis(hashes)
+    return table[~table.index.duplicated()]
+
+def changed_rows(cache, hashes, index):
+    """이전 실행과 비교 → {'changed': 새로 생기거나 바뀐 행 인덱스 목록, 'removed': 이전 실행에만 있던 행 수, 'reused': 재사용 행 수}
+
+    이전 실행 캐시가 없으면 None
+    """
+    if cache is None:
+        return None
+    previous = cache['hashes']
+    changed = ~np.isin(hashes, previous)
+    return {
+        'changed': index[changed].tolist(),
+        'removed': int((~np.isin(previous, hashes)).sum()),
+        'reused': int(len(hashes) - changed.sum()),
+    }
+
+def prepare_sql_rows_incremental(df, selected_num_len, file_path, imported_masks=None):
+    """재검증 캐시를 쓰는 prepare_sql_rows → (prepared, 변경 정보 dict 또는 None)
+
+    바뀐 행만 숫자/날짜 변환과 VALUES 포맷을 하고 나머지는 이전 실행 결과를 재사용한다.
+    수용가번호 중복과 임포트 이력 검사는 파일 전체 기준이라 매번 전체로 한다.
+    """
+    if not ROW_CACHE_ENABLED:
+        return prepare_sql_rows(df, selected_num_len, imported_masks), None
+    hashes = row_hashes(df)
+    cache = load_row_cache(file_path, 'sql')
+    prepared = prepare_sql_rows(df, selected_num_len, imported_masks, cached=cached_rows(cache, hashes, df.index))
+    save_row_cache(file_path, 'sql', hashes, row_cache_table(hashes, prepared[0]))
+    return prepared, changed_rows(cache, hashes, df.index)
+
+def track_row_changes(df, file_path, kind):
+    """행 해시만 저장하고 이전 실행과 비교 → 변경 정보 dict (처음이거나 캐시를 안 쓰면 None)"""
+    if not ROW_CACHE_ENABLED:
+        return None
+    hashes = row_hashes(df, list(df.columns))
+    cache = load_row_cache(file_path, kind)
+    save_row_cache(file_path, kind, hashes)
+    return changed_rows(cache, hashes, df.index)
+
+def format_row_changes(changes):
+    """변경 정보 → 안내 문구 (엑셀 행 번호는 앞부분만)"""
+    if changes is None:
+        return ""
+    if not changes['changed'] and not changes['removed']:
+        return "🔄 이전 실행 대비 변경된 행 없음"
+    excel_rows = [str(idx + 2) for idx in changes['changed'][:CHANGED_ROWS_SHOWN]]  # 헤더 + 1-based
+    text = f"🔄 이전 실행 대비 변경된 행 {len(changes['changed'])}개"
+    if excel_rows:
+        text += f" (엑셀 행: {', '.join(excel_rows)}"
+        if len(changes['changed']) > CHANGED_ROWS_SHOWN:
+            text += f" ... 외 {len(changes['changed']) - CHANGED_ROWS_SHOWN}개"
+        text += ")"
+    text += f", 이전 실행에만 있던 행 {changes['removed']}개, 재사용 {changes['reused']}행"
+    return text
+
+# =============================================
+# 📌 메모리 절약 표현 (범주형 / Arrow 문자열)
+# =============================================
+# dtype=str로 읽으면 셀마다 파이썬 문자열 객체가 따로 생긴다. 반복 값이 많은 컬럼은 범주형(코드 + 범주 목록)으로,
+# 식별번호 컬럼은 pyarrow가 있으면 Arrow 문자열(연속 버퍼)로 바꿔 메모리를 줄인다.
+# 검증/검사/통계는 이 표현 그대로 동작한다 (IMPORTCHECKER_COMPACT=1 또는 --compact로 사용).
+
+COMPACT_FRAMES = os.environ.get('IMPORTCHECKER_COMPACT', '0') == '1'
+COMPACT_CATEGORY_COLUMNS = ['업종', '소속', '블록', '통신', '검침원', '단말 회사', '검침일', '구경', '수용가 대상 년도', '수용가상태']
+COMPACT_ID_COLUMNS = ['수용가번호', '계량기번호', 'IMEI', '단말 주번호', '단말 부번호']
+COMPACT_CATEGORY_RATIO = 0.5        # 그 밖의 컬럼도 앞부분 고유값 비율이 이 이하면 범주형
+COMPACT_SAMPLE_ROWS = 10000         # 고유값 비율을 볼 앞부분 행 수
+
+def arrow_strings_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+def compact_frame(df):
+    """문자열 DataFrame → 반복 값 컬럼은 범주형, 식별번호 컬럼은 Arrow 문자열 (값은 그대로)"""
+    id_dtype = pd.StringDtype('pyarrow', na_value=np.nan) if arrow_strings_available() else None
+    df = df.copy(deep=False)
+    for position, col in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if col in COMPACT_ID_COLUMNS:
+            if id_dtype is not None and series.dtype != id_dtype:
+                df.isetitem(position, series.astype(id_dtype))
+        elif not isinstance(series.dtype, pd.CategoricalDtype):
+            sample = series.iloc[:COMPACT_SAMPLE_ROWS]
+            if col in COMPACT_CATEGORY_COLUMNS or sample.nunique() <= len(sample) * COMPACT_CATEGORY_RATIO:
+                df.isetitem(position, series.astype('category'))
+    return df
+
+def enable_compact_frames():
+    """이 프로세스와 (환경변수로) 작업 프로세스들에서 메모리 절약 표현 사용"""
+    global COMPACT_FRAMES
+    COMPACT_FRAMES = True
+    os.environ['IMPORTCHECKER_COMPACT'] = '1'
+
+def maybe_compact(df, compact=None):
+    return compact_frame(df) if (COMPACT_FRAMES if compact is None else compact) else df
+
+def frame_memory_mb(df):
+    """DataFrame 실제 메모리 (문자열 객체 포함, MB)"""
+    return round(df.memory_usage(deep=True).sum() / 1024 / 1024, 1)
+
+# =============================================
+# 📌 엑셀 읽기 백엔드
+# =============================================
+
+# 'auto'면 python-calamine이 있으면 calamine, 없으면 openpyxl 스트리밍 (.xls는 pandas)
+EXCEL_READER = os.environ.get('IMPORTCHECKER_READER', 'auto')
+READ_CHUNK_ROWS = 50000     # 청크 단위 읽기 시 한 번에 읽는 행 수
+
+# 임포트 컬럼 위치 (첫 열은 번호, 그 다음 20개)
+IMPORT_USECOLS = list(range(1, 1 + len(COLUMNS)))
+
+# pandas 기본 결측값 문자열 (read_excel(dtype=str).fillna('')와 같은 결과를 내기 위함)
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+}
+# 엑셀 오류 값 (openpyxl.cell.cell.ERROR_CODES와 같음, openpyxl을 지연 import하므로 여기 둠)
+EXCEL_ERROR_CODES = ('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A')
+
+def cell_to_text(value):
+    """openpyxl 셀 값 → pd.read_excel(dtype=str).fillna('')와 같은 문자열
+
+    pandas와 다른 점: 값만 읽으므로 엑셀 오류 값처럼 보이는 텍스트 셀('#DIV/0!' 등)도 빈값이 된다
+    (pandas는 오류 셀만 빈값). 같은 열 안에서 True/1, False/0처럼 같다고 비교되는 값은
+    iter_sheet_openpyxl이 pandas처럼 먼저 나온 값의 문자열로 맞춘다.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return '' if value in NA_STRINGS or value in EXCEL_ERROR_CODES else value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def header_names(values):
+    """헤더 행 → pandas와 같은 컬럼명 (빈 칸은 'Unnamed: n', 중복은 '이름.1')
+
+    pandas처럼 숫자/불리언/날짜 헤더는 문자열로 바꾸지 않는다 (정수인 실수는 int).
+    pandas와 다른 점: 오류 셀 헤더는 pandas에서 NaN이지만 여기서는 오류 값 문자열('#N/A' 등) 그대로.
+    """
+    names = []
+    for i, value in enumerate(values):
+        if value is None or value == '':
+            name = f"Unnamed: {i}"
+        elif isinstance(value, float) and value.is_integer():
+            name = int(value)
+        else:
+            name = value
+        base, n = name, 0
+        while name in names:
+            n += 1
+            name = f"{base}.{n}"
+        names.append(name)
+    return names
+
+def iter_sheet_openpyxl(file_path, usecols=None, chunk_rows=READ_CHUNK_ROWS):
+    """openpyxl read_only 스트리밍으로 첫 번째 시트를 chunk_rows행씩 DataFrame으로 생성
+
+    usecols는 컬럼 위치(int) 또는 컬럼명 목록. 행 인덱스는 파일 전체 기준으로 이어진다.
+    """
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = header_names(header)
+        if usecols is None:
+            positions = list(range(len(names)))
+        else:
+            positions = [col if isinstance(col, int) else names.index(col) for col in usecols]
+        columns = [names[i] for i in positions]
+
+        buffer = []
+        blank_rows = []   # 마지막 빈 행들은 pandas처럼 버리기 위해 보류
+        start = 0
+        # 열마다 문자열이 아닌 값 → 문자열 (pandas는 같은 열에서 1/True, 0/False처럼 같은 값을 먼저 나온 문자열로 씀)
+        texts = [{} for _ in positions]
+        for row in rows:
+            values = []
+            for i, column_texts in zip(positions, texts):
+                value = row[i] if i < len(row) else None
+                if value is None or isinstance(value, str):
+                    values.append(cell_to_text(value))
+                    continue
+                text = column_texts.get(value)
+                if text is None:
+                    text = column_texts[value] = cell_to_text(value)
+                values.append(text)
+            if all(value is None for value in row):
+                blank_rows.append(values)
+                continue
+            buffer.extend(blank_rows)
+            blank_rows = []
+            buffer.append(values)
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame(buffer, columns=columns, index=range(start, start + len(buffer)), dtype=str)
+                start += len(buffer)
+                buffer = []
+        if buffer or start == 0:
+            yield pd.DataFrame(buffer, columns=columns, index=range(start, start + len(buffer)), dtype=str)
+    finally:
+        wb.close()
+
+def read_sheet_pandas(file_path, usecols=None):
+    return pd.read_excel(file_path, dtype=str, usecols=usecols).fillna('')
+
+def read_sheet_calamine(file_path, usecols=None):
+    return pd.read_excel(file_path, dtype=str, usecols=usecols, engine='calamine').fillna('')
+
+def read_sheet_openpyxl(file_path, usecols=None):
+    chunks = list(iter_sheet_openpyxl(file_path, usecols))
+    return pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+
+EXCEL_READERS = {
+    'pandas': read_sheet_pandas,        # pd.read_excel 기본 (기준 결과)
+    'openpyxl': read_sheet_openpyxl,    # openpyxl read_only 스트리밍 + 컬럼 선택
+    'calamine': read_sheet_calamine,    # python-calamine 설치 시 (가장 빠름)
+}
+
+def reader_available(name):
+    if name == 'calamine':
+        return importlib.util.find_spec('python_calamine') is not None
+    return name in EXCEL_READERS
+
+def resolve_reader(file_path, reader=None):
+    """사용할 읽기 백엔드 이름 결정 ('auto' 처리, .xls는 openpyxl 불가)"""
+    reader = reader or EXCEL_READER
+    if reader == 'auto':
+        reader = 'calamine' if reader_available('calamine') else 'openpyxl'
+    if reader == 'openpyxl' and file_path.lower().endswith('.xls'):
+        reader = 'pandas'
+    if not reader_available(reader):
+        raise ValueError(f"엑셀 읽기 백엔드 '{reader}'을(를) 사용할 수 없습니다.")
+    return reader
+
+def read_sheet(file_path, usecols=None, reader=None, compact=None):
+    """첫 번째 시트를 문자열 DataFrame으로 읽기 → (df, 읽기 정보 dict: reader/seconds/rows)
+
+    compact가 참이면 (생략 시 COMPACT_FRAMES) compact_frame으로 메모리 절약 표현으로 바꾼다.
+    """
+    reader = resolve_reader(file_path, reader)
+    started = time.perf_counter()
+    df = maybe_compact(EXCEL_READERS[reader](file_path, usecols), compact)
+    info = {'reader': reader, 'seconds': round(time.perf_counter() - started, 3), 'rows': len(df)}
+    return df, info
+
+def iter_sheet_chunks(file_path, usecols=None, chunk_rows=READ_CHUNK_ROWS, reader=None, compact=None):
+    """청크 단위 읽기 (openpyxl은 스트리밍, 다른 백엔드는 전체를 읽은 뒤 나눔)"""
+    reader = resolve_reader(file_path, reader)
+    if reader == 'openpyxl':
+        chunks = iter_sheet_openpyxl(file_path, usecols, chunk_rows)
+    else:
+        df = EXCEL_READERS[reader](file_path, usecols)
+        chunks = (df.iloc[start:start + chunk_rows] for start in range(0, max(len(df), 1), chunk_rows))
+    for chunk in chunks:
+        yield maybe_compact(chunk, compact)
+
+def read_import_excel(file_path, reader=None, compact=None):
+    """SQL 생성용 읽기 (20개 임포트 컬럼만 읽음) → (df, 읽기 정보 dict)"""
+    df, read_info = read_sheet(file_path, IMPORT_USECOLS, reader, compact=False)
+    df.columns = COLUMNS
+    return maybe_compact(df, compact), read_info
+
+def iter_import_chunks(file_path, chunk_rows=READ_CHUNK_ROWS, reader=None, columns=None, compact=None):
+    """임포트 컬럼을 청크 단위로 읽기 (columns를 주면 그 컬럼만)"""
+    positions = IMPORT_USECOLS if columns is None else [IMPORT_USECOLS[COLUMNS.index(col)] for col in columns]
+    for chunk in iter_sheet_chunks(file_path, positions, chunk_rows, reader, compact=False):
+        chunk.columns = COLUMNS if columns is None else columns
+        yield maybe_compact(chunk, compact)
+
+def write_sql_file_chunked(file_path, selected_num_len, sql_path, chunk_rows=READ_CHUNK_ROWS, reader=None,
+                           insert_prefix='', batch_rows=0, progress=None, account=None, output_format='values', load_dsn=None):
+    """메모리보다 큰 파일용 SQL 생성: 엑셀을 청크 단위로 읽으며 바로 기록
+
+    1차로 수용가번호 열만 읽어 파일 전체 중복을 집계하고, 2차로 청크마다 검증/기록한다.
+    account가 있으면 청크마다 임포트 이력을 확인하고, 성공한 키는 모아 두었다가
+    파일 기록(과 load_dsn 적재 커밋)이 모두 끝난 뒤에 한 번에 기록한다.
+    load_dsn이 있으면 기록하면서 성공 행을 DB에도 바로 적재한다 (load_chunks 참고).
+    반환: write_sql_file과 같음
+    """
+    source = os.path.basename(file_path)
+    admin_no_counts = Counter()
+    for chunk in iter_import_chunks(file_path, chunk_rows, reader, columns=['수용가번호']):
+        admin_no_counts.update(chunk['수용가번호'].tolist())
+    duplicated_admin_nos = {admin_no for admin_no, count in admin_no_counts.items() if count > 1}
+    total_rows = sum(admin_no_counts.values())
+    del admin_no_counts
+
+    # 이력에 기록할 성공 행 (키/좌표 컬럼만)
+    succeeded = []
+
+    def chunks():
+        for chunk in iter_import_chunks(file_path, chunk_rows, reader):
+            imported_masks = find_imported_keys(account, chunk, source) if account else None
+            sql_df, errors = prepare_sql_rows(chunk, selected_num_len, imported_masks, duplicated_admin_nos)
+            if account:
+                history_columns = [col for col in IMPORT_KEY_COLUMNS + ['경도', '위도'] if col in chunk.columns]
+                succeeded.append(chunk.loc[errors == '', history_columns])
+            yield chunk, sql_df, errors
+
+    prepared_chunks = chunks()
+    if load_dsn:
+        prepared_chunks = load_chunks(prepared_chunks, load_dsn, insert_prefix, batch_rows)
+    try:
+        written = write_output(prepared_chunks, sql_path, total_rows, output_format, insert_prefix, batch_rows, progress=progress)
+    finally:
+        prepared_chunks.close()
+    if account and succeeded:
+        record_imported_keys(account, pd.concat(succeeded, ignore_index=True), source)
+    return written
+
+# =============================================
+# 📌 DB 직접 적재 (PostgreSQL COPY / SQLite executemany)
+# =============================================
+
+load_connections = {}       # DSN → 열린 연결 (작업 사이에 재사용)
+load_connections_lock = threading.Lock()
+
+def parse_insert_target(insert_prefix):
+    """'INSERT INTO 테이블 (컬럼, ...) VALUES' → (테이블, 컬럼 목록 또는 None)"""
+    match = re.match(r"\s*INSERT\s+INTO\s+([^\s(]+)\s*(?:\(([^)]*)\))?", insert_prefix or '', re.IGNORECASE)
+    if not match:
+        raise ValueError("INSERT 문 머리에서 대상 테이블을 찾을 수 없습니다. ('INSERT INTO 테이블 (컬럼, ...) VALUES' 형식)")
+    columns = [col.strip() for col in match.group(2).split(',')] if match.group(2) else None
+    if columns is not None and len(columns) != len(SQL_VALUE_FIELDS):
+        raise ValueError(f"INSERT 문 머리의 컬럼 수({len(columns)})가 값 개수({len(SQL_VALUE_FIELDS)})와 다릅니다.")
+    return match.group(1), columns
+
+def copy_statement(insert_prefix, output_format='csv', source='STDIN'):
+    """insert_prefix의 대상으로 'COPY 테이블 (컬럼, ...) FROM STDIN WITH (FORMAT ...)' 생성
+
+    source에 "'파일명'"을 주면 앞의 COPY만 psql \\copy로 바꿔 클라이언트 쪽 파일을 읽게 쓸 수 있다.
+    """
+    table, columns = parse_insert_target(insert_prefix)
+    target = f"{table} ({', '.join(columns)})" if columns else table
+    return f"COPY {target} FROM {source} WITH (FORMAT {'csv' if output_format == 'csv' else 'text'})"
+
+def get_load_connection(dsn):
+    """DSN별 연결을 열어 두고 재사용 ('sqlite:///경로'는 SQLite, 그 외는 psycopg로 PostgreSQL)"""
+    with load_connections_lock:
+        conn = load_connections.get(dsn)
+        if conn is not None and getattr(conn, 'closed', False):
+            conn = None
+        if conn is None:
+            if dsn.startswith('sqlite:///'):
+                conn = sqlite3.connect(dsn[len('sqlite:///'):], check_same_thread=False)
+            else:
+                try:
+                    import psycopg
+                except ImportError:
+                    raise RuntimeError("PostgreSQL 직접 적재에는 psycopg 패키지가 필요합니다. (pip install psycopg)")
+                conn = psycopg.connect(dsn)
+            load_connections[dsn] = conn
+        return conn
+
+def load_chunks(prepared_chunks, dsn, insert_prefix, batch_rows=0):
+    """(원본, SQL 값, 오류) 청크를 그대로 넘겨주면서 성공 행을 DB에 적재
+
+    PostgreSQL은 COPY FROM STDIN(csv) 하나로, SQLite는 batch_rows행씩 executemany로 넣는다.
+    전체를 한 트랜잭션으로 처리해 끝까지 넘긴 뒤 커밋하고, 중간에 실패하거나 취소되면 롤백한다.
+    """
+    conn = get_load_connection(dsn)
+    table, columns = parse_insert_target(insert_prefix)
+    try:
+        if isinstance(conn, sqlite3.Connection):
+            target = f"{table} ({', '.join(columns)})" if columns else table
+            insert_sql = f"INSERT INTO {target} VALUES ({', '.join('?' * len(SQL_VALUE_FIELDS))})"
+            for chunk in prepared_chunks:
+                _, sql_df, errors = chunk
+                rows = list(sql_df.loc[errors == '', SQL_VALUE_FIELDS].itertuples(index=False, name=None))
+                step = batch_rows or len(rows) or 1
+                for start in range(0, len(rows), step):
+                    conn.executemany(insert_sql, rows[start:start + step])
+                yield chunk
+        else:
+            with conn.cursor() as cur, cur.copy(copy_statement(insert_prefix, 'csv')) as copy:
+                for chunk in prepared_chunks:
+                    _, sql_df, errors = chunk
+                    copy.write(copy_text(sql_df.loc[errors == '', SQL_VALUE_FIELDS], 'csv'))
+                    yield chunk
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+# =============================================
+# 📌 임포트 이력 인덱스 (SQLite)
+# =============================================
+
+def open_import_index(index_path=IMPORT_INDEX_PATH):
+    """임포트 이력 DB 연결 (없으면 생성)"""
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS imported_keys ("
+        " account TEXT NOT NULL, key_type TEXT NOT NULL, key TEXT NOT NULL,"
+        " source TEXT NOT NULL, imported_at REAL NOT NULL,"
+        " PRIMARY KEY (account, key_type, key)) WITHOUT ROWID"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS account_areas ("
+        " account TEXT NOT NULL, source TEXT NOT NULL, min_lon REAL NOT NULL, max_lon REAL NOT NULL,"
+        " min_lat REAL NOT NULL, max_lat REAL NOT NULL, rows INTEGER NOT NULL, recorded_at REAL NOT NULL,"
+        " PRIMARY KEY (account, source))"
+    )
+    return conn
+
+def key_hashes(key_type, keys):
+    """키 문자열 목록 → uint64 해시 배열 (해시 집합 사전 확인용)"""
+    values = (key_type + "\x1f" + pd.Series(keys, dtype=object)).to_numpy(dtype=object)
+    return pd.util.hash_array(values)
+
+def key_hash_path(account, index_path=IMPORT_INDEX_PATH):
+    digest = hashlib.sha1(account.encode('utf-8')).hexdigest()[:16]
+    return f"{index_path}.{digest}.npy"
+
+def load_key_hashes(conn, account, index_path=IMPORT_INDEX_PATH):
+    """계정의 정렬된 키 해시 배열 (파일이 없으면 DB에서 다시 만듦)
+
+    다시 만든 배열은 저장하지 않는다. 파일은 record_imported_keys가 쓰기 잠금(BEGIN IMMEDIATE) 안에서만
+    저장하므로, 잠금 없이 읽은 예전 상태가 더 새로운 파일을 덮어쓰는 일이 없다.
+    """
+    try:
+        return np.load(key_hash_path(account, index_path))
+    except (OSError, ValueError):
+        pass
+    rows = conn.execute("SELECT key_type, key FROM imported_keys WHERE account = ?", (account,)).fetchall()
+    return np.unique(np.concatenate(
+        [key_hashes(key_type, [key for kt, key in rows if kt == key_type]) for key_type in IMPORT_KEY_COLUMNS]
+        + [np.empty(0, dtype=np.uint64)]))
+
+def save_key_hashes(hashes, hash_path):
+    tmp_path = f"{hash_path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, hashes)
+    os.replace(tmp_path, hash_path)
+
+def record_imported_keys(account, df, source, index_path=IMPORT_INDEX_PATH):
+    """SQL 생성에 성공한 행들의 수용가번호/계량기번호/단말 주번호 기록 → 새로 기록된 키 수
+
+    이미 기록된 키는 처음 기록한 source(파일명)를 유지한다. 좌표 범위도 계정 영역으로 함께 기록.
+    해시 배열 파일도 같은 쓰기 잠금 안에서 갱신하므로 여러 프로세스가 동시에 기록해도 안전.
+    """
+    now = time.time()
+    keys = {
+        col: [key for key in df[col].unique().tolist() if key != '']
+        for col in IMPORT_KEY_COLUMNS if col in df.columns
+    }
+    rows = [(account, col, key, source, now) for col, col_keys in keys.items() for key in col_keys]
+    conn = open_import_index(index_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO imported_keys VALUES (?, ?, ?, ?, ?)", rows)
+            added = conn.total_changes - before
+            record_account_area(conn, account, df, source)
+            hash_path = key_hash_path(account, index_path)
+            if added or not os.path.exists(hash_path):
+                # 잠금 안에서 읽으므로 DB에서 다시 만든 배열에도 방금 넣은 키가 들어 있음
+                hashes = load_key_hashes(conn, account, index_path)
+                new_hashes = [key_hashes(col, col_keys) for col, col_keys in keys.items()]
+                save_key_hashes(np.union1d(hashes, np.concatenate(new_hashes + [hashes[:0]])), hash_path)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return added
+    finally:
+        conn.close()
+
+def find_imported_keys(account, df, source=None, index_path=IMPORT_INDEX_PATH):
+    """이전 임포트와 겹치는 키 확인 → {컬럼명: bool Series}
+
+    1) 계정의 정렬된 키 해시 배열에서 searchsorted로 후보를 한 번에 추림
+    2) 후보만 임시 테이블에 넣어 DB 기본키로 확인 (해시 충돌 제거, source 확인)
+    같은 source(파일명)에서 기록된 키는 재생성으로 보고 제외한다.
+    """
+    masks = {col: pd.Series(False, index=df.index) for col in IMPORT_KEY_COLUMNS if col in df.columns}
+    if not os.path.exists(index_path):
+        return masks
+
+    conn = open_import_index(index_path)
+    try:
+        hashes = load_key_hashes(conn, account, index_path)
+        candidates = []
+        for col in masks:
+            unique_keys = df[col].unique()
+            unique_keys = unique_keys[unique_keys != '']
+            if len(unique_keys) == 0 or len(hashes) == 0:
+                continue
+            col_hashes = key_hashes(col, unique_keys)
+            pos = np.minimum(np.searchsorted(hashes, col_hashes), len(hashes) - 1)
+            hit = hashes[pos] == col_hashes
+            candidates.extend((col, key) for key in unique_keys[hit].tolist())
+        if not candidates:
+            return masks
+
+        conn.execute("CREATE TEMP TABLE new_keys (key_type TEXT NOT NULL, key TEXT NOT NULL)")
+        conn.executemany("INSERT INTO new_keys VALUES (?, ?)", candidates)
+        found = conn.execute(
+            "SELECT n.key_type, n.key FROM new_keys n"
+            " JOIN imported_keys i ON i.account = ? AND i.key_type = n.key_type AND i.key = n.key"
+            " WHERE i.source != ?",
+            (account, source or ''),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    found_by_col = {}
+    for col, key in found:
+        found_by_col.setdefault(col, set()).add(key)
+    for col, col_keys in found_by_col.items():
+        masks[col] = df[col].isin(col_keys)
+    return masks
+
+# =============================================
+# 📌 좌표 검사 (격자 인덱스: 근접 좌표, 서비스 영역 밖 좌표)
+# =============================================
+
+SPATIAL_NEAR_METERS = float(os.environ.get('IMPORTCHECKER_NEAR_METERS', '1'))   # 이 거리(m) 이내면 근접 좌표
+SPATIAL_DEFAULT_AREA = (124.5, 132.0, 33.0, 38.7)   # 계정 이력이 없을 때 영역 (경도 최소/최대, 위도 최소/최대: 대한민국)
+SPATIAL_AREA_QUANTILE = 0.01    # 계정 영역 기록 시 양 끝에서 버리는 비율 (이상치가 영역을 넓히지 않도록)
+SPATIAL_AREA_MARGIN_M = 2000    # 계정 영역 바깥으로 허용하는 여유 (m)
+SPATIAL_AREA_MIN_ROWS = 50      # 계정 영역으로 쓰려면 기록된 행이 이만큼은 있어야 함
+SPATIAL_EXAMPLES = 10           # 통계에 보여줄 근접 좌표 예시 수
+METERS_PER_DEGREE = 111320.0
+# 격자 셀 (dx, dy) 이웃: 자기 셀과 절반의 이웃만 보면 모든 쌍을 한 번씩 확인
+GRID_NEIGHBORS = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+GRID_KEY_STRIDE = 1 << 32
+
+def coordinate_arrays(df):
+    """경도/위도 컬럼 → float 배열 두 개 (숫자가 아니면 NaN)"""
+    lon = pd.to_numeric(df['경도'], errors='coerce').to_numpy(dtype=float)
+    lat = pd.to_numeric(df['위도'], errors='coerce').to_numpy(dtype=float)
+    return lon, lat
+
+def in_area(lon, lat, area):
+    min_lon, max_lon, min_lat, max_lat = area
+    return (lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)
+
+def coordinate_area(lon, lat):
+    """기록할 좌표 범위 (SPATIAL_AREA_QUANTILE 분위수, 기본 영역 밖 좌표는 제외) → (영역, 행 수), 없으면 None"""
+    valid = np.isfinite(lon) & np.isfinite(lat) & in_area(lon, lat, SPATIAL_DEFAULT_AREA)
+    if not valid.any():
+        return None
+    q = [SPATIAL_AREA_QUANTILE, 1 - SPATIAL_AREA_QUANTILE]
+    (min_lon, max_lon), (min_lat, max_lat) = np.quantile(lon[valid], q), np.quantile(lat[valid], q)
+    return (float(min_lon), float(max_lon), float(min_lat), float(max_lat)), int(valid.sum())
+
+def record_account_area(conn, account, df, source):
+    """성공한 행의 좌표 범위를 (account, source)별로 기록 (같은 source는 범위를 넓혀 합침, 트랜잭션은 호출한 쪽)"""
+    if '경도' not in df.columns or '위도' not in df.columns:
+        return
+    found = coordinate_area(*coordinate_arrays(df))
+    if found is None:
+        return
+    (min_lon, max_lon, min_lat, max_lat), rows = found
+    conn.execute(
+        "INSERT INTO account_areas VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(account, source) DO UPDATE SET"
+        " min_lon = MIN(min_lon, excluded.min_lon), max_lon = MAX(max_lon, excluded.max_lon),"
+        " min_lat = MIN(min_lat, excluded.min_lat), max_lat = MAX(max_lat, excluded.max_lat),"
+        " rows = rows + excluded.rows, recorded_at = excluded.recorded_at",
+        (account, source, min_lon, max_lon, min_lat, max_lat, rows, time.time()))
+
+def load_account_area(account, source=None, index_path=IMPORT_INDEX_PATH):
+    """이전 임포트로 기록된 계정 영역 (+ SPATIAL_AREA_MARGIN_M), 기록이 부족하면 None
+
+    같은 source(파일명)에서 기록된 범위는 재생성으로 보고 제외한다.
+    """
+    if not account or not os.path.exists(index_path):
+        return None
+    conn = open_import_index(index_path)
+    try:
+        row = conn.execute(
+            "SELECT MIN(min_lon), MAX(max_lon), MIN(min_lat), MAX(max_lat), SUM(rows) FROM account_areas"
+            " WHERE account = ? AND source != ?", (account, source or '')).fetchone()
+    finally:
+        conn.close()
+    if row is None or row[4] is None or row[4] < SPATIAL_AREA_MIN_ROWS:
+        return None
+    min_lon, max_lon, min_lat, max_lat = row[:4]
+    dlat = SPATIAL_AREA_MARGIN_M / METERS_PER_DEGREE
+    dlon = dlat / np.cos(np.radians((min_lat + max_lat) / 2))
+    return (min_lon - float(dlon), max_lon + float(dlon), min_lat - dlat, max_lat + dlat)
+
+def near_coordinate_pairs(lon, lat, meters=SPATIAL_NEAR_METERS):
+    """meters 이내인 행 위치 쌍 → (i 배열, j 배열, 거리 배열), i < j
+
+    같은 좌표는 먼저 하나로 묶고, 고유 좌표를 한 변이 meters인 격자 셀에 넣어
+    자기 셀과 이웃 셀끼리만 비교한다 (셀 키 해시 조인, 모든 쌍 비교 없음).
+    """
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+    valid = np.flatnonzero(np.isfinite(lon) & np.isfinite(lat))
+    if len(valid) < 2:
+        return empty
+    # 위도 중앙값 기준 평면 근사 (수 m 거리에서는 충분)
+    scale = np.cos(np.radians(np.median(lat[valid])))
+    x = lon[valid] * scale * METERS_PER_DEGREE
+    y = lat[valid] * METERS_PER_DEGREE
+
+    # 같은 좌표 묶기: point[k] = 행 valid[k]의 고유 좌표 번호
+    point = pd.DataFrame({'x': x, 'y': y}).groupby(['x', 'y'], sort=False).ngroup().to_numpy()
+    first = np.full(point.max() + 1, -1, dtype=np.int64)
+    first[point[::-1]] = np.arange(len(point))[::-1]
+    ux, uy = x[first], y[first]
+
+    pairs_i, pairs_j, dists = [], [], []
+    # 같은 좌표인 행들: 그룹 첫 행과의 쌍 (거리 0)
+    same = np.flatnonzero(first[point] != np.arange(len(point)))
+    pairs_i.append(first[point[same]])
+    pairs_j.append(same)
+    dists.append(np.zeros(len(same)))
+
+    # 가까운 고유 좌표: 격자 셀 조인 (meters가 0이면 같은 좌표만)
+    # 셀 키 = cx * GRID_KEY_STRIDE + cy (정수 하나로 조인)
+    cell_size = meters if meters > 0 else 1.0
+    cx, cy = np.floor(ux / cell_size).astype(np.int64), np.floor(uy / cell_size).astype(np.int64)
+    cells = pd.DataFrame({'key': (cx - cx.min()) * GRID_KEY_STRIDE + (cy - cy.min()), 'p': np.arange(len(ux))})
+    for dx, dy in (GRID_NEIGHBORS if meters > 0 else []):
+        shifted = cells.assign(key=cells['key'] - (dx * GRID_KEY_STRIDE + dy))
+        merged = cells.merge(shifted, on='key', suffixes=('_a', '_b'))
+        a, b = merged['p_a'].to_numpy(), merged['p_b'].to_numpy()
+        if (dx, dy) == (0, 0):
+            a, b = a[a < b], b[a < b]
+        dist = np.hypot(ux[a] - ux[b], uy[a] - uy[b])
+        keep = dist <= meters
+        pairs_i.append(first[a[keep]])
+        pairs_j.append(first[b[keep]])
+        dists.append(dist[keep])
+
+    i, j = np.concatenate(pairs_i), np.concatenate(pairs_j)
+    i, j = valid[np.minimum(i, j)], valid[np.maximum(i, j)]
+    return i, j, np.concatenate(dists)
+
+def check_coordinates(df, area=None, meters=SPATIAL_NEAR_METERS):
+    """좌표 검사 → dict (경도/위도 컬럼이 없으면 None)
+
+    near: meters 이내에 다른 행이 있는 행 (같은 좌표의 여러 행은 모두 포함), pairs: 그 쌍의 수,
+    outside: area(계정 영역, 없으면 SPATIAL_DEFAULT_AREA) 밖의 좌표, examples: 가까운 쌍 예시 (엑셀 행 번호, 거리)
+    """
+    if '경도' not in df.columns or '위도' not in df.columns:
+        return None
+    lon, lat = coordinate_arrays(df)
+    i, j, dist = near_coordinate_pairs(lon, lat, meters)
+    near = np.zeros(len(df), dtype=bool)
+    # 같은 좌표 그룹은 첫 행과의 쌍만 만들어지므로 두 쪽 모두 표시하면 그룹 전체가 표시됨
+    near[i] = True
+    near[j] = True
+    order = np.lexsort((j, i))[:SPATIAL_EXAMPLES]
+    valid = np.isfinite(lon) & np.isfinite(lat)
+    return {
+        'near': pd.Series(near, index=df.index),
+        'pairs': len(i),
+        'examples': [(int(i[k]) + 2, int(j[k]) + 2, round(float(dist[k]), 2)) for k in order],
+        'outside': pd.Series(valid & ~in_area(lon, lat, area or SPATIAL_DEFAULT_AREA), index=df.index),
+        'area': area or SPATIAL_DEFAULT_AREA,
+        'area_source': '계정 이력' if area else '기본 (대한민국)',
+        'meters': meters,
+    }
+
+# =============================================
+# 📌 유사 중복 검사 (정규화 + 숫자 블로킹 + n-gram 색인)
+# =============================================
+
+# 유사 중복을 찾을 컬럼 (컬럼명, 표시명)
+FUZZY_CHECKS = [
+    ('구주소', '구주소'),
+    ('신주소', '신주소'),
+    ('수용가명', '수용가명'),
+]
+# 정규화한 값의 2-gram Jaccard 유사도 기준 (숫자 부분은 항상 같아야 함)
+FUZZY_THRESHOLD = float(os.environ.get('IMPORTCHECKER_FUZZY_THRESHOLD', 0.75))
+FUZZY_NGRAM = 2
+FUZZY_MAX_BLOCK = 1000      # 색인 키 하나에 이보다 많은 값이 몰리면 그 키로는 후보를 만들지 않음
+FUZZY_EXAMPLES = 5
+# 줄임말 통일 (정규화 첫 단계, 긴 것부터 치환)
+FUZZY_ABBREVIATIONS = {
+    '경기도': '경기', '강원도': '강원', '강원특별자치도': '강원', '충청북도': '충북', '충청남도': '충남',
+    '전라북도': '전북', '전북특별자치도': '전북', '전라남도': '전남', '경상북도': '경북', '경상남도': '경남',
+    '제주특별자치도': '제주', '제주도': '제주', '주식회사': '', '(주)': '',
+}
+# 서울특별시, 서울시 → 서울 (광역시/특별자치시도 같은 방식)
+FUZZY_ABBREVIATIONS.update({city + suffix: city for city in ('서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종')
+                            for suffix in ('특별자치시', '특별시', '광역시', '시')})
+FUZZY_ABBREVIATION_PATTERN = re.compile("|".join(map(re.escape, sorted(FUZZY_ABBREVIATIONS, key=len, reverse=True))))
+FUZZY_REPLACEMENTS = [
+    (re.compile(r"(?<=\d)[ \t]*번지?"), ""),                                # 123-4번지 → 123-4
+    (re.compile(r"(?<=\d)[ \t]*(?:의|[‐‑‒–—―~]|[ \t]-|-[ \t])[ \t]*(?=\d)"), "-"),  # 123의 4, 123 – 4 → 123-4
+    (re.compile(r"[^0-9a-z가-힣\n-]+"), ""),                                 # 공백, 괄호, 문장부호
+]
+FUZZY_NOT_DIGITS = re.compile(r"[^\d\n]+")
+FUZZY_NOT_TEXT = re.compile(r"[\d-]+")
+
+def normalize_fuzzy(values):
+    """유사 중복 비교용 정규화 (NFKC, 소문자, 줄임말 통일, 번지/하이픈 표기 통일, 공백/문장부호 제거) → 값 목록
+
+    값마다 정규식을 돌리지 않고 줄바꿈으로 이은 문자열 하나에 한 번씩 적용한다.
+    """
+    text = "\n".join(str(value).replace("\n", " ").replace("\r", " ") for value in values)
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = FUZZY_ABBREVIATION_PATTERN.sub(lambda m: FUZZY_ABBREVIATIONS[m.group()], text)
+    for pattern, replacement in FUZZY_REPLACEMENTS:
+        text = pattern.sub(replacement, text)
+    return text.split("\n")
+
+def fuzzy_grams(norms):
+    """정규화한 값 목록 → (숫자 블록 번호, 문자 2-gram 값 번호, 2-gram 코드), 2-gram은 값 번호 순, 값마다 중복 없음
+
+    숫자 블록은 값의 숫자 부분 (번지/호 등, 정확히 같아야 유사 중복), 2-gram은 숫자를 뺀 나머지 글자로 만든다.
+    """
+    text = "\n".join(norms)
+    digits = pd.Series(FUZZY_NOT_DIGITS.sub(",", text).split("\n"), dtype=object).str.strip(",")
+    blocks = pd.factorize(digits)[0].astype(np.int64)
+
+    # 글자 코드 배열에서 이웃한 두 글자 → 코드 하나 (유니코드는 21비트)
+    chars = np.frombuffer(FUZZY_NOT_TEXT.sub("", text).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    separator = chars == ord("\n")
+    owner = np.cumsum(separator)
+    at = np.flatnonzero(~separator[:-1] & ~separator[1:])
+    owner, codes = owner[at], (chars[at] << 21) | chars[at + 1]
+    order = np.lexsort((codes, owner))
+    owner, codes = owner[order], codes[order]
+    first = np.ones(len(owner), dtype=bool)
+    first[1:] = (owner[1:] != owner[:-1]) | (codes[1:] != codes[:-1])
+    return blocks, owner[first], codes[first]
+
+def fuzzy_candidate_pairs(owner, codes, sizes, blocks, threshold):
+    """prefix filtering으로 만든 후보 쌍 → (a 배열, b 배열), a < b
+
+    값의 2-gram을 전체 빈도가 낮은 순으로 놓으면, Jaccard가 threshold 이상인 두 값은
+    앞쪽 |x| - ceil(threshold * |x|) + 1개 안에서 반드시 2-gram 하나를 공유한다.
+    그래서 (숫자 블록, 앞쪽 2-gram)이 같은 값끼리만 후보로 묶는다 (모든 쌍 비교 없음).
+    """
+    codes, grams = pd.factorize(codes)
+    frequency = np.bincount(codes, minlength=len(grams))
+    order = np.lexsort((codes, frequency[codes], owner))
+    owner, codes = owner[order], codes[order]
+    rank = np.arange(len(owner)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    prefix = sizes - np.ceil(threshold * sizes - 1e-9).astype(np.int64) + 1
+    keep = rank < prefix[owner]
+    index = pd.DataFrame({'key': blocks[owner[keep]] * len(grams) + codes[keep], 'v': owner[keep]})
+    posting = index['key'].map(index['key'].value_counts())
+    index = index[(posting > 1) & (posting <= FUZZY_MAX_BLOCK)]
+    merged = index.merge(index, on='key', suffixes=('_a', '_b'))
+    merged = merged[merged['v_a'] < merged['v_b']].drop_duplicates(['v_a', 'v_b'])
+    a, b = merged['v_a'].to_numpy(), merged['v_b'].to_numpy()
+    # 크기 필터: Jaccard ≥ t 이면 작은 쪽이 큰 쪽의 t배 이상
+    fits = np.minimum(sizes[a], sizes[b]) >= threshold * np.maximum(sizes[a], sizes[b])
+    return a[fits], b[fits]
+
+def component_labels(count, a, b):
+    """쌍 (a[k], b[k])로 이어진 묶음 번호 (묶음에서 가장 작은 번호)"""
+    labels = np.arange(count)
+    while len(a):
+        low = np.minimum(labels[a], labels[b])
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        labels = labels[labels]
+        if (labels[a] == labels[b]).all() and (labels[labels] == labels).all():
+            break
+    return labels
+
+def fuzzy_duplicates(values, threshold=FUZZY_THRESHOLD):
+    """한 컬럼의 유사 중복 → (행별 묶음 번호 배열 (해당 없으면 0), 유사 쌍 수, 예시 [(값, 값, 유사도)])
+
+    원래 값이 같은 행끼리는 유사 중복으로 보지 않는다. 값이 다른데 정규화하면 같거나,
+    숫자 부분이 같고 나머지 글자의 2-gram Jaccard 유사도가 threshold 이상인 경우만 묶는다.
+    """
+    row_codes, raw_values = pd.factorize(np.asarray(values, dtype=object))
+    norm_of_raw, norm_values = pd.factorize(pd.Series(normalize_fuzzy(raw_values), dtype=object))
+
+    # 정규화한 값이 같은데 원래 값이 다른 경우
+    variants = np.bincount(norm_of_raw, minlength=len(norm_values)) > 1
+
+    # 후보 쌍만 2-gram 공유 개수로 유사도 검증
+    blocks, owner, codes = fuzzy_grams(list(norm_values))
+    sizes = np.bincount(owner, minlength=len(norm_values))
+    a, b = fuzzy_candidate_pairs(owner, codes, sizes, blocks, threshold)
+    entries = pd.DataFrame({'v': owner, 'g': codes})
+    shared = (pd.DataFrame({'a': a, 'b': b, 'pair': np.arange(len(a))})
+              .merge(entries, left_on='a', right_on='v').merge(entries, left_on=['b', 'g'], right_on=['v', 'g']))
+    common = np.bincount(shared['pair'], minlength=len(a))
+    similarity = common / np.maximum(sizes[a] + sizes[b] - common, 1)
+    similar = similarity >= threshold
+    a, b, similarity = a[similar], b[similar], similarity[similar]
+
+    flagged = variants.copy()
+    flagged[a] = True
+    flagged[b] = True
+    flagged[np.asarray(norm_values) == ''] = False
+    labels = component_labels(len(norm_values), a, b)
+
+    # 행별 묶음 번호 (처음 나온 순서대로 1부터)
+    row_norms = norm_of_raw[row_codes]
+    row_labels = np.where(flagged[row_norms], labels[row_norms], -1)
+    groups = np.zeros(len(row_labels), dtype=np.int64)
+    hit = row_labels >= 0
+    groups[hit] = pd.factorize(row_labels[hit])[0] + 1
+
+    # 예시: 유사 쌍, 그다음 표기만 다른 값
+    first_raw = np.full(len(norm_values), -1, dtype=np.int64)
+    first_raw[norm_of_raw[::-1]] = np.arange(len(norm_of_raw))[::-1]
+    examples = [(raw_values[first_raw[i]], raw_values[first_raw[j]], round(float(s), 2))
+                for i, j, s in zip(a[:FUZZY_EXAMPLES], b[:FUZZY_EXAMPLES], similarity[:FUZZY_EXAMPLES])]
+    for norm in np.flatnonzero(variants & flagged)[:FUZZY_EXAMPLES - len(examples)]:
+        first, second = np.flatnonzero(norm_of_raw == norm)[:2]
+        examples.append((raw_values[first], raw_values[second], 1.0))
+    return groups, len(a), examples
+
+def check_fuzzy_duplicates(df, threshold=FUZZY_THRESHOLD):
+    """FUZZY_CHECKS 컬럼별 유사 중복 → {컬럼명: {'groups', 'pairs', 'examples'}} (groups는 행별 묶음 번호 Series, 0은 해당 없음)"""
+    fuzzy = {}
+    for col_name, display_name in FUZZY_CHECKS:
+        if col_name in df.columns:
+            groups, pairs, examples = fuzzy_duplicates(df[col_name], threshold)
+            fuzzy[col_name] = {'groups': pd.Series(groups, index=df.index), 'pairs': pairs, 'examples': examples,
+                               'display_name': display_name}
+    return fuzzy
+
+# =============================================
+# 📌 수용가 통계 분석
+# =============================================
+
+# 항목별 통계 대상 (블록 컬럼, 구분 컬럼 다음 순서)
+STATS_OTHER_COLUMNS = ['업종', '소속', '통신', '구경', '검침원']
+# 구분 컬럼: 이름에 '구분'/'분류'/'구역'이 있거나 행정구('○○구')인 컬럼 ('구경', '구주소'는 해당 없음)
+STATS_DIVISION_KEYWORDS = ('구분', '분류', '구역')
+# 교차표 (행 컬럼, 열 컬럼): 두 컬럼이 모두 있을 때만 계산
+STATS_CROSSTABS = [('블록', '통신'), ('검침원', '검침일')]
+STATS_TOP_N = 10            # 항목별 통계에 표시할 상위 개수
+CROSSTAB_TEXT_ROWS = 30     # 결과창 교차표에 표시할 최대 행/열 수 (엑셀 저장은 전체)
+CROSSTAB_TEXT_COLUMNS = 15
+
+def is_division_column(col):
+    return any(keyword in col for keyword in STATS_DIVISION_KEYWORDS) or col == '구' or col.endswith('구')
+
+def stats_columns(columns):
+    """항목별 통계를 낼 컬럼 목록 (블록 → 구분 → 기타 순, 중복 제거)"""
+    block_columns = [col for col in columns if '블록' in col]
+    division_columns = [col for col in columns if is_division_column(col)]
+    other_columns = [col for col in STATS_OTHER_COLUMNS if col in columns]
+    return list(dict.fromkeys(block_columns + division_columns + other_columns))
+
+def new_customer_stats(columns):
+    """청크 단위로 누적할 통계 dict (update_customer_stats로 채움)"""
+    columns = [str(col).strip() for col in columns]
+    return {
+        'columns': columns,
+        'rows': 0,
+        'admin_nos': set() if '수용가번호' in columns else None,
+        'counts': {col: {} for col in stats_columns(columns)},       # 값 → 개수 (처음 나온 순서)
+        'crosstabs': {pair: {} for pair in STATS_CROSSTABS if pair[0] in columns and pair[1] in columns},
+    }
+
+def add_counts(table, keys, counts):
+    for key, count in zip(keys, counts.tolist()):
+        if count:
+            table[key] = table.get(key, 0) + count
+
+def update_customer_stats(stats, chunk):
+    """청크 하나를 통계에 누적
+
+    컬럼마다 범주형 코드(pd.factorize)로 바꾼 뒤, 코드에 컬럼별 오프셋을 더해
+    모든 컬럼의 개수를 np.bincount 한 번으로 센다. 교차표는 두 코드를 합친 코드로 센다.
+    """
+    chunk = chunk.set_axis(stats['columns'], axis=1)
+    stats['rows'] += len(chunk)
+    if stats['admin_nos'] is not None:
+        stats['admin_nos'].update(pd.unique(chunk['수용가번호']).tolist())
+
+    factorized = {}
+    def codes_of(col):
+        if col not in factorized:
+            factorized[col] = pd.factorize(chunk[col])
+        return factorized[col]
+
+    offsets = [0]
+    all_codes = []
+    for col in stats['counts']:
+        codes, uniques = codes_of(col)
+        all_codes.append(codes + offsets[-1])
+        offsets.append(offsets[-1] + len(uniques))
+    if all_codes:
+        counts = np.bincount(np.concatenate(all_codes), minlength=offsets[-1])
+        for col, start, end in zip(stats['counts'], offsets, offsets[1:]):
+            add_counts(stats['counts'][col], codes_of(col)[1].tolist(), counts[start:end])
+
+    for (row_col, col_col), table in stats['crosstabs'].items():
+        row_codes, row_uniques = codes_of(row_col)
+        col_codes, col_uniques = codes_of(col_col)
+        pair_counts = np.bincount(row_codes * len(col_uniques) + col_codes, minlength=len(row_uniques) * len(col_uniques))
+        pairs = itertools.product(row_uniques.tolist(), col_uniques.tolist())
+        add_counts(table, pairs, pair_counts)
+    return stats
+
+def compute_customer_stats(chunks):
+    """DataFrame 청크들 → 통계 dict (청크가 하나면 전체 DataFrame과 같음)"""
+    stats = None
+    for chunk in chunks:
+        if stats is None:
+            stats = new_customer_stats(chunk.columns)
+        update_customer_stats(stats, chunk)
+    return stats if stats is not None else new_customer_stats([])
+
+def natural_key(value):
+    """숫자는 숫자 크기로, 나머지는 문자열로 정렬"""
+    try:
+        return (0, float(value), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+
+def crosstab_frame(table):
+    """교차표 dict {(행값, 열값): 개수} → 합계 행/열이 붙은 DataFrame"""
+    if not table:
+        return pd.DataFrame()
+    frame = pd.Series(table).unstack(fill_value=0)
+    frame = frame.loc[sorted(frame.index, key=natural_key), sorted(frame.columns, key=natural_key)]
+    frame['합계'] = frame.sum(axis=1)
+    frame.loc['합계'] = frame.sum(axis=0)
+    return frame.astype(int)
+
+def format_crosstab(row_col, col_col, frame):
+    """교차표 텍스트 (행/열이 많으면 앞부분만)"""
+    lines = [f"\n📊 교차표: {row_col} × {col_col}\n"]
+    body = frame.drop(index='합계', columns='합계')
+    shown_columns = list(body.columns[:CROSSTAB_TEXT_COLUMNS])
+    lines.append(" | ".join([f"{row_col} \\ {col_col}"] + [str(col) for col in shown_columns] + ['합계']) + "\n")
+    for row_value in list(body.index[:CROSSTAB_TEXT_ROWS]) + ['합계']:
+        values = [frame.at[row_value, col] for col in shown_columns] + [frame.at[row_value, '합계']]
+        lines.append(" | ".join([str(row_value)] + [str(value) for value in values]) + "\n")
+    if len(body.index) > CROSSTAB_TEXT_ROWS or len(body.columns) > CROSSTAB_TEXT_COLUMNS:
+        lines.append(f"... 전체 {len(body.index)}행 x {len(body.columns)}열 (엑셀로 저장하면 전체 확인)\n")
+    return lines
+
+def format_stats_text(stats):
+    """통계 dict → 결과 텍스트"""
+    lines = []
+
+    # 실제 컬럼명 출력
+    lines.append("📋 엑셀 파일의 실제 컬럼명:\n")
+    for i, col in enumerate(stats['columns'], 1):
+        lines.append(f"{i:2d}. {col}\n")
+    lines.append("\n")
+
+    # 수용가번호 총 수량
+    if stats['admin_nos'] is not None:
+        lines.append(f"✅ 수용가번호 총 수량: {len(stats['admin_nos'])}\n\n")
+    else:
+        lines.append("⚠️ '수용가번호' 컬럼이 없습니다.\n\n")
+
+    if stats['counts']:
+        lines.append("📊 항목별 통계 분석:\n")
+        for col, table in stats['counts'].items():
+            lines.append(f"\n📈 '{col}' 항목별 개수:\n")
+            counts = sorted(table.items(), key=lambda item: -item[1])
+            lines.append(f"총 {len(counts)}개 항목\n")
+
+            # 상위 10개만 표시 (너무 많으면 화면이 복잡해짐)
+            for value, count in counts[:STATS_TOP_N]:
+                percentage = (count / stats['rows']) * 100
+                lines.append(f"- {value}: {count}개 ({percentage:.1f}%)\n")
+
+            if len(counts) > STATS_TOP_N:
+                lines.append(f"... 외 {len(counts) - STATS_TOP_N}개 항목\n")
+    else:
+        lines.append("⚠️ 분석 가능한 컬럼을 찾을 수 없습니다.\n")
+
+    for (row_col, col_col), table in stats['crosstabs'].items():
+        if table:
+            lines.extend(format_crosstab(row_col, col_col, crosstab_frame(table)))
+
+    return "".join(lines)
+
+def format_customer_stats(df):
+    """수용가 통계 분석 결과 텍스트 생성"""
+    return format_stats_text(compute_customer_stats([df]))
+
+def write_crosstabs_excel(stats, xlsx_path):
+    """교차표 전체를 시트별로 엑셀 저장 → 저장한 시트 수 (교차표가 없으면 저장하지 않음)"""
+    frames = [(f"{row_col}×{col_col}"[:31], crosstab_frame(table))
+              for (row_col, col_col), table in stats['crosstabs'].items() if table]
+    if not frames:
+        return 0
+    with pd.ExcelWriter(xlsx_path, engine='openpyxl') as writer:
+        for sheet_name, frame in frames:
+            frame.to_excel(writer, sheet_name=sheet_name)
+    return len(frames)
+
+def analyze_stats_file(file_path, chunk_rows=READ_CHUNK_ROWS, reader=None):
+    """엑셀 파일을 청크 단위로 읽으며 통계 누적 → 통계 dict (큰 파일도 메모리 일정)"""
+    return compute_customer_stats(iter_sheet_chunks(file_path, chunk_rows=chunk_rows, reader=reader))
+
+def read_stats_excel(file_path, wb=None):
+    """통계용 읽기 (wb를 주면 이미 열린 워크북의 활성 시트에서 읽음)"""
+    if wb is not None:
+        df = maybe_compact(pd.read_excel(wb, engine='openpyxl', sheet_name=wb.active.title, dtype=str).fillna(''))
+    else:
+        df, _ = read_sheet(file_path)
+    df.columns = [str(col).strip() for col in df.columns]
+    return df
+
+# =============================================
+# 📌 종합검사 (중복/수용가상태/빈값/자릿수)
+# =============================================
+
+# 중복 검사할 항목들 정의 (지시부번호는 단말 주번호와 동일)
+DUPLICATE_CHECKS = [
+    ('수용가번호', '수용가번호'),
+    ('계량기번호', '계량기번호'),
+    ('단말 주번호', '지시부번호/단말 주번호'),
+    ('단말 부번호', '단말 부번호'),
+    ('IMEI', 'IMEI'),
+    ('패스워드', '패스워드')
+]
+
+# 수용가상태 검사할 값들
+STATUS_CHECKS = ['단수', '중지', '철거', '폐전']
+
+# 자릿수 검사할 항목들 (컬럼명, 최소자릿수, 최대자릿수)
+DIGIT_CHECKS = [
+    ('수용가번호', 13, 13),      # 수용가번호는 정확히 13자리
+    ('계량기번호', 5, 20),      # 계량기번호는 보통 5-20자리
+    ('단말 주번호', 5, 15),     # 단말 주번호는 보통 5-15자리
+    ('IMEI', 15, 15),          # IMEI는 정확히 15자리
+    ('패스워드', 4, 20)         # 패스워드는 보통 4-20자리
+]
+
+# 빈값 검사할 항목들
+EMPTY_CHECKS = ['수용가번호', '계량기번호', '단말 주번호', 'IMEI']
+
+# =============================================
+# 📌 계정별 검증 규칙 (수용가번호길이 + 고객번호구조)
+# =============================================
+
+# 고객번호구조 마스크에서 '숫자 아무거나'로 보는 문자, 구분용으로 보고 버리는 문자
+STRUCTURE_ANY_DIGIT = 'XxNn#*?'
+STRUCTURE_SEPARATORS = '-_. /'
+
+rule_plans = {}             # (수용가번호길이, 고객번호구조) → 컴파일된 검증 계획 (계정을 바꿔도 재사용)
+rule_plans_lock = threading.Lock()
+
+def parse_customer_structure(structure):
+    """고객번호구조 문자열 → 정규식 문자열 (해석할 수 없으면 ValueError)
+
+    세 가지 형식을 받는다.
+      - 자리수 나열: '2-3-8', '2 3 8', '13'     → 숫자 2+3+8자리
+      - 이름(자리수) 나열: '지역(2)-구역(3)-번호(8)' → 숫자 2+3+8자리
+      - 마스크: 'XX-XXX-XXXXXXXX', '02NNNNNNNNNNN' → X/N/#/*/?는 아무 숫자, 숫자는 그 값 그대로
+    구분자(-, _, ., /, 공백)는 값에 없는 것으로 본다.
+    """
+    text = structure.strip()
+    if re.fullmatch(r"\d+(?:\s*[-_./, ]\s*\d+)*", text):
+        return "".join(rf"\d{{{int(n)}}}" for n in re.findall(r"\d+", text))
+    if re.search(r"\(\s*\d+\s*\)", text):
+        segments = re.findall(r"\(\s*(\d+)\s*\)", text)
+        return "".join(rf"\d{{{int(n)}}}" for n in segments)
+    mask = "".join(ch for ch in text if ch not in STRUCTURE_SEPARATORS)
+    if any(ch in STRUCTURE_ANY_DIGIT for ch in mask) and all(ch.isdigit() or ch in STRUCTURE_ANY_DIGIT for ch in mask):
+        # 같은 종류가 이어지면 하나로 묶어 정규식을 짧게
+        parts = []
+        for any_digit, run in itertools.groupby(mask, key=lambda ch: ch in STRUCTURE_ANY_DIGIT):
+            run = "".join(run)
+            parts.append(rf"\d{{{len(run)}}}" if any_digit else re.escape(run))
+        return "".join(parts)
+    raise ValueError(f"고객번호구조 '{structure}'을(를) 해석할 수 없습니다.")
+
+def pattern_length(pattern):
+    """parse_customer_structure가 만든 정규식이 받는 값의 길이"""
+    return sum(int(n) for n in re.findall(r"\\d\{(\d+)\}", pattern)) + len(re.sub(r"\\d\{\d+\}", "", pattern))
+
+def compile_rule_plan(num_len, structure=''):
+    """수용가번호길이/고객번호구조 → 검증 계획 dict
+
+    digit_checks는 DIGIT_CHECKS에서 수용가번호 자리수만 계정 값으로 바꾼 것,
+    pattern은 고객번호구조로 만든 정규식 (구조가 없거나 해석할 수 없으면 None, 이유는 note).
+    """
+    num_len = int(num_len)
+    structure = str(structure or '').strip()
+    pattern, note = None, ''
+    if structure:
+        try:
+            regex = parse_customer_structure(structure)
+        except ValueError as e:
+            note = f"{e} 구조 검사를 생략합니다."
+        else:
+            if pattern_length(regex) != num_len:
+                note = f"고객번호구조 '{structure}'의 길이({pattern_length(regex)})가 수용가번호길이({num_len})와 달라 구조 검사를 생략합니다."
+            else:
+                pattern = re.compile(regex)
+    digit_checks = [(col, num_len, num_len) if col == '수용가번호' else (col, low, high) for col, low, high in DIGIT_CHECKS]
+    return {'num_len': num_len, 'structure': structure, 'pattern': pattern, 'digit_checks': digit_checks, 'note': note}
+
+def get_rule_plan(num_len, structure=''):
+    """컴파일된 검증 계획 (같은 정의는 캐시에서 재사용)"""
+    key = (int(num_len), str(structure or '').strip())
+    with rule_plans_lock:
+        plan = rule_plans.get(key)
+        if plan is None:
+            plan = rule_plans[key] = compile_rule_plan(*key)
+        return plan
+
+def as_rule_plan(rules):
+    """수용가번호길이(int) 또는 검증 계획 → 검증 계획 (None이면 None)"""
+    if rules is None or isinstance(rules, dict):
+        return rules
+    return get_rule_plan(rules)
+
+def structure_mismatch(values, pattern):
+    """고객번호구조 정규식에 맞지 않는 값 → bool Series (고유값만 검사해 행으로 펼침)"""
+    codes, uniques = pd.factorize(values)
+    failed = np.fromiter((pattern.fullmatch(str(value)) is None for value in uniques), dtype=bool, count=len(uniques))
+    return pd.Series(failed[codes] if len(codes) else np.zeros(0, dtype=bool), index=values.index)
+
+def describe_rule_plan(plan):
+    """검증 계획 안내 문구"""
+    text = f"수용가번호 {plan['num_len']}자리"
+    if plan['pattern'] is not None:
+        text += f", 구조 {plan['structure']} (정규식 {plan['pattern'].pattern})"
+    if plan['note']:
+        text += f"\n⚠️ {plan['note']}"
+    return text
+
+def load_check_workbook(file_path):
+    """워크북을 한 번만 열고, 같은 워크북의 활성 시트에서 검사용 DataFrame 생성 → (wb, df)
+
+    색상 표시와 '중복항목' 시트 추가도 이 wb에 이어서 하고 마지막에 한 번만 저장.
+    """
+    wb = openpyxl.load_workbook(file_path)
+    df = pd.read_excel(wb, engine='openpyxl', sheet_name=wb.active.title, dtype=str).fillna('')
+    return wb, maybe_compact(df)
+
+def build_problem_matrix(df, available_checks, imported_masks=None, plan=None, spatial=None, fuzzy=None):
+    """컬럼별 문제 마스크를 한 번에 계산 → 문제 행렬 DataFrame
+
+    열은 (문제유형, 컬럼명), 값은 행별 bool.
+    문제유형은 '중복', '수용가상태', '빈값', '자릿수', '구조'(계획에 고객번호구조가 있는 경우),
+    '근접좌표'/'영역밖'(spatial, check_coordinates 결과를 준 경우, 경도/위도 두 셀 모두),
+    '유사중복'(fuzzy, check_fuzzy_duplicates 결과를 준 경우),
+    '기존임포트'(imported_masks를 준 경우). 통계와 색상 표시는 모두 이 행렬에서 읽는다.
+    plan(get_rule_plan 결과)을 주면 자릿수 검사에 계정의 수용가번호길이를 쓴다 (생략 시 DIGIT_CHECKS).
+    """
+    masks = {}
+
+    # 중복 검사
+    for col_name, display_name in available_checks:
+        masks[('중복', col_name)] = df[col_name].duplicated(keep=False)
+
+    # 유사 중복 검사 (check_fuzzy_duplicates 결과)
+    for col_name, entry in (fuzzy or {}).items():
+        masks[('유사중복', col_name)] = entry['groups'] > 0
+
+    # 수용가상태 검사
+    if '수용가상태' in df.columns:
+        masks[('수용가상태', '수용가상태')] = df['수용가상태'].isin(STATUS_CHECKS)
+
+    # 빈값 검사
+    for col_name in EMPTY_CHECKS:
+        if col_name in df.columns:
+            masks[('빈값', col_name)] = df[col_name] == ''
+
+    # 자릿수 검사 (빈값은 제외)
+    for col_name, min_digits, max_digits in (plan['digit_checks'] if plan else DIGIT_CHECKS):
+        if col_name in df.columns:
+            lengths = df[col_name].str.len()
+            masks[('자릿수', col_name)] = (df[col_name] != '') & ((lengths < min_digits) | (lengths > max_digits))
+
+    # 고객번호구조 검사 (빈값과 자릿수 문제는 제외)
+    if plan and plan['pattern'] is not None and '수용가번호' in df.columns:
+        admin_no = df['수용가번호']
+        masks[('구조', '수용가번호')] = ((admin_no != '') & (admin_no.str.len() == plan['num_len'])
+                                       & structure_mismatch(admin_no, plan['pattern']))
+
+    # 좌표 검사 (check_coordinates 결과)
+    if spatial:
+        for problem_type, key in (('근접좌표', 'near'), ('영역밖', 'outside')):
+            for col_name in ('경도', '위도'):
+                masks[(problem_type, col_name)] = spatial[key]
+
+    # 이전 임포트 중복 검사 (find_imported_keys 결과)
+    for col_name, mask in (imported_masks or {}).items():
+        masks[('기존임포트', col_name)] = mask
+
+    problems = pd.DataFrame(masks, index=df.index, dtype=bool)
+    problems.columns = pd.MultiIndex.from_tuples(masks.keys(), names=['문제유형', '컬럼명'])
+    return problems
+
+def problem_rows(problems, kinds):
+    """지정한 문제유형 중 하나라도 해당하는 행 인덱스 목록 (오름차순)"""
+    selected = problems.loc[:, problems.columns.get_level_values(0).isin(kinds)]
+    return selected.index[selected.any(axis=1)].tolist()
+
+def run_workbook_checks(df, progress=None, imported_masks=None, rules=None, area=None):
+    """종합검사 실행 → 결과 dict (검사할 컬럼이 없으면 None)
+
+    progress(status, detail, value, maximum)는 진행상태 표시용 (생략 가능)
+    imported_masks는 find_imported_keys 결과 (생략 시 이전 임포트 검사 안 함)
+    rules는 수용가번호길이 또는 계정 검증 계획 (생략 시 DIGIT_CHECKS 기본값)
+    area는 좌표 검사에 쓸 계정 영역 (load_account_area 결과, 생략 시 SPATIAL_DEFAULT_AREA)
+    """
+    def report(status, detail, value=None, maximum=None):
+        if progress:
+            progress(status, detail, value, maximum)
+
+    # 실제 존재하는 컬럼만 필터링
+    available_checks = []
+    for col_name, display_name in DUPLICATE_CHECKS:
+        if col_name in df.columns:
+            available_checks.append((col_name, display_name))
+
+    if not available_checks:
+        return None
+
+    report("중복/수용가상태/빈값/자릿수 검사 중...", f"총 {len(df)}행", 0, 1)
+    spatial = check_coordinates(df, area)
+    report("유사 중복 검사 중...", "주소/수용가명 정규화 후 비교", 0, 1)
+    fuzzy = check_fuzzy_duplicates(df)
+    problems = build_problem_matrix(df, available_checks, imported_masks, as_rule_plan(rules), spatial, fuzzy)
+    report("검사 결과 집계 중...", "", 1, 1)
+
+    # 중복 통계 및 중복 값 예시 (상위 10개만)
+    duplicate_stats = {}
+    duplicate_details = {}
+    for col_name, display_name in available_checks:
+        mask = problems[('중복', col_name)]
+        count = int(mask.sum())
+        if count:
+            duplicate_stats[display_name] = count
+            duplicate_details[display_name] = df[col_name][mask].unique()[:10].tolist()
+
+    # 셀별 문제 통계
+    cell_problem_stats = {}
+    for problem_type in ('빈값', '자릿수', '구조'):
+        if problem_type in problems.columns.get_level_values(0):
+            count = int(problems[problem_type].values.sum())
+            if count > 0:
+                cell_problem_stats[problem_type] = count
+
+    # 이전 임포트 중복 통계
+    imported_stats = {}
+    for col_name in (imported_masks or {}):
+        count = int(problems[('기존임포트', col_name)].sum())
+        if count:
+            imported_stats[col_name] = count
+
+    # 유사 중복 통계, '중복항목' 시트에 붙일 묶음 이름 (행 → "구주소 #3, 수용가명 #1")
+    fuzzy_stats = {}
+    fuzzy_labels = {}
+    for col_name, entry in fuzzy.items():
+        groups = entry['groups'][entry['groups'] > 0]
+        if len(groups):
+            fuzzy_stats[entry['display_name']] = len(groups)
+        for row_idx, group in groups.items():
+            fuzzy_labels.setdefault(row_idx, []).append(f"{entry['display_name']} #{group}")
+    fuzzy_labels = {row_idx: ", ".join(names) for row_idx, names in fuzzy_labels.items()}
+
+    duplicate_rows = problem_rows(problems, ['중복'])
+    status_problem_rows = problem_rows(problems, ['수용가상태'])
+    imported_rows = problem_rows(problems, ['기존임포트'])
+    fuzzy_rows = problem_rows(problems, ['유사중복'])
+
+    # 모든 문제가 있는 행들 통합
+    all_problem_rows = problem_rows(problems, ['중복', '유사중복', '근접좌표', '영역밖', '수용가상태', '기존임포트'])
+
+    return {
+        'available_checks': available_checks,
+        'problems': problems,
+        'duplicate_rows': duplicate_rows,
+        'duplicate_stats': duplicate_stats,
+        'duplicate_details': duplicate_details,
+        'status_problem_rows': status_problem_rows,
+        'cell_problem_stats': cell_problem_stats,
+        'cell_problem_count': sum(cell_problem_stats.values()),
+        'imported_rows': imported_rows,
+        'imported_stats': imported_stats,
+        'spatial': spatial,
+        'fuzzy': fuzzy,
+        'fuzzy_rows': fuzzy_rows,
+        'fuzzy_stats': fuzzy_stats,
+        'fuzzy_labels': fuzzy_labels,
+        'all_problem_rows': all_problem_rows,
+    }
+
+# 색상 표시 방식: 'cell'은 셀 서식(스타일 ID 재사용), 'conditional'은 조건부 서식 규칙 (셀 서식은 그대로)
+MARK_MODES = ('cell', 'conditional')
+MARK_MODE = os.environ.get('IMPORTCHECKER_MARK_MODE', 'cell')
+
+# 색상 및 음영 정의 (openpyxl 스타일 객체는 표시할 때 check_mark_styles로 만듦)
+RED_COLOR = "FF0000"        # 적색: 수용가상태 문제
+YELLOW_COLOR = "FFFF00"     # 노란색 음영
+ORANGE_COLOR = "FFC000"     # 주황색 음영: 이전 임포트 중복
+BLUE_COLOR = "9BC2E6"       # 파란색 음영: 유사 중복
+
+def check_mark_styles():
+    """(적색 글꼴, 노란색 음영, 주황색 음영, 파란색 음영)"""
+    from openpyxl.styles import Font, PatternFill
+    return (Font(color=RED_COLOR),
+            PatternFill(start_color=YELLOW_COLOR, end_color=YELLOW_COLOR, fill_type="solid"),
+            PatternFill(start_color=ORANGE_COLOR, end_color=ORANGE_COLOR, fill_type="solid"),
+            PatternFill(start_color=BLUE_COLOR, end_color=BLUE_COLOR, fill_type="solid"))
+
+def row_runs(rows):
+    """엑셀 행 번호 목록 → 연속 구간 [(시작, 끝), ...] (범위 단위로 서식 적용)"""
+    rows = np.unique(np.asarray(rows, dtype=np.int64))
+    if len(rows) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) != 1)
+    starts = np.concatenate((rows[:1], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], rows[-1:]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def runs_to_ref(runs, first_col, last_col):
+    """연속 구간 → 'A2:W5 C9' 형식의 범위 문자열"""
+    from openpyxl.utils import get_column_letter
+    first, last = get_column_letter(first_col), get_column_letter(last_col)
+    return " ".join(
+        f"{first}{start}" if start == end and first == last else f"{first}{start}:{last}{end}"
+        for start, end in runs)
+
+def shared_style(wb, font=None, fill=None):
+    """폰트/음영을 워크북 스타일 목록에 한 번만 등록하고, 셀에는 그 ID만 지정하는 함수 반환
+
+    cell.font = ... 는 지정할 때마다 스타일 객체를 해시 비교하므로 큰 시트에서 매우 느림.
+    ID 지정은 openpyxl 내부(wb._fonts, cell._style)를 쓰므로, 내부가 없거나 첫 셀에 지정한 결과가
+    font/fill과 다르면 공개 속성 지정(cell.font/cell.fill)으로 바꿔서 계속한다.
+    """
+    def assign(cell):
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+
+    try:
+        from openpyxl.styles.cell_style import StyleArray
+        font_id = wb._fonts.add(font) if font is not None else None
+        fill_id = wb._fills.add(fill) if fill is not None else None
+    except (ImportError, AttributeError):
+        return assign
+
+    def assign_ids(cell):
+        # 서식을 한 번도 지정하지 않은 셀은 _style이 None (openpyxl의 StyleDescriptor와 같은 처리)
+        if cell._style is None:
+            cell._style = StyleArray()
+        if font_id is not None:
+            cell._style.fontId = font_id
+        if fill_id is not None:
+            cell._style.fillId = fill_id
+
+    chosen = []
+
+    def apply(cell):
+        if chosen:
+            chosen[0](cell)
+            return
+        try:
+            assign_ids(cell)
+            ok = (font is None or cell.font == font) and (fill is None or cell.fill == fill)
+        except (AttributeError, TypeError):
+            ok = False
+        if not ok:
+            assign(cell)
+        chosen.append(assign_ids if ok else assign)
+    return apply
+
+def mark_runs(ws, runs, first_col, last_col, mode, font=None, fill=None):
+    """연속 구간에 폰트/음영 표시 (cell: 셀 서식, conditional: 항상 참인 조건부 서식 규칙 하나)"""
+    if not runs:
+        return
+    if mode == 'conditional':
+        from openpyxl.formatting.rule import FormulaRule
+        rule = FormulaRule(formula=['TRUE'], font=font, fill=fill)
+        ws.conditional_formatting.add(runs_to_ref(runs, first_col, last_col), rule)
+        return
+    apply = shared_style(ws.parent, font, fill)
+    for start, end in runs:
+        for row in ws.iter_rows(min_row=start, max_row=end, min_col=first_col, max_col=last_col):
+            for cell in row:
+                apply(cell)
+
+def apply_check_marks(wb, df, result, mode=None):
+    """문제 행렬대로 워크북 활성 시트에 색상 표시 (저장은 호출한 쪽에서)
+
+    mode는 MARK_MODES 중 하나 (생략 시 MARK_MODE). 두 방식 모두 보이는 결과는 같다.
+    """
+    from openpyxl.formatting.rule import FormulaRule
+    mode = mode or MARK_MODE
+    red_font, yellow_fill, orange_fill, blue_fill = check_mark_styles()
+    ws = wb.active
+    headers = [cell.value for cell in ws[1]]
+    max_column = ws.max_column
+    problems = result['problems']
+    excel_rows = problems.index.to_numpy() + 2  # pandas는 0-based, excel은 1-based + 헤더
+
+    # 중복/빈값/자릿수/구조 문제 셀은 노란색, 유사 중복 셀은 파란색, 이전 임포트 중복 셀은 주황색 음영 (셀별)
+    # 셀 서식은 나중에 칠한 것이, 조건부 서식은 먼저 추가한 규칙이 우선하므로 순서를 맞춤
+    special_fills = {'기존임포트': orange_fill, '유사중복': blue_fill}
+    cell_runs = {orange_fill: [], blue_fill: [], yellow_fill: []}
+    for problem_type, col_name in problems.columns:
+        # 헤더에서 해당 컬럼의 위치 찾기 (없으면 무시)
+        if problem_type == '수용가상태' or col_name not in headers:
+            continue
+        col_idx = headers.index(col_name) + 1
+        fill = special_fills.get(problem_type, yellow_fill)
+        cell_runs[fill].append((col_idx, row_runs(excel_rows[problems[(problem_type, col_name)].values])))
+    fill_order = list(cell_runs) if mode == 'conditional' else list(cell_runs)[::-1]
+
+    # 수용가상태 문제 행들을 적색으로 표시 (행 전체)
+    status_runs = row_runs(np.asarray(result['status_problem_rows'], dtype=np.int64) + 2)
+    mark_runs(ws, status_runs, 1, max_column, mode, font=red_font)
+
+    for fill in fill_order:
+        if mode == 'conditional':
+            # 같은 색은 규칙 하나로 묶음
+            refs = " ".join(runs_to_ref(runs, col_idx, col_idx) for col_idx, runs in cell_runs[fill] if runs)
+            if refs:
+                ws.conditional_formatting.add(refs, FormulaRule(formula=['TRUE'], fill=fill))
+        else:
+            for col_idx, runs in cell_runs[fill]:
+                mark_runs(ws, runs, col_idx, col_idx, mode, fill=fill)
+
+def format_check_stats(df, result):
+    """종합검사 결과 통계 텍스트 생성"""
+    stats_text = "🔍 검사 결과:\n\n"
+
+    # 중복 통계
+    if result['duplicate_stats']:
+        stats_text += "📊 중복 항목:\n"
+        for display_name, count in result['duplicate_stats'].items():
+            stats_text += f"  🔵 중복 {display_name}: {count}개\n"
+            if display_name in result['duplicate_details']:
+                details = result['duplicate_details'][display_name]
+                if len(details) > 0:
+                    stats_text += "     중복 값 예시: " + ", ".join(str(x) for x in details[:5])
+                    if len(details) > 5:
+                        stats_text += f" ... 외 {len(details) - 5}개"
+                    stats_text += "\n"
+
+    # 유사 중복 통계
+    if result.get('fuzzy_stats'):
+        stats_text += f"\n📊 유사 중복 (정규화하면 같거나 유사도 {FUZZY_THRESHOLD:g} 이상, 숫자는 일치):\n"
+        for entry in result['fuzzy'].values():
+            count = result['fuzzy_stats'].get(entry['display_name'])
+            if count:
+                stats_text += f"  🔷 유사 중복 {entry['display_name']}: {count}개\n"
+                for left, right, similarity in entry['examples']:
+                    stats_text += f"     {left} ≈ {right} ({similarity:.2f})\n"
+
+    # 수용가상태 통계
+    if result['status_problem_rows']:
+        status_values = df.loc[result['status_problem_rows'], '수용가상태'].value_counts()
+        status_counts = {value: int(status_values[value]) for value in STATUS_CHECKS if status_values.get(value, 0)}
+
+        if status_counts:
+            stats_text += "\n📊 수용가상태 문제:\n"
+            for status_value, count in status_counts.items():
+                stats_text += f"  🔴 {status_value}: {count}개\n"
+
+    # 셀별 문제 통계
+    if result['cell_problem_stats']:
+        stats_text += "\n📊 셀별 문제:\n"
+        for problem_type, count in result['cell_problem_stats'].items():
+            stats_text += f"  🟡 {problem_type}: {count}개\n"
+
+    # 이전 임포트 중복 통계
+    if result['imported_stats']:
+        stats_text += "\n📊 이전 임포트와 중복:\n"
+        for col_name, count in result['imported_stats'].items():
+            stats_text += f"  🟠 {col_name}: {count}개\n"
+
+    # 좌표 검사 통계
+    spatial = result.get('spatial')
+    near_count = int(spatial['near'].sum()) if spatial else 0
+    outside_count = int(spatial['outside'].sum()) if spatial else 0
+    if near_count:
+        stats_text += f"\n📍 근접 좌표 ({spatial['meters']:g}m 이내): {near_count}개 행, {spatial['pairs']}쌍\n"
+        for row_i, row_j, dist in spatial['examples']:
+            stats_text += f"  🟡 {row_i}행 ↔ {row_j}행: {dist:g}m\n"
+        if spatial['pairs'] > len(spatial['examples']):
+            stats_text += f"  ... 외 {spatial['pairs'] - len(spatial['examples'])}쌍\n"
+    if outside_count:
+        lon_min, lon_max, lat_min, lat_max = spatial['area']
+        stats_text += (f"\n📍 영역 밖 좌표 ({spatial['area_source']}: 경도 {lon_min:.4f}~{lon_max:.4f}, "
+                       f"위도 {lat_min:.4f}~{lat_max:.4f}): {outside_count}개 행\n")
+
+    stats_text += f"\n총 {len(result['all_problem_rows'])}개 행이 색상으로 표시되었습니다."
+    stats_text += f"\n🟡 노란색 음영: 중복 항목 ({len(result['duplicate_rows'])}개)"
+    if result.get('fuzzy_rows'):
+        stats_text += f"\n🔷 파란색 음영: 유사 중복 ({len(result['fuzzy_rows'])}개)"
+    stats_text += f"\n🔴 적색: 수용가상태 문제 ({len(result['status_problem_rows'])}개)"
+    cell_kinds = "빈값/자릿수/구조" if '구조' in result['cell_problem_stats'] else "빈값/자릿수"
+    stats_text += f"\n🟡 노란색 음영: {cell_kinds} 문제 ({result['cell_problem_count']}개)"
+    if near_count or outside_count:
+        coordinate_rows = int((spatial['near'] | spatial['outside']).sum())
+        stats_text += f"\n🟡 노란색 음영: 근접/영역 밖 좌표 (경도/위도, {coordinate_rows}개 행)"
+    if result['imported_rows']:
+        stats_text += f"\n🟠 주황색 음영: 이전 임포트 중복 ({len(result['imported_rows'])}개)"
+    if result.get('row_changes'):
+        stats_text += f"\n\n{format_row_changes(result['row_changes'])}"
+    return stats_text
+
+def add_problem_sheet(wb, duplicate_row_indices, mode=None, labels=None):
+    """워크북에 '중복항목' 시트 추가 → 추가된 행 수 (저장은 호출한 쪽에서)
+
+    labels(행 → 유사 중복 묶음 이름, run_workbook_checks의 fuzzy_labels)가 있으면 '유사중복' 열을 덧붙인다.
+    """
+    # 기존에 '중복항목' 시트가 있다면 삭제
+    if '중복항목' in wb.sheetnames:
+        wb.remove(wb['중복항목'])
+
+    # 새 시트 생성
+    ws_new = wb.create_sheet('중복항목')
+
+    # 헤더 복사 (첫 번째 시트에서)
+    ws_original = wb.active
+    max_column = ws_original.max_column
+    label_column = [] if not labels else ['유사중복']
+    ws_new.append([ws_original.cell(row=1, column=col).value for col in range(1, max_column + 1)] + label_column)
+
+    # 데이터 복사
+    for original_row_idx in duplicate_row_indices:
+        excel_row = original_row_idx + 2  # pandas는 0-based, excel은 1-based + 헤더
+        label = [labels.get(original_row_idx, '')] if label_column else []
+        ws_new.append([ws_original.cell(row=excel_row, column=col).value for col in range(1, max_column + 1)] + label)
+
+    # 중복된 행들 전체를 적색으로 표시 (행 전체), 유사 중복 묶음 이름은 파란색 음영
+    red_font, _, _, blue_fill = check_mark_styles()
+    if duplicate_row_indices and max_column:
+        mark_runs(ws_new, [(2, len(duplicate_row_indices) + 1)], 1, max_column, mode or MARK_MODE, font=red_font)
+    if label_column:
+        labelled = [position + 2 for position, row_idx in enumerate(duplicate_row_indices) if row_idx in labels]
+        mark_runs(ws_new, row_runs(labelled), max_column + 1, max_column + 1, mode or MARK_MODE, fill=blue_fill)
+
+    return len(duplicate_row_indices)
+
+# =============================================
+# 📌 단계별 시간/메모리 측정
+# =============================================
+
+# 작업별 측정 기록 (JSON Lines, 한 줄에 작업 하나)
+PERF_LOG_PATH = os.path.join(os.path.expanduser("~"), ".importchecker", "perf_log.jsonl")
+PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".importchecker", "profiles")
+
+perf_local = threading.local()   # 현재 스레드에서 실행 중인 작업의 단계 목록
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(MB), 측정할 수 없으면 None"""
+    try:
+        import resource
+    except ImportError:
+        # Windows: psutil이 있으면 peak working set 사용
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / 2 ** 20, 1)
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(usage / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+def current_rss_mb():
+    """현재 프로세스의 메모리 사용량(MB) (리눅스는 /proc, 그 외는 psutil, 없으면 최대 사용량)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20, 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return peak_rss_mb()
+    return round(psutil.Process().memory_info().rss / 2 ** 20, 1)
+
+def start_stages():
+    """현재 스레드의 단계 기록 시작 → 단계 목록 (stage()가 여기에 추가)"""
+    perf_local.stages = []
+    return perf_local.stages
+
+@contextmanager
+def stage(name):
+    """with stage('엑셀 읽기'): ... 구간의 시간과 메모리를 현재 스레드의 단계 목록에 기록
+
+    start_stages()를 부르지 않은 스레드에서는 아무 것도 하지 않는다.
+    """
+    stages = getattr(perf_local, 'stages', None)
+    if stages is None:
+        yield
+        return
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        rss_after = current_rss_mb()
+        stages.append({
+            'stage': name,
+            'seconds': round(time.perf_counter() - started, 3),
+            'rss_mb': rss_after,
+            'rss_delta_mb': round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None,
+        })
+
+def make_perf_record(title, operation, status, seconds, stages, profile_path=None):
+    """작업 하나의 측정 결과 dict (로그 한 줄)"""
+    record = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'title': title,
+        'operation': operation,
+        'status': status,
+        'seconds': round(seconds, 3) if seconds is not None else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': stages,
+    }
+    if profile_path:
+        record['profile'] = profile_path
+    return record
+
+def write_perf_log(record, log_path=PERF_LOG_PATH):
+    """측정 결과를 로그 파일에 JSON 한 줄로 추가 (실패해도 작업에는 영향 없음)"""
+    try:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+def format_perf_lines(record):
+    """측정 결과 → (요약 줄, 단계별 줄 목록)"""
+    summary = f"⏱️ 단계별 측정: 총 {record['seconds']}초, 최대 메모리 {record['peak_rss_mb'] or '-'}MB"
+    lines = []
+    for item in record['stages']:
+        line = f"   {item['stage']:<12} {item['seconds']:>9.3f}초"
+        if item.get('rss_mb') is not None:
+            line += f"   메모리 {item['rss_mb']:.1f}MB ({item['rss_delta_mb']:+.1f})"
+        lines.append(line)
+    if record.get('profile'):
+        lines.append(f"   프로파일: {record['profile']}")
+    lines.append(f"   로그: {PERF_LOG_PATH}")
+    return summary, lines
+
+def profile_path_for(name):
+    """cProfile 결과 저장 경로 (PROFILE_DIR/날짜_시간_이름.prof)"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    return os.path.join(PROFILE_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{name}.prof")
+
+# =============================================
+# 📌 결과창 (출력 저장소 + 보이는 줄만 그리기)
+# =============================================
+# 작업 출력은 임시 파일에 쌓고 줄 시작 위치만 메모리에 둔다.
+# 결과창(Text)에는 화면에 보이는 줄만 그리므로 출력이 수십 MB여도 스크롤/복사가 멈추지 않는다.
+
+RESULT_LINE_MAX_CHARS = 2000            # 한 줄이 이보다 길면 잘라서 표시 (전체는 복사/저장으로)
+RESULT_SEARCH_BLOCK = 8 * 1024 * 1024   # 검색 시 한 번에 읽는 바이트 수
+RESULT_COPY_WARN_MB = 20                # 전체 복사 시 확인을 묻는 크기 (MB)
+ERROR_LINE_PREFIX = "-- [ERROR #"
+
+def new_result_store():
+    """출력 저장소 dict: 임시 파일 + 줄 시작 위치 + 줄 범위 태그 + 접기 구간"""
+    return {
+        'file': tempfile.TemporaryFile(prefix='importchecker_result_'),
+        'size': 0,
+        'offsets': array('q', [0]),   # 줄마다 시작 바이트 위치 (마지막 줄은 비어 있을 수 있음)
+        'tags': [],                   # (첫 줄, 끝 줄, 태그)
+        'folds': {},                  # 머리 줄 → [첫 줄, 끝 줄, 접힘 여부]
+    }
+
+def store_clear(store):
+    store['file'].seek(0)
+    store['file'].truncate()
+    store['size'] = 0
+    store['offsets'] = array('q', [0])
+    store['tags'].clear()
+    store['folds'].clear()
+
+def store_append(store, text, tag=None):
+    """텍스트 추가 → (이 텍스트에서 시작한 첫 줄, 마지막 줄) (tag를 주면 그 줄들에 표시)"""
+    data = text.encode('utf-8')
+    offsets = store['offsets']
+    first = len(offsets) - 1 if offsets[-1] == store['size'] else len(offsets)
+    store['file'].seek(store['size'])
+    store['file'].write(data)
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10)
+    offsets.frombytes((newlines + store['size'] + 1).astype(np.int64).tobytes())
+    store['size'] += len(data)
+    last = len(offsets) - (2 if data.endswith(b"\n") else 1)
+    if tag and first <= last:
+        store['tags'].append((first, last, tag))
+    return first, last
+
+def store_line_count(store):
+    return len(store['offsets'])
+
+def store_line(store, line, max_chars=RESULT_LINE_MAX_CHARS):
+    """한 줄 읽기 (너무 긴 줄은 앞부분만)"""
+    offsets = store['offsets']
+    start = offsets[line]
+    end = offsets[line + 1] - 1 if line + 1 < len(offsets) else store['size']
+    length = end - start
+    store['file'].seek(start)
+    data = store['file'].read(min(length, max_chars * 4))  # UTF-8은 글자당 최대 4바이트
+    text = data.decode('utf-8', errors='ignore')
+    if len(data) < length or len(text) > max_chars:
+        text = text[:max_chars] + f" … ({length:,}바이트, 전체는 '전체 복사'/'전체 저장'으로 확인)"
+    return text
+
+def store_line_tags(store, line):
+    return [tag for first, last, tag in store['tags'] if first <= line <= last]
+
+def find_bytes(store, needle, start, end, backward=False):
+    """[start, end)에서 시작하는 needle 위치 (backward면 마지막 위치) → 바이트 위치 또는 None"""
+    f = store['file']
+    overlap = len(needle) - 1
+    if not backward:
+        pos = start
+        while pos < end:
+            f.seek(pos)
+            block = f.read(min(RESULT_SEARCH_BLOCK, end - pos) + overlap)
+            found = block.find(needle)
+            if 0 <= found < end - pos:
+                return pos + found
+            pos += RESULT_SEARCH_BLOCK
+        return None
+    pos = end
+    while pos > start:
+        block_start = max(start, pos - RESULT_SEARCH_BLOCK)
+        f.seek(block_start)
+        block = f.read(pos - block_start + overlap)
+        found = block.rfind(needle, 0, pos - block_start + overlap)
+        if found >= 0:
+            return block_start + found
+        pos = block_start
+    return None
+
+def store_find(store, pattern, from_line, backward=False):
+    """from_line부터 아래로 (backward면 from_line 앞에서 위로) pattern이 있는 줄 찾기
+
+    끝까지 없으면 반대쪽 끝에서부터 한 번 더 찾는다. → 줄 번호 또는 None
+    """
+    needle = pattern.encode('utf-8')
+    if not needle or not store['size']:
+        return None
+    offsets = store['offsets']
+    split = offsets[from_line] if from_line < len(offsets) else store['size']
+    if backward:
+        ranges = [(0, split), (split, store['size'])]
+    else:
+        ranges = [(split, store['size']), (0, split)]
+    for start, end in ranges:
+        pos = find_bytes(store, needle, start, end, backward)
+        if pos is not None:
+            return bisect.bisect_right(offsets, pos) - 1
+    return None
+
+def store_export(store, path):
+    """전체 출력을 파일로 저장 (임시 파일을 그대로 복사)"""
+    store['file'].seek(0)
+    with open(path, 'wb') as out:
+        shutil.copyfileobj(store['file'], out)
+
+def store_text(store):
+    store['file'].seek(0)
+    return store['file'].read().decode('utf-8', errors='replace')
+
+def collapsed_ranges(store):
+    return sorted((first, last) for first, last, collapsed in store['folds'].values() if collapsed)
+
+def visible_count(store):
+    return store_line_count(store) - sum(last - first + 1 for first, last in collapsed_ranges(store))
+
+def visible_to_line(store, row, ranges=None):
+    """접힌 줄을 뺀 화면상 순번 → 저장소 줄 번호"""
+    line = row
+    for first, last in ranges if ranges is not None else collapsed_ranges(store):
+        if first > line:
+            break
+        line += last - first + 1
+    return line
+
+def line_to_visible(store, line):
+    """저장소 줄 번호 → 화면상 순번 (접힌 구간 안이면 그 구간 바로 앞)"""
+    row = line
+    for first, last in collapsed_ranges(store):
+        if last < line:
+            row -= last - first + 1
+        elif first <= line:
+            row -= line - first
+    return row
+
+result_store = None
+result_view = {'top': 0, 'mark': None, 'search': '', 'line_height': 16}
+
+def result_page_size():
+    return max(1, result_text.winfo_height() // result_view['line_height'])
+
+def render_result():
+    """현재 위치(result_view['top'])부터 화면에 보이는 줄만 결과창에 그림"""
+    count = visible_count(result_store)
+    page = result_page_size()
+    top = max(0, min(result_view['top'], count - page))
+    result_view['top'] = top
+    ranges = collapsed_ranges(result_store)
+    lines = [visible_to_line(result_store, row, ranges) for row in range(top, min(top + page, count))]
+
+    texts = [store_line(result_store, line) for line in lines]
+
+    result_text.config(state=tk.NORMAL)
+    result_text.delete(1.0, tk.END)
+    result_text.insert(1.0, "\n".join(texts))
+    for row, (line, text) in enumerate(zip(lines, texts), 1):
+        tags = store_line_tags(result_store, line)
+        if text.startswith(ERROR_LINE_PREFIX):
+            tags.append('error')
+        if line in result_store['folds']:
+            tags.append('fold_head')
+        if line == result_view['mark']:
+            tags.append('mark')
+        for tag in tags:
+            result_text.tag_add(tag, f"{row}.0", f"{row}.end + 1c")
+    if result_view['search']:
+        start = '1.0'
+        while True:
+            start = result_text.search(result_view['search'], start, stopindex=tk.END)
+            if not start:
+                break
+            end = f"{start} + {len(result_view['search'])}c"
+            result_text.tag_add('found', start, end)
+            start = end
+    result_text.config(state=tk.DISABLED)
+
+    y_scrollbar.set(top / max(count, 1), (top + len(lines)) / max(count, 1))
+    result_position_label.config(text=f"{top + 1 if lines else 0:,}-{top + len(lines):,} / {count:,}줄")
+
+def scroll_result(lines=0, top=None):
+    result_view['top'] = result_view['top'] + lines if top is None else top
+    render_result()
+
+def on_result_yscroll(*args):
+    """세로 스크롤바 명령 ('moveto', 비율) / ('scroll', n, 'units'|'pages')"""
+    if args[0] == 'moveto':
+        scroll_result(top=int(float(args[1]) * visible_count(result_store)))
+    elif args[0] == 'scroll':
+        step = result_page_size() if args[2] == 'pages' else 1
+        scroll_result(int(args[1]) * step)
+
+def on_result_wheel(event):
+    if event.num == 4 or event.delta > 0:
+        scroll_result(-3)
+    else:
+        scroll_result(3)
+    return 'break'
+
+def show_result_line(line):
+    """저장소 줄로 이동해 표시 (접힌 구간 안이면 펼침)"""
+    for fold in result_store['folds'].values():
+        if fold[2] and fold[0] <= line <= fold[1]:
+            fold[2] = False
+    result_view['mark'] = line
+    scroll_result(top=line_to_visible(result_store, line) - result_page_size() // 3)
+
+def current_result_line():
+    """검색 기준 줄 (마지막으로 찾은 줄, 없으면 화면 맨 위 줄 바로 앞)"""
+    if result_view['mark'] is not None:
+        return result_view['mark']
+    return visible_to_line(result_store, result_view['top']) - 1
+
+def find_in_result(pattern, backward=False):
+    if not pattern:
+        return
+    current = current_result_line()
+    line = store_find(result_store, pattern, max(current, 0) if backward else current + 1, backward)
+    if line is None:
+        window.bell()
+        result_position_label.config(text=f"'{pattern}' 없음")
+        return
+    show_result_line(line)
+
+def search_result(backward=False):
+    result_view['search'] = result_search_entry.get()
+    find_in_result(result_view['search'], backward)
+
+def goto_error_number(event=None):
+    """'-- [ERROR #n]' 줄로 이동 (처음부터 찾음)"""
+    number = error_number_entry.get().strip().lstrip('#')
+    if not number.isdigit():
+        return
+    line = store_find(result_store, f"{ERROR_LINE_PREFIX}{number}]", 0)
+    if line is None:
+        window.bell()
+        result_position_label.config(text=f"오류 #{number} 없음")
+        return
+    show_result_line(line)
+
+def toggle_result_fold(event):
+    row = int(result_text.index(f"@{event.x},{event.y}").split('.')[0])
+    line = visible_to_line(result_store, result_view['top'] + row - 1)
+    fold = result_store['folds'].get(line)
+    if fold:
+        fold[2] = not fold[2]
+        render_result()
+
+def copy_result_output():
+    size_mb = result_store['size'] / 1024 / 1024
+    if size_mb > RESULT_COPY_WARN_MB and not messagebox.askyesno("전체 복사", f"결과가 {size_mb:.0f}MB입니다. 클립보드에 모두 복사할까요?"):
+        return
+    window.clipboard_clear()
+    window.clipboard_append(store_text(result_store))
+
+def save_result_output():
+    path = filedialog.asksaveasfilename(
+        title="결과 저장", defaultextension=".txt",
+        filetypes=[("Text files", "*.txt"), ("SQL files", "*.sql"), ("All files", "*.*")])
+    if path:
+        store_export(result_store, path)
+
+def clear_result():
+    store_clear(result_store)
+    result_view.update({'top': 0, 'mark': None})
+
+# =============================================
+# 📌 작업 스케줄러 (백그라운드 작업 스레드)
+# =============================================
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 중단됨"""
+
+job_queue = queue.Queue()     # GUI → 작업 스레드 (대기 중인 작업)
+job_events = queue.Queue()    # 작업 스레드 → GUI (진행상태/출력/결과)
+job_ids = itertools.count(1)
+pending_jobs = []             # 대기 중인 작업 목록 (메인 스레드에서만 수정)
+current_job = None
+jobs_in_run = 0               # 대기열이 빈 뒤 처리한 작업 수 (결과창 초기화 판단용)
+
+JOB_POLL_MS = 100             # 작업 이벤트 확인 주기 (ms)
+JOB_EVENTS_PER_POLL = 50      # 한 번에 처리할 최대 이벤트 수
+
+def submit_job(title, func, args=(), on_done=None, error_title="오류"):
+    """작업을 대기열에 추가 (func(report, emit, *args)는 작업 스레드에서 실행)
+
+    - report(status, detail, value, maximum): 진행상태 표시
+    - emit(text): 결과창에 부분 결과 추가
+    - on_done(result): 작업 완료 후 메인 스레드에서 호출
+    """
+    job = {
+        'id': next(job_ids),
+        'title': title,
+        'func': func,
+        'args': args,
+        'on_done': on_done,
+        'error_title': error_title,
+        'cancel': threading.Event(),
+        'stages': [],
+        'seconds': None,
+        'insert_seconds': 0.0,
+        'profile': profile_next_var.get(),  # 다음 작업 한 번만 cProfile로 실행
+        'profile_path': None,
+    }
+    profile_next_var.set(False)
+    pending_jobs.append(job)
+    job_queue.put(job)
+    update_job_status()
+    return job
+
+def job_worker():
+    """작업 스레드: 대기열의 작업을 순서대로 실행"""
+    while True:
+        job = job_queue.get()
+        load_heavy_modules()    # 시작 직후 바로 작업을 넣었으면 모듈 읽기가 끝날 때까지 기다림
+        if job['cancel'].is_set():
+            job_events.put(('cancelled', job, None))
+            continue
+        job_events.put(('start', job, None))
+
+        def report(status, detail='', value=None, maximum=None, job=job):
+            if job['cancel'].is_set():
+                raise JobCancelled()
+            job_events.put(('progress', job, (status, detail, value, maximum)))
+
+        def emit(text, job=job):
+            if job['cancel'].is_set():
+                raise JobCancelled()
+            job_events.put(('output', job, text))
+
+        job['stages'] = start_stages()
+        profiler = cProfile.Profile() if job['profile'] else None
+        started = time.perf_counter()
+        try:
+            if profiler:
+                profiler.enable()
+            try:
+                result = job['func'](report, emit, *job['args'])
+            finally:
+                if profiler:
+                    profiler.disable()
+                    job['profile_path'] = profile_path_for(job['func'].__name__)
+                    profiler.dump_stats(job['profile_path'])
+                job['seconds'] = time.perf_counter() - started
+                perf_local.stages = None
+            job_events.put(('done', job, result))
+        except JobCancelled:
+            job_events.put(('cancelled', job, None))
+        except Exception as e:
+            job_events.put(('error', job, str(e)))
+
+def cancel_current_job():
+    if current_job is not None:
+        current_job['cancel'].set()
+        job_status_label.config(text=f"취소 요청: {current_job['title']}")
+
+def cancel_all_jobs():
+    for job in pending_jobs:
+        job['cancel'].set()
+    cancel_current_job()
+
+def update_job_status():
+    waiting = [job for job in pending_jobs if not job['cancel'].is_set()]
+    job_queue_label.config(text=f"대기: {len(waiting)}개" if waiting else "")
+
+def poll_job_events():
+    """작업 스레드에서 온 이벤트를 메인 스레드에서 처리 (window.after로 반복)"""
+    global current_job, jobs_in_run
+    result_changed = False
+    for _ in range(JOB_EVENTS_PER_POLL):
+        try:
+            kind, job, payload = job_events.get_nowait()
+        except queue.Empty:
+            break
+
+        if kind == 'start':
+            current_job = job
+            if job in pending_jobs:
+                pending_jobs.remove(job)
+            if jobs_in_run == 0:
+                clear_result()
+            else:
+                store_append(result_store, f"\n\n===== [{job['id']}] {job['title']} =====\n")
+            result_changed = True
+            jobs_in_run += 1
+            job_status_label.config(text=f"실행 중: {job['title']}")
+            job_detail_label.config(text="")
+            job_progress_bar['value'] = 0
+        elif kind == 'progress':
+            status, detail, value, maximum = payload
+            job_status_label.config(text=f"[{job['title']}] {status}")
+            job_detail_label.config(text=detail)
+            if maximum is not None:
+                job_progress_bar['maximum'] = maximum
+            if value is not None:
+                job_progress_bar['value'] = value
+        elif kind == 'output':
+            started = time.perf_counter()
+            store_append(result_store, payload)
+            result_changed = True
+            job['insert_seconds'] += time.perf_counter() - started
+        else:
+            if job in pending_jobs:
+                pending_jobs.remove(job)
+            if job is current_job:
+                current_job = None
+            job_detail_label.config(text="")
+            if job['seconds'] is not None:
+                finish_job_perf(job, kind)
+                result_changed = True
+            if kind == 'done':
+                job_status_label.config(text=f"완료: {job['title']}")
+                job_progress_bar['value'] = job_progress_bar['maximum']
+                if job['on_done']:
+                    job['on_done'](payload)
+            elif kind == 'cancelled':
+                job_status_label.config(text=f"취소됨: {job['title']}")
+            elif kind == 'error':
+                job_status_label.config(text=f"오류: {job['title']}")
+                messagebox.showerror(job['error_title'], payload)
+
+        if current_job is None and not pending_jobs:
+            jobs_in_run = 0
+        update_job_status()
+
+    # 결과창은 이벤트를 모두 처리한 뒤 한 번만 다시 그림
+    if result_changed:
+        render_result()
+    window.after(JOB_POLL_MS, poll_job_events)
+
+def finish_job_perf(job, status):
+    """작업 측정 결과를 로그에 기록하고 결과창 끝에 접힌 요약으로 표시 (클릭하면 펼침)"""
+    stages = list(job['stages'])
+    if job['insert_seconds']:
+        stages.append({'stage': '결과창 출력', 'seconds': round(job['insert_seconds'], 3), 'rss_mb': None, 'rss_delta_mb': None})
+    record = make_perf_record(job['title'], job['func'].__name__, status, job['seconds'], stages, job['profile_path'])
+    write_perf_log(record)
+
+    summary, lines = format_perf_lines(record)
+    _, head_line = store_append(result_store, f"\n\n{summary} (클릭하여 펼치기/접기)\n", 'perf')
+    first, last = store_append(result_store, "\n".join(lines) + "\n", 'perf')
+    result_store['folds'][head_line] = [first, last, True]
+
+# =============================================
+# 📌 작업 함수 (작업 스레드에서 실행)
+# =============================================
+
+def check_import_index(report, account, df, file_path):
+    """account가 있으면 임포트 이력과 겹치는 키 확인 → imported_masks (없으면 None)"""
+    if not account:
+        return None
+    report("임포트 이력 확인 중...", account)
+    with stage('이력 확인'):
+        return find_imported_keys(account, df, os.path.basename(file_path))
+
+def sql_text_job(report, emit, file_path, selected_num_len, account=None):
+    """SQL 변환 결과를 결과창에 출력 (청크 단위로 전달)
+
+    account가 있으면 임포트 이력과 겹치는 키를 검사하고, 성공한 행의 키를 이력에 기록
+    """
+    report("엑셀 읽는 중...", os.path.basename(file_path))
+    with stage('엑셀 읽기'):
+        df, read_info = read_import_excel(file_path)
+    imported_masks = check_import_index(report, account, df, file_path)
+
+    report("검증 중...", f"총 {len(df)}행 (읽기: {read_info['reader']} {read_info['seconds']}초)")
+    with stage('검증'):
+        (sql_df, errors), changes = prepare_sql_rows_incremental(df, selected_num_len, file_path, imported_masks)
+    success_mask = errors == ''
+    success_admin_no_list = df.loc[success_mask, '수용가번호'].tolist()
+    success_count = int(success_mask.sum())
+    fail_count = len(df) - success_count
+
+    emit("-- ✅ 임포트전 조회할 수용가목록\n")
+    emit(quote_sql_list(success_admin_no_list) + "\n")
+    emit(f"-- 총 {len(df)}개 중 {success_count}개 성공, {fail_count}개 실패\n")
+    if changes is not None:
+        emit(f"-- {format_row_changes(changes)}\n")
+
+    # .sql 파일과 같이 한 줄에 한 행 (쉼표를 앞에 붙여 오류 주석 줄이 사이에 끼어도 SQL이 깨지지 않게 함)
+    with stage('문자열 포맷'):
+        first_value = True
+        for start in range(0, len(df), SQL_CHUNK_ROWS):
+            end = min(start + SQL_CHUNK_ROWS, len(df))
+            report("SQL 생성 중...", f"{end}/{len(df)}행", end, len(df))
+            lines = []
+            for line in format_sql_values(sql_df.iloc[start:end], errors.iloc[start:end]):
+                if not line.startswith(ERROR_LINE_PREFIX):
+                    line = (" " if first_value else ",") + line
+                    first_value = False
+                lines.append(line)
+            emit("\n".join(lines) + "\n")
+
+    if account:
+        with stage('이력 기록'):
+            record_imported_keys(account, df[success_mask], os.path.basename(file_path))
+
+def sql_file_job(report, emit, file_path, selected_num_len, sql_path, insert_prefix, batch_rows, account=None, output_format='values'):
+    """SQL 파일 저장 모드: 파일로 바로 기록하고 결과창에는 요약과 앞부분만 표시"""
+    report("엑셀 읽는 중...", os.path.basename(file_path))
+    with stage('엑셀 읽기'):
+        df, read_info = read_import_excel(file_path)
+    imported_masks = check_import_index(report, account, df, file_path)
+    report("검증 중...", f"총 {len(df)}행 (읽기: {read_info['reader']} {read_info['seconds']}초)")
+    with stage('검증'):
+        prepared, changes = prepare_sql_rows_incremental(df, selected_num_len, file_path, imported_masks)
+
+    try:
+        with stage('SQL 파일 기록'):
+            success_count, fail_count, preview, admin_list_path = write_sql_file(
+                df, selected_num_len, sql_path, insert_prefix=insert_prefix, batch_rows=batch_rows,
+                progress=report, prepared=prepared, output_format=output_format)
+    except JobCancelled:
+        # 취소 시 기록 중이던 파일 삭제
+        stem = os.path.splitext(sql_path)[0]
+        for path in (sql_path, stem + "_수용가목록.txt", stem + ".csv", stem + ".tsv"):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    if account:
+        with stage('이력 기록'):
+            record_imported_keys(account, df[prepared[1] == ''], os.path.basename(file_path))
+
+    emit(f"-- 총 {len(df)}개 중 {success_count}개 성공, {fail_count}개 실패\n")
+    if changes is not None:
+        emit(f"-- {format_row_changes(changes)}\n")
+    emit(f"-- 💾 SQL 파일: {sql_path}\n")
+    if output_format != 'values':
+        emit(f"-- 💾 COPY 데이터 파일: {os.path.splitext(sql_path)[0]}.{output_format}\n")
+    emit(f"-- ✅ 임포트전 조회할 수용가목록: {admin_list_path}\n")
+    emit(f"-- 앞부분 {len(preview)}줄 미리보기\n\n")
+    emit("\n".join(preview))
+
+def stats_job(report, emit, file_path):
+    report("엑셀 읽으며 통계 분석 중...", os.path.basename(file_path))
+    with stage('읽기+통계 분석'):
+        stats = analyze_stats_file(file_path)
+    emit(format_stats_text(stats))
+
+def check_job(report, emit, file_path, account=None, mark_mode=None, rules=None):
+    """종합검사 후 문제가 있으면 워크북에 색상 표시 → 결과 dict
+
+    저장은 '중복항목' 시트 추가 여부를 물어본 뒤 save_check_job에서 한 번만 한다.
+    account가 있으면 임포트 이력과 겹치는 키와 계정 영역 밖 좌표도 표시한다.
+    rules(선택한 계정의 검증 계획)가 있으면 수용가번호 자릿수/구조를 계정 기준으로 검사한다.
+    """
+    report("엑셀 읽는 중...", os.path.basename(file_path))
+    with stage('워크북 읽기'):
+        wb, df = load_check_workbook(file_path)
+    if '수용가번호' not in df.columns:
+        return {'status': 'no_column'}
+
+    imported_masks = check_import_index(report, account, df, file_path)
+    area = load_account_area(account, os.path.basename(file_path)) if account else None
+    with stage('검사'):
+        result = run_workbook_checks(df, report, imported_masks, rules, area)
+    if result is None:
+        return {'status': 'no_checks'}
+    with stage('변경 행 확인'):
+        result['row_changes'] = track_row_changes(df, file_path, 'check')
+    if not result['all_problem_rows']:
+        return {'status': 'clean'}
+
+    # 엑셀 파일에 색상 표시
+    report("엑셀 파일에 색상 표시 중...", f"총 {len(result['all_problem_rows'])}개 행 처리")
+    with stage('색상 표시'):
+        apply_check_marks(wb, df, result, mark_mode)
+    return {'status': 'marked', 'file_path': file_path, 'wb': wb, 'df': df, 'result': result, 'mark_mode': mark_mode}
+
+def save_check_job(report, emit, file_path, wb, duplicate_row_indices, mark_mode=None, labels=None):
+    """색상 표시된 워크북에 (선택 시) '중복항목' 시트를 추가하고 한 번에 저장 → 추가된 행 수"""
+    added_count = 0
+    if duplicate_row_indices:
+        report("'중복항목' 시트 추가 중...", f"총 {len(duplicate_row_indices)}개 행")
+        with stage('중복항목 시트'):
+            added_count = add_problem_sheet(wb, duplicate_row_indices, mark_mode, labels)
+    report("엑셀 파일 저장 중...", os.path.basename(file_path))
+    with stage('저장'):
+        wb.save(file_path)
+    return added_count
+
+# =============================================
+# 📌 GUI 버튼 핸들러
+# =============================================
 
 def generate_sql_from_excel():
     file_path = filedialog.askopenfilename(title="엑셀 파일 선택", filetypes=[("Excel files", "*.xlsx *.xls")])
@@ -36,81 +2787,68 @@ def generate_sql_from_excel():
         messagebox.showwarning("파일 선택", "파일이 선택되지 않았습니다.")
         return
 
-    idx = site_combobox.current()
-    if idx < 0:
+    if site_combobox.current() < 0:
         messagebox.showwarning("계정명 선택", "먼저 계정명을 선택하세요.")
         return
     try:
-        selected_num_len = int(filtered_df.iloc[idx]['수용가번호길이'])
+        rule_plan = selected_rule_plan()
     except Exception:
         messagebox.showerror("계정명 오류", "선택한 계정의 수용가번호길이 값이 올바르지 않습니다.")
         return
 
-    try:
-        df = pd.read_excel(file_path, dtype=str).fillna('')
-        df = df.iloc[:, 1:1+len(COLUMNS)]
-        df.columns = COLUMNS
-
-        admin_no_counts = df['수용가번호'].value_counts()
-        duplicated_admin_nos = set(admin_no_counts[admin_no_counts > 1].index)
-
-        values_list = []
-        success_count = 0
-        fail_count = 0
-        success_admin_no_list = []
-
-        validation_cases = [
-            ("수용가번호 길이 검사", lambda row: len(row['수용가번호']) == selected_num_len, "수용가번호 길이 불일치"),
-            ("수용가번호 중복 검사", lambda row: row['수용가번호'] not in duplicated_admin_nos, "수용가번호 중복"),
-            ("수용가 전화번호 길이 검사", lambda row: len(row['수용가 전화번호']) < 14, "수용가 전화번호 13자리 초과"),
-        ]
+    account = selected_index_account()
 
-        for idx_row, row in df.iterrows():
-            try:
-                for case_num, (desc, check_func, err_msg) in enumerate(validation_cases, 1):
-                    if not check_func(row):
-                        raise ValueError(f"[CASE #{case_num}] {err_msg} (값: {row['수용가번호']})")
-
-                def safe_float(val, col):
-                    if val == '':
-                        raise ValueError(f"{col} 값이 비어있음")
-                    return float(val)
-
-                def safe_int(val, col):
-                    if val == '':
-                        raise ValueError(f"{col} 값이 비어있음")
-                    return int(val)
-
-                values = (
-                    row['수용가명'], row['수용가번호'], row['구주소'], row['신주소'],
-                    safe_float(row['경도'], '경도'), safe_float(row['위도'], '위도'),
-                    row['업종'], SITE_SQ, COMPANY_SQ,
-                    row['수용가 전화번호'], row['수용가 대상 년도'], row['검침원'],
-                    safe_int(row['검침일'], '검침일'), row['계량기번호'],
-                    safe_int(row['구경'], '구경'), row['통신'], row['단말 부번호'],
-                    row['단말 주번호'], COMPANY_SQ,
-                    f"{pd.to_datetime(row['단말 설치일']).date()}"
-                )
-
-                formatted = "('{}', '{}', '{}', '{}', {}, {}, '{}', {}, {}, '{}', '{}', '{}', {}, '{}', {}, '{}', '{}', '{}', {}, '{}'::timestamp)".format(*values)
-                values_list.append(formatted)
-                success_admin_no_list.append(row['수용가번호'])
-                success_count += 1
+    # COPY 형식은 파일로만 저장
+    if sql_file_var.get() or output_format_var.get() != 'values':
+        save_sql_to_file(file_path, rule_plan, account)
+        return
 
-            except Exception as e:
-                values_list.append(f"-- [ERROR #{idx_row+1}] {e}")
-                fail_count += 1
+    submit_job(f"SQL 변환: {os.path.basename(file_path)}", sql_text_job,
+               (file_path, rule_plan, account), error_title="에러 발생")
 
-        result_text.config(state=tk.NORMAL)
-        result_text.delete(1.0, tk.END)
-        result_text.insert(tk.END, "-- ✅ 임포트전 조회할 수용가목록")
-        result_text.insert(tk.END, ",".join(f"'{x}'" for x in success_admin_no_list) + "")
-        result_text.insert(tk.END, f"-- 총 {len(df)}개 중 {success_count}개 성공, {fail_count}개 실패")
-        result_text.insert(tk.END, ",".join(values_list))
-        result_text.config(state=tk.DISABLED)
+def selected_rule_plan():
+    """선택된 계정의 검증 계획 (선택 전이면 None, 수용가번호길이가 잘못되었으면 ValueError)
 
-    except Exception as e:
-        messagebox.showerror("에러 발생", str(e))
+    계정 정의가 같으면 get_rule_plan 캐시에서 꺼내므로 계정을 바꿔도 다시 컴파일하지 않는다.
+    """
+    idx = site_combobox.current()
+    if idx < 0:
+        return None
+    row = filtered_df.iloc[idx]
+    return get_rule_plan(row['수용가번호길이'], row['고객번호구조'])
+
+def selected_index_account():
+    """임포트 이력 사용 시 선택된 계정명 (사용 안 하거나 선택 전이면 None)"""
+    if not index_var.get() or site_combobox.current() < 0:
+        return None
+    return site_combobox.get()
+
+def save_sql_to_file(file_path, selected_num_len, account=None):
+    """저장할 .sql 경로와 옵션을 받아 SQL 파일 저장 작업 추가"""
+    sql_path = filedialog.asksaveasfilename(
+        title="SQL 파일 저장", defaultextension=".sql",
+        initialfile=os.path.splitext(os.path.basename(file_path))[0] + ".sql",
+        filetypes=[("SQL files", "*.sql")])
+    if not sql_path:
+        messagebox.showwarning("파일 선택", "저장할 파일이 선택되지 않았습니다.")
+        return
+
+    insert_prefix = insert_entry.get().strip()
+    try:
+        batch_rows = int(batch_spinbox.get())
+    except ValueError:
+        batch_rows = 0
+
+    output_format = output_format_var.get()
+    if output_format != 'values':
+        try:
+            parse_insert_target(insert_prefix)
+        except ValueError as e:
+            messagebox.showwarning("COPY 대상 없음", str(e))
+            return
+
+    submit_job(f"SQL 파일 저장: {os.path.basename(file_path)}", sql_file_job,
+               (file_path, selected_num_len, sql_path, insert_prefix, batch_rows, account, output_format), error_title="에러 발생")
 
 def analyze_excel_customer_stats():
     file_path = filedialog.askopenfilename(title="엑셀 파일 선택", filetypes=[("Excel files", "*.xlsx *.xls")])
@@ -118,72 +2856,7 @@ def analyze_excel_customer_stats():
         messagebox.showwarning("파일 선택", "파일이 선택되지 않았습니다.")
         return
 
-    try:
-        df = pd.read_excel(file_path, engine='openpyxl').fillna('')
-        df.columns = [col.strip() for col in df.columns]
-
-        result_text.config(state=tk.NORMAL)
-        result_text.delete(1.0, tk.END)
-
-        # 실제 컬럼명 출력
-        result_text.insert(tk.END, "📋 엑셀 파일의 실제 컬럼명:\n")
-        for i, col in enumerate(df.columns, 1):
-            result_text.insert(tk.END, f"{i:2d}. {col}\n")
-        result_text.insert(tk.END, "\n")
-
-        # 수용가번호 총 수량
-        if '수용가번호' in df.columns:
-            total = df['수용가번호'].nunique()
-            result_text.insert(tk.END, f"✅ 수용가번호 총 수량: {total}\n\n")
-        else:
-            result_text.insert(tk.END, "⚠️ '수용가번호' 컬럼이 없습니다.\n\n")
-
-        # 일반적인 분석 컬럼들 (실제 컬럼명에 맞게 조정)
-        analysis_columns = []
-        
-        # 블록 관련 컬럼 찾기
-        block_columns = [col for col in df.columns if '블록' in col]
-        analysis_columns.extend(block_columns)
-        
-        # 구분 관련 컬럼 찾기
-        division_columns = [col for col in df.columns if '구분' in col or '분류' in col or '구' in col]
-        analysis_columns.extend(division_columns)
-        
-        # 기타 분석 가능한 컬럼들
-        other_columns = ['업종', '소속', '통신', '구경', '검침원']
-        for col in other_columns:
-            if col in df.columns:
-                analysis_columns.append(col)
-        
-        # 중복 제거
-        analysis_columns = list(set(analysis_columns))
-        
-        if analysis_columns:
-            result_text.insert(tk.END, "📊 항목별 통계 분석:\n")
-            for col in analysis_columns:
-                if col in df.columns:
-                    result_text.insert(tk.END, f"\n📈 '{col}' 항목별 개수:\n")
-                    counts = df[col].value_counts()
-                    total_count = len(counts)
-                    result_text.insert(tk.END, f"총 {total_count}개 항목\n")
-                    
-                    # 상위 10개만 표시 (너무 많으면 화면이 복잡해짐)
-                    display_counts = counts.head(10)
-                    for value, count in display_counts.items():
-                        percentage = (count / len(df)) * 100
-                        result_text.insert(tk.END, f"- {value}: {count}개 ({percentage:.1f}%)\n")
-                    
-                    if len(counts) > 10:
-                        result_text.insert(tk.END, f"... 외 {len(counts) - 10}개 항목\n")
-                else:
-                    result_text.insert(tk.END, f"⚠️ 컬럼 '{col}' 없음\n")
-        else:
-            result_text.insert(tk.END, "⚠️ 분석 가능한 컬럼을 찾을 수 없습니다.\n")
-
-        result_text.config(state=tk.DISABLED)
-
-    except Exception as e:
-        messagebox.showerror("분석 오류", str(e))
+    submit_job(f"통계 분석: {os.path.basename(file_path)}", stats_job, (file_path,), error_title="분석 오류")
 
 def mark_duplicates_in_place():
     file_path = filedialog.askopenfilename(title="엑셀 파일 선택", filetypes=[("Excel files", "*.xlsx")])
@@ -191,311 +2864,82 @@ def mark_duplicates_in_place():
         messagebox.showwarning("파일 선택", "파일이 선택되지 않았습니다.")
         return
 
+    mark_mode = 'conditional' if conditional_mark_var.get() else 'cell'
     try:
-        df = pd.read_excel(file_path, dtype=str).fillna('')
-        if '수용가번호' not in df.columns:
-            messagebox.showerror("열 없음", "'수용가번호' 열이 존재하지 않습니다.")
-            return
+        rule_plan = selected_rule_plan()
+    except ValueError:
+        # 수용가번호길이가 잘못된 계정은 기본 자릿수 규칙으로 검사
+        rule_plan = None
+    submit_job(f"종합검사: {os.path.basename(file_path)}", check_job, (file_path, selected_index_account(), mark_mode, rule_plan),
+               on_done=on_check_done, error_title="오류")
 
-        # 진행상태 창 생성
-        progress_window = tk.Toplevel()
-        progress_window.title("중복 검사 및 표시 진행상태")
-        progress_window.geometry("500x200")
-        progress_window.transient(window)
-        progress_window.grab_set()
-
-        # 프로그레스바
-        progress_label = tk.Label(progress_window, text="중복 항목 검사 및 적색 표시 중...")
-        progress_label.pack(pady=(20, 10))
-        
-        progress_bar = ttk.Progressbar(progress_window, length=400, mode='determinate')
-        progress_bar.pack(pady=(0, 10))
-        
-        status_label = tk.Label(progress_window, text="")
-        status_label.pack(pady=(0, 10))
-        
-        detail_label = tk.Label(progress_window, text="")
-        detail_label.pack(pady=(0, 10))
-
-        # 중복 검사할 항목들 정의 (지시부번호는 단말 주번호와 동일)
-        duplicate_checks = [
-            ('수용가번호', '수용가번호'),
-            ('계량기번호', '계량기번호'),
-            ('단말 주번호', '지시부번호/단말 주번호'),
-            ('단말 부번호', '단말 부번호'),
-            ('IMEI', 'IMEI'),
-            ('패스워드', '패스워드')
-        ]
-        
-        # 수용가상태 검사할 값들
-        status_checks = ['단수', '중지', '철거', '폐전']
-        
-        # 자릿수 검사할 항목들 (컬럼명, 최소자릿수, 최대자릿수)
-        digit_checks = [
-            ('수용가번호', 13, 13),      # 수용가번호는 정확히 13자리
-            ('계량기번호', 5, 20),      # 계량기번호는 보통 5-20자리
-            ('단말 주번호', 5, 15),     # 단말 주번호는 보통 5-15자리
-            ('IMEI', 15, 15),          # IMEI는 정확히 15자리
-            ('패스워드', 4, 20)         # 패스워드는 보통 4-20자리
-        ]
-        
-        # 실제 존재하는 컬럼만 필터링
-        available_checks = []
-        for col_name, display_name in duplicate_checks:
-            if col_name in df.columns:
-                available_checks.append((col_name, display_name))
-        
-        if not available_checks:
-            messagebox.showerror("오류", "검사할 수 있는 컬럼이 없습니다.")
-            return
+def on_check_done(outcome):
+    """종합검사 완료 후 결과 안내 및 '중복항목' 시트 추가 여부 확인"""
+    status = outcome['status']
+    if status == 'no_column':
+        messagebox.showerror("열 없음", "'수용가번호' 열이 존재하지 않습니다.")
+        return
+    if status == 'no_checks':
+        messagebox.showerror("오류", "검사할 수 있는 컬럼이 없습니다.")
+        return
+    if status == 'clean':
+        messagebox.showinfo("문제 없음", "중복된 항목이나 문제가 있는 수용가상태가 없습니다.")
+        return
 
-        # 중복된 행들의 인덱스 수집
-        duplicate_rows = set()
-        duplicate_stats = {}
-        duplicate_details = {}
-        
-        # 수용가상태 문제 행들의 인덱스 수집
-        status_problem_rows = set()
-        
-        # 빈값/자릿수 문제 셀들의 위치 수집 (행, 열, 문제유형)
-        cell_problems = []  # [(row_idx, col_name, problem_type, value), ...]
-        cell_problem_stats = {}
-        
-        total_checks = len(available_checks)
-        progress_bar['maximum'] = total_checks
-        
-        for check_idx, (col_name, display_name) in enumerate(available_checks):
-            status_label.config(text=f"검사 중: {display_name}")
-            detail_label.config(text=f"진행률: {check_idx + 1}/{total_checks}")
-            progress_bar['value'] = check_idx + 1
-            progress_window.update()
-            
-            # 중복 검사
-            duplicated = df[col_name][df[col_name].duplicated(keep=False)]
-            if not duplicated.empty:
-                # 중복된 값들을 가진 행들의 인덱스 수집
-                duplicated_indices = df[df[col_name].duplicated(keep=False)].index
-                duplicate_rows.update(duplicated_indices)
-                duplicate_stats[display_name] = len(duplicated)
-                
-                # 중복된 값들의 목록 저장 (상위 10개만)
-                duplicated_values = duplicated.unique()
-                duplicate_details[display_name] = duplicated_values[:10].tolist()
-        
-        # 수용가상태 검사
-        if '수용가상태' in df.columns:
-            status_label.config(text="수용가상태 검사 중...")
-            detail_label.config(text="단수, 중지, 철거, 폐전 검사")
-            progress_window.update()
-            
-            for status_value in status_checks:
-                status_indices = df[df['수용가상태'] == status_value].index
-                status_problem_rows.update(status_indices)
-        
-        # 빈값 및 자릿수 검사
-        status_label.config(text="빈값 및 자릿수 검사 중...")
-        detail_label.config(text="셀별 문제 검사")
-        progress_window.update()
-        
-        # 빈값 검사
-        empty_count = 0
-        for col_name in ['수용가번호', '계량기번호', '단말 주번호', 'IMEI']:
-            if col_name in df.columns:
-                empty_indices = df[df[col_name] == ''].index
-                for idx in empty_indices:
-                    cell_problems.append((idx, col_name, '빈값', ''))
-                    empty_count += 1
-        
-        if empty_count > 0:
-            cell_problem_stats['빈값'] = empty_count
-        
-        # 자릿수 검사
-        digit_count = 0
-        for col_name, min_digits, max_digits in digit_checks:
-            if col_name in df.columns:
-                for idx, row in df.iterrows():
-                    value = str(row[col_name])
-                    if value and value != '':
-                        if len(value) < min_digits or len(value) > max_digits:
-                            cell_problems.append((idx, col_name, '자릿수', value))
-                            digit_count += 1
-        
-        if digit_count > 0:
-            cell_problem_stats['자릿수'] = digit_count
-        
-        # 모든 문제가 있는 행들 통합
-        all_problem_rows = duplicate_rows.union(status_problem_rows)
-        
-        if not all_problem_rows:
-            messagebox.showinfo("문제 없음", "중복된 항목이나 문제가 있는 수용가상태가 없습니다.")
-            progress_window.destroy()
-            return
+    df = outcome['df']
+    result = outcome['result']
 
-        # 엑셀 파일에 색상 표시
-        status_label.config(text="엑셀 파일에 색상 표시 중...")
-        detail_label.config(text=f"총 {len(all_problem_rows)}개 행 처리")
-        progress_window.update()
-        
-        wb = load_workbook(file_path)
-        ws = wb.active
-        headers = [cell.value for cell in ws[1]]
-        
-        # 색상 및 음영 정의
-        red_font = Font(color="FF0000")      # 적색: 수용가상태 문제
-        blue_font = Font(color="0000FF")     # 파란색: 중복 값
-        yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")  # 노란색 음영
-        
-        # 수용가상태 문제 행들을 적색으로 표시 (행 전체)
-        for row_idx in status_problem_rows:
-            excel_row = row_idx + 2  # pandas는 0-based, excel은 1-based + 헤더
-            for col in range(1, ws.max_column + 1):
-                cell = ws.cell(row=excel_row, column=col)
-                cell.font = red_font
-        
-        # 중복된 값이 있는 셀들을 노란색 음영으로 표시 (셀별)
-        for col_name, display_name in available_checks:
-            if col_name in df.columns:
-                duplicated_values = df[col_name][df[col_name].duplicated(keep=False)]
-                if not duplicated_values.empty:
-                    duplicated_indices = df[df[col_name].duplicated(keep=False)].index
-                    
-                    # 헤더에서 해당 컬럼의 위치 찾기
-                    try:
-                        col_idx = headers.index(col_name) + 1
-                        # 중복된 값이 있는 셀들만 노란색 음영으로 표시
-                        for row_idx in duplicated_indices:
-                            excel_row = row_idx + 2  # pandas는 0-based, excel은 1-based + 헤더
-                            cell = ws.cell(row=excel_row, column=col_idx)
-                            cell.fill = yellow_fill
-                    except ValueError:
-                        # 컬럼이 존재하지 않는 경우 무시
-                        pass
-        
-        # 빈값/자릿수 문제 셀들을 노란색 음영으로 표시
-        for row_idx, col_name, problem_type, value in cell_problems:
-            excel_row = row_idx + 2  # pandas는 0-based, excel은 1-based + 헤더
-            
-            # 헤더에서 해당 컬럼의 위치 찾기
-            try:
-                col_idx = headers.index(col_name) + 1
-                cell = ws.cell(row=excel_row, column=col_idx)
-                cell.fill = yellow_fill
-            except ValueError:
-                # 컬럼이 존재하지 않는 경우 무시
-                pass
-        
-        wb.save(file_path)
-        progress_window.destroy()
-        
-        # 통계 표시
-        stats_text = "🔍 검사 결과:\n\n"
-        
-        # 중복 통계
-        if duplicate_stats:
-            stats_text += "📊 중복 항목:\n"
-            for display_name, count in duplicate_stats.items():
-                stats_text += f"  🔵 중복 {display_name}: {count}개\n"
-                if display_name in duplicate_details:
-                    details = duplicate_details[display_name]
-                    if len(details) > 0:
-                        stats_text += "     중복 값 예시: " + ", ".join(str(x) for x in details[:5])
-                        if len(details) > 5:
-                            stats_text += f" ... 외 {len(details) - 5}개"
-                        stats_text += "\n"
-        
-        # 수용가상태 통계
-        if status_problem_rows:
-            status_counts = {}
-            for status_value in status_checks:
-                if '수용가상태' in df.columns:
-                    count = len(df[df['수용가상태'] == status_value])
-                    if count > 0:
-                        status_counts[status_value] = count
-            
-            if status_counts:
-                stats_text += "\n📊 수용가상태 문제:\n"
-                for status_value, count in status_counts.items():
-                    stats_text += f"  🔴 {status_value}: {count}개\n"
-        
-        # 셀별 문제 통계
-        if cell_problem_stats:
-            stats_text += "\n📊 셀별 문제:\n"
-            for problem_type, count in cell_problem_stats.items():
-                stats_text += f"  🟡 {problem_type}: {count}개\n"
-        
-        stats_text += f"\n총 {len(all_problem_rows)}개 행이 색상으로 표시되었습니다."
-        stats_text += f"\n🟡 노란색 음영: 중복 항목 ({len(duplicate_rows)}개)"
-        stats_text += f"\n🔴 적색: 수용가상태 문제 ({len(status_problem_rows)}개)"
-        stats_text += f"\n🟡 노란색 음영: 빈값/자릿수 문제 ({len(cell_problems)}개)"
-        
-                # 시트 추가 옵션 제공
-        response = messagebox.askyesno("검사 완료", 
-                                      f"{stats_text}\n\n"
-                                      f"원본 파일에 '중복항목' 시트를 추가하시겠습니까?")
-        
-        if response:
-            create_filtered_file(file_path, list(all_problem_rows), df)
+    # 통계 표시
+    stats_text = format_check_stats(df, result)
 
-    except Exception as e:
-        messagebox.showerror("오류", str(e))
+    # 시트 추가 옵션 제공
+    response = messagebox.askyesno("검사 완료",
+                                  f"{stats_text}\n\n"
+                                  f"원본 파일에 '중복항목' 시트를 추가하시겠습니까?")
 
-def create_filtered_file(original_file_path, duplicate_row_indices, original_df):
-    """원본 파일에 중복 항목 시트 추가"""
-    try:
-        # 중복된 행들만 필터링
-        filtered_df = original_df.iloc[duplicate_row_indices].copy()
-        
-        if filtered_df.empty:
-            messagebox.showinfo("결과", "중복된 항목이 없습니다.")
-            return
-        
-        # 원본 파일 열기
-        wb = load_workbook(original_file_path)
-        
-        # 기존에 '중복항목' 시트가 있다면 삭제
-        if '중복항목' in wb.sheetnames:
-            wb.remove(wb['중복항목'])
-        
-        # 새 시트 생성
-        ws_new = wb.create_sheet('중복항목')
-        
-        # 헤더 복사 (첫 번째 시트에서)
-        ws_original = wb.active
-        headers = []
-        for col in range(1, ws_original.max_column + 1):
-            header_value = ws_original.cell(row=1, column=col).value
-            headers.append(header_value)
-            ws_new.cell(row=1, column=col, value=header_value)
-        
-        # 데이터 복사
-        for row_idx, original_row_idx in enumerate(duplicate_row_indices, 2):
-            excel_row = original_row_idx + 2  # pandas는 0-based, excel은 1-based + 헤더
-            for col in range(1, ws_original.max_column + 1):
-                cell_value = ws_original.cell(row=excel_row, column=col).value
-                ws_new.cell(row=row_idx, column=col, value=cell_value)
-        
-        # 중복된 행들 전체를 적색으로 표시
-        red_font = Font(color="FF0000")
-        
-        # 모든 행을 적색으로 표시 (행 전체)
-        for row in range(2, ws_new.max_row + 1):
-            for col in range(1, ws_new.max_column + 1):
-                cell = ws_new.cell(row=row, column=col)
-                cell.font = red_font
-        
-        # 파일 저장
-        wb.save(original_file_path)
-        
-        messagebox.showinfo("완료", f"원본 파일에 '중복항목' 시트가 추가되었습니다.\n총 {len(duplicate_row_indices)}개 행이 포함되었습니다.")
-        
-    except Exception as e:
-        messagebox.showerror("시트 추가 오류", str(e))
+    if response:
+        create_filtered_file(outcome['file_path'], outcome['wb'], list(result['all_problem_rows']), df, outcome['mark_mode'],
+                             result['fuzzy_labels'])
+    else:
+        submit_job(f"색상 표시 저장: {os.path.basename(outcome['file_path'])}", save_check_job,
+                   (outcome['file_path'], outcome['wb'], [], outcome['mark_mode']), error_title="오류")
 
-def read_google_sheet(sheet_url, credentials_path, worksheet_name):
-    gc = gspread.service_account(filename=credentials_path)
-    sh = gc.open_by_url(sheet_url)
-    worksheet = sh.worksheet(worksheet_name)
-    all_values = worksheet.get_all_values()
+def create_filtered_file(original_file_path, wb, duplicate_row_indices, original_df, mark_mode=None, labels=None):
+    """원본 파일에 중복 항목 시트 추가 (색상 표시와 함께 한 번에 저장)"""
+    # 중복된 행들만 필터링
+    filtered_df = original_df.iloc[duplicate_row_indices].copy()
+
+    if filtered_df.empty:
+        messagebox.showinfo("결과", "중복된 항목이 없습니다.")
+        duplicate_row_indices = []
+
+    def on_done(added_count):
+        if added_count:
+            messagebox.showinfo("완료", f"원본 파일에 '중복항목' 시트가 추가되었습니다.\n총 {added_count}개 행이 포함되었습니다.")
+
+    submit_job(f"중복항목 시트 추가: {os.path.basename(original_file_path)}", save_check_job,
+               (original_file_path, wb, duplicate_row_indices, mark_mode, labels), on_done=on_done, error_title="시트 추가 오류")
+
+# =============================================
+# 📌 계정 정보 (구글 시트)
+# =============================================
+
+sheet_url = "https://docs.google.com/spreadsheets/d/10XO7o99fYr4e_I_etJF3_eCFa2_dsDs2egSWeu1GAls/edit#gid=679649875"
+credentials_path = r"C:\제품등록\gcp9304-4410543fedf2.json"
+worksheet_name = "IN형식"
+
+exclude_accounts = ['나라장터', '농촌공사', '로우리스', '']
+
+# 계정 정보 로컬 캐시 (시트 연결 없이도 시작 가능)
+ACCOUNT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".importchecker", "accounts.json")
+ACCOUNT_CACHE_TTL = 6 * 60 * 60   # 캐시 유효 시간 (초), 지나면 백그라운드에서 새로고침
+ACCOUNT_FIELDS = ['계정명', '서비스코드', '수용가번호길이', '고객번호구조']
+
+def make_sheet_client():
+    return gspread.service_account(filename=credentials_path)
+
+def parse_account_values(all_values):
+    """시트 전체 값(get_all_values) → 계정 정보 DataFrame"""
     header = all_values[0]
     idx_account = header.index('계정명')
     idx_service = header.index('서비스코드')
@@ -505,26 +2949,891 @@ def read_google_sheet(sheet_url, credentials_path, worksheet_name):
         [row[idx_account], row[idx_service], row[idx_len], row[idx_struct]]
         for row in all_values[1:] if row[idx_account] and row[idx_service]
     ]
-    df = pd.DataFrame(data, columns=['계정명', '서비스코드', '수용가번호길이', '고객번호구조'])
+    df = pd.DataFrame(data, columns=ACCOUNT_FIELDS)
     return df
 
-# GUI 구성
-sheet_url = "https://docs.google.com/spreadsheets/d/10XO7o99fYr4e_I_etJF3_eCFa2_dsDs2egSWeu1GAls/edit#gid=679649875"
-credentials_path = r"C:\제품등록\gcp9304-4410543fedf2.json"
-worksheet_name = "IN형식"
-df = read_google_sheet(sheet_url, credentials_path, worksheet_name)
+def read_google_sheet(sheet_url, credentials_path, worksheet_name, client=None, spreadsheet=None):
+    """계정 정보 시트 → DataFrame (spreadsheet를 주면 이미 연 시트를 다시 열지 않음)"""
+    if spreadsheet is None:
+        gc = client or gspread.service_account(filename=credentials_path)
+        spreadsheet = gc.open_by_url(sheet_url)
+    worksheet = spreadsheet.worksheet(worksheet_name)
+    all_values = worksheet.get_all_values()
+    return parse_account_values(all_values)
+
+def get_sheet_revision(sh):
+    """시트 수정시각 (Drive 메타데이터), 조회할 수 없으면 None"""
+    try:
+        return sh.get_lastUpdateTime()
+    except Exception:
+        return None
+
+def load_account_cache(cache_path=ACCOUNT_CACHE_PATH):
+    """디스크 캐시 읽기 → dict (없거나 손상되었으면 None)"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get('sheet_url') != sheet_url or cache.get('worksheet') != worksheet_name:
+        return None
+    return cache
+
+def save_account_cache(cache, cache_path=ACCOUNT_CACHE_PATH):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+def account_cache_to_df(cache):
+    return pd.DataFrame(cache['rows'], columns=ACCOUNT_FIELDS)
+
+def is_account_cache_fresh(cache, ttl=ACCOUNT_CACHE_TTL):
+    return cache is not None and time.time() - cache.get('fetched_at', 0) < ttl
+
+def refresh_account_cache(client=None, cache_path=ACCOUNT_CACHE_PATH, force=False):
+    """구글 시트에서 계정 정보를 받아 캐시 갱신 → (cache, changed)
+
+    시트 수정시각이 캐시의 revision과 같으면 값은 다시 받지 않고 fetched_at만 갱신.
+    force=True면 항상 다시 받음. client는 gspread 클라이언트와 같은 인터페이스
+    (open_by_url → worksheet → get_all_values)면 무엇이든 가능 (오프라인 테스트용).
+    """
+    gc = client or make_sheet_client()
+    sh = gc.open_by_url(sheet_url)
+    cache = load_account_cache(cache_path)
+
+    revision = get_sheet_revision(sh)
+    if not force and cache and revision and cache.get('revision') == revision:
+        cache['fetched_at'] = time.time()
+        save_account_cache(cache, cache_path)
+        return cache, False
+
+    rows = read_google_sheet(sheet_url, credentials_path, worksheet_name, spreadsheet=sh).values.tolist()
+    if revision is None:
+        # 수정시각을 알 수 없으면 내용 해시를 revision으로 사용
+        revision = hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    changed = cache is None or cache.get('rows') != rows
+    cache = {
+        'sheet_url': sheet_url,
+        'worksheet': worksheet_name,
+        'revision': revision,
+        'fetched_at': time.time(),
+        'rows': rows,
+    }
+    save_account_cache(cache, cache_path)
+    return cache, changed
+
+def load_accounts(client=None, cache_path=ACCOUNT_CACHE_PATH, ttl=ACCOUNT_CACHE_TTL):
+    """캐시가 유효하면 캐시, 아니면 시트에서 새로 받은 계정 정보 DataFrame
+
+    시트 연결에 실패해도 오래된 캐시가 있으면 그것을 사용.
+    """
+    cache = load_account_cache(cache_path)
+    if is_account_cache_fresh(cache, ttl):
+        return account_cache_to_df(cache)
+    try:
+        cache, _ = refresh_account_cache(client, cache_path)
+    except Exception:
+        if cache is None:
+            raise
+    return account_cache_to_df(cache)
+
+def filter_accounts(df):
+    """제외 계정을 빼고 계정명 순으로 정렬"""
+    filtered_df = df[~df['계정명'].isin(exclude_accounts)].copy()
+    return filtered_df.sort_values('계정명').reset_index(drop=True)
+
+def find_account_num_len(accounts_df, account_name):
+    """계정명으로 수용가번호길이 조회 (없거나 잘못된 값이면 ValueError)"""
+    matched = accounts_df[accounts_df['계정명'] == account_name]
+    if matched.empty:
+        raise ValueError(f"계정명 '{account_name}'을(를) 찾을 수 없습니다.")
+    try:
+        return int(matched.iloc[0]['수용가번호길이'])
+    except Exception:
+        raise ValueError(f"계정 '{account_name}'의 수용가번호길이 값이 올바르지 않습니다.")
+
+def find_account_rule_plan(accounts_df, account_name):
+    """계정명으로 검증 계획 조회 (수용가번호길이 + 고객번호구조, 없거나 잘못된 값이면 ValueError)"""
+    num_len = find_account_num_len(accounts_df, account_name)
+    structure = accounts_df.loc[accounts_df['계정명'] == account_name, '고객번호구조'].iloc[0]
+    return get_rule_plan(num_len, structure)
+
+# =============================================
+# 📌 일괄 처리 (CLI)
+# =============================================
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+def collect_workbooks(paths):
+    """디렉터리/glob 패턴/파일 경로 → 엑셀 파일 목록 (엑셀 임시파일 '~$' 제외)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+        else:
+            candidates = sorted(glob.glob(path)) or [path]
+        for candidate in candidates:
+            name = os.path.basename(candidate)
+            if name.lower().endswith(EXCEL_EXTENSIONS) and not name.startswith('~$') and os.path.isfile(candidate):
+                files.append(os.path.abspath(candidate))
+    # 중복 경로 제거 (순서 유지)
+    return list(dict.fromkeys(files))
+
+def process_workbook(file_path, selected_num_len, output_dir, insert_prefix='', batch_rows=0, account=None, mark_mode=None,
+                     output_format='values'):
+    """엑셀 파일 하나에 대해 SQL 생성, 종합검사 표시, 통계 저장 (프로세스 풀 작업 단위)
+
+    원본은 수정하지 않고 output_dir에 '<이름>.sql', '<이름>_검사.xlsx', '<이름>_통계.txt'를 기록.
+    account가 있으면 임포트 이력과 겹치는 키를 검사하고 성공한 행의 키를 기록.
+    반환: 요약 dict
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    summary = {'file': file_path, 'rows': 0, 'success': 0, 'fail': 0, 'problem_rows': None, 'outputs': [], 'error': '',
+               'row_changes': None}
+    summary['stages'] = start_stages()
+    started = time.perf_counter()
+    try:
+        # xlsx는 워크북을 한 번만 열어 SQL/검사/통계/색상 표시에 같이 사용
+        with stage('워크북 읽기'):
+            if file_path.lower().endswith('.xlsx'):
+                wb, raw_df = load_check_workbook(file_path)
+            else:
+                wb, (raw_df, _) = None, read_sheet(file_path)
+        summary['rows'] = len(raw_df)
+
+        # SQL 생성 (이력 기록은 종합검사의 이력 확인까지 끝난 뒤)
+        source = os.path.basename(file_path)
+        import_df = to_import_columns(raw_df)
+        with stage('검증'):
+            imported_masks = find_imported_keys(account, import_df, source) if account else None
+            prepared, summary['row_changes'] = prepare_sql_rows_incremental(import_df, selected_num_len, file_path, imported_masks)
+        sql_path = os.path.join(output_dir, stem + ".sql")
+        with stage('SQL 파일 기록'):
+            success_count, fail_count, _, admin_list_path = write_sql_file(
+                import_df, selected_num_len, sql_path, insert_prefix=insert_prefix, batch_rows=batch_rows, prepared=prepared,
+                output_format=output_format)
+        summary['success'] = success_count
+        summary['fail'] = fail_count
+        summary['outputs'] += [sql_path, admin_list_path]
+        if output_format != 'values':
+            summary['outputs'].append(os.path.join(output_dir, f"{stem}.{output_format}"))
+
+        # 종합검사 (xlsx만 표시 가능)
+        if '수용가번호' not in raw_df.columns:
+            summary['error'] = "'수용가번호' 열이 존재하지 않습니다."
+        elif wb is not None:
+            with stage('검사'):
+                # to_import_columns는 행을 그대로 두므로 SQL 검증에서 확인한 이력 결과를 그대로 씀
+                result = run_workbook_checks(raw_df, imported_masks=imported_masks, rules=selected_num_len,
+                                             area=load_account_area(account, source) if account else None)
+            if result is not None:
+                summary['problem_rows'] = len(result['all_problem_rows'])
+                if result['all_problem_rows']:
+                    marked_path = os.path.join(output_dir, stem + "_검사.xlsx")
+                    with stage('색상 표시'):
+                        apply_check_marks(wb, raw_df, result, mark_mode)
+                        add_problem_sheet(wb, list(result['all_problem_rows']), mark_mode, result['fuzzy_labels'])
+                    with stage('저장'):
+                        wb.save(marked_path)
+                    summary['outputs'].append(marked_path)
+                    check_text = format_check_stats(raw_df, result) + "\n\n"
+                else:
+                    check_text = "🔍 검사 결과: 문제 없음\n\n"
+            else:
+                check_text = "🔍 검사할 수 있는 컬럼이 없습니다.\n\n"
+        else:
+            check_text = "🔍 .xls 파일은 색상 표시를 지원하지 않습니다.\n\n"
+
+        # 통계
+        stats_path = os.path.join(output_dir, stem + "_통계.txt")
+        with stage('통계 분석'), open(stats_path, 'w', encoding='utf-8') as f:
+            if '수용가번호' in raw_df.columns:
+                f.write(check_text)
+            stats = compute_customer_stats([read_stats_excel(file_path, wb)])
+            f.write(format_stats_text(stats))
+        summary['outputs'].append(stats_path)
+        crosstab_path = os.path.join(output_dir, stem + "_교차표.xlsx")
+        with stage('교차표 저장'):
+            if write_crosstabs_excel(stats, crosstab_path):
+                summary['outputs'].append(crosstab_path)
+
+        if account:
+            with stage('이력 기록'):
+                record_imported_keys(account, import_df[prepared[1] == ''], source)
+
+    except Exception as e:
+        summary['error'] = str(e)
+
+    summary['seconds'] = round(time.perf_counter() - started, 2)
+    perf_local.stages = None
+    write_perf_log(make_perf_record(f"일괄 처리: {os.path.basename(file_path)}", 'process_workbook',
+                                    'error' if summary['error'] else 'done', summary['seconds'], summary['stages']))
+    return summary
+
+def run_batch(files, selected_num_len, output_dir, workers=None, insert_prefix='', batch_rows=0, account=None, mark_mode=None,
+              output_format='values'):
+    """프로세스 풀로 여러 엑셀 파일을 병렬 처리 → 요약 목록 (완료 순)"""
+    os.makedirs(output_dir, exist_ok=True)
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_workbook, file_path, selected_num_len, output_dir, insert_prefix, batch_rows, account, mark_mode,
+                            output_format)
+            for file_path in files
+        ]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            print_workbook_summary(summary)
+    return summaries
+
+def print_batch_summary(summaries, elapsed):
+    total_rows = sum(s['rows'] for s in summaries)
+    total_success = sum(s['success'] for s in summaries)
+    total_fail = sum(s['fail'] for s in summaries)
+    total_problem_rows = sum(s['problem_rows'] or 0 for s in summaries)
+    error_files = [s for s in summaries if s['error']]
+
+    print()
+    print("=" * 45)
+    print(f"📊 일괄 처리 결과: 파일 {len(summaries)}개 ({elapsed:.1f}초)")
+    print(f"  - 총 {total_rows}행 중 {total_success}개 성공, {total_fail}개 실패")
+    print(f"  - 종합검사 문제 행: {total_problem_rows}개")
+    stage_seconds = {}
+    for s in summaries:
+        for item in s.get('stages', []):
+            stage_seconds[item['stage']] = stage_seconds.get(item['stage'], 0.0) + item['seconds']
+    if stage_seconds:
+        print("  - 단계별 합계: " + ", ".join(f"{name} {seconds:.1f}초" for name, seconds in stage_seconds.items()))
+    if error_files:
+        print(f"  - 오류 파일 {len(error_files)}개:")
+        for s in error_files:
+            print(f"      {s['file']}: {s['error']}")
+    print("=" * 45)
+
+def resolve_num_len(args):
+    """--num-len 또는 --account로 검증 계획 결정 (실패 시 메시지 출력 후 None)
+
+    --num-len이면 길이만, --account면 계정의 고객번호구조까지 검사한다.
+    """
+    if args.num_len is not None:
+        return get_rule_plan(args.num_len)
+    if not args.account:
+        print("⚠️ --account 또는 --num-len 을 지정하세요.", file=sys.stderr)
+        return None
+    accounts_df = filter_accounts(load_accounts())
+    try:
+        plan = find_account_rule_plan(accounts_df, args.account)
+    except ValueError as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return None
+    if plan['note']:
+        print(f"⚠️ {plan['note']}", file=sys.stderr)
+    return plan
+
+def check_copy_target(args):
+    """COPY 형식/DB 적재 시 --insert-prefix에서 대상 테이블을 찾을 수 있는지 확인"""
+    if args.format == 'values' and not getattr(args, 'load', None):
+        return True
+    try:
+        parse_insert_target(args.insert_prefix)
+    except ValueError as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return False
+    return True
+
+def run_batch_command(args):
+    files = collect_workbooks(args.paths)
+    if not files:
+        print("⚠️ 처리할 엑셀 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    selected_num_len = resolve_num_len(args)
+    if selected_num_len is None or not check_copy_target(args):
+        return 2
+
+    started = time.perf_counter()
+    summaries = run_batch(files, selected_num_len, args.output, workers=args.workers,
+                          insert_prefix=args.insert_prefix, batch_rows=args.batch_rows,
+                          account=None if args.no_index else args.account, mark_mode=args.mark_mode,
+                          output_format=args.format)
+    print_batch_summary(summaries, time.perf_counter() - started)
+    return 1 if any(s['error'] for s in summaries) else 0
+
+def run_sql_command(args):
+    """큰 엑셀 파일 하나를 청크 단위로 읽으며 .sql 파일 생성"""
+    selected_num_len = resolve_num_len(args)
+    if selected_num_len is None or not check_copy_target(args):
+        return 2
+    sql_path = args.output or os.path.splitext(args.file)[0] + ".sql"
+
+    def progress(status, detail='', value=None, maximum=None):
+        print(f"\r{status} {detail}", end='', file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    success_count, fail_count, _, admin_list_path = write_sql_file_chunked(
+        args.file, selected_num_len, sql_path, chunk_rows=args.chunk_rows, reader=args.reader,
+        insert_prefix=args.insert_prefix, batch_rows=args.batch_rows, progress=progress,
+        account=None if args.no_index else args.account, output_format=args.format, load_dsn=args.load)
+    print(file=sys.stderr)
+    print(f"총 {success_count + fail_count}개 중 {success_count}개 성공, {fail_count}개 실패 "
+          f"({resolve_reader(args.file, args.reader)}, {time.perf_counter() - started:.1f}초)")
+    print(f"💾 SQL 파일: {sql_path}")
+    if args.format != 'values':
+        print(f"💾 COPY 데이터 파일: {os.path.splitext(sql_path)[0]}.{args.format}")
+    if args.load:
+        print(f"🗄️ DB 적재 완료: {success_count}행")
+    print(f"✅ 임포트전 조회할 수용가목록: {admin_list_path}")
+    return 0
+
+def run_stats_command(args):
+    """큰 엑셀 파일 하나를 청크 단위로 읽으며 통계 분석 (교차표는 엑셀로 저장 가능)"""
+    started = time.perf_counter()
+    stats = analyze_stats_file(args.file, chunk_rows=args.chunk_rows, reader=args.reader)
+    print(format_stats_text(stats))
+    print(f"\n총 {stats['rows']}행 ({resolve_reader(args.file, args.reader)}, {time.perf_counter() - started:.1f}초)")
+    if args.crosstab_xlsx:
+        if write_crosstabs_excel(stats, args.crosstab_xlsx):
+            print(f"💾 교차표 파일: {args.crosstab_xlsx}")
+        else:
+            print("⚠️ 교차표를 만들 컬럼이 없습니다.", file=sys.stderr)
+    return 0
+
+def run_read_bench_command(args):
+    """읽기 백엔드별 읽기 시간 비교 (결과가 pandas 기준과 같은지도 확인)"""
+    files = collect_workbooks(args.paths)
+    if not files:
+        print("⚠️ 처리할 엑셀 파일이 없습니다.", file=sys.stderr)
+        return 1
+    readers = args.readers.split(',') if args.readers else [name for name in EXCEL_READERS if reader_available(name)]
+    usecols = IMPORT_USECOLS if args.import_columns else None
+
+    for file_path in files:
+        print(f"📄 {file_path}")
+        baseline = None
+        for reader in readers:
+            try:
+                reader = resolve_reader(file_path, reader)
+                best = None
+                for _ in range(args.repeat):
+                    df, read_info = read_sheet(file_path, usecols, reader)
+                    best = read_info['seconds'] if best is None else min(best, read_info['seconds'])
+            except Exception as e:
+                print(f"  {reader:<10} ❌ {e}")
+                continue
+            if baseline is None:
+                baseline = df
+            same = "" if df.equals(baseline) else "  ⚠️ 결과 다름"
+            print(f"  {reader:<10} {best:8.3f}초  {len(df)}행 x {len(df.columns)}열{same}")
+    return 0
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="임포트체커 (인자 없이 실행하면 GUI)")
+    parser.add_argument('--profile', metavar='FILE', help="명령 실행을 cProfile로 측정해 FILE에 저장 (pstats로 확인, batch는 작업 프로세스 제외)")
+    parser.add_argument('--startup-time', action='store_true', help="GUI를 띄워 시작 시간(첫 화면/모듈 읽기/계정 목록)만 재고 종료")
+    parser.add_argument('--compact', action='store_true', help="반복 값 컬럼은 범주형, 식별번호는 Arrow 문자열로 읽어 메모리 절약 (IMPORTCHECKER_COMPACT=1과 같음)")
+    subparsers = parser.add_subparsers(dest='command')
+
+    batch_parser = subparsers.add_parser('batch', help="여러 엑셀 파일 일괄 처리 (SQL/종합검사/통계)")
+    batch_parser.add_argument('paths', nargs='+', help="엑셀 파일, 디렉터리 또는 glob 패턴")
+    batch_parser.add_argument('--account', help="계정명 (구글 시트에서 수용가번호길이 조회)")
+    batch_parser.add_argument('--num-len', type=int, help="수용가번호길이 직접 지정 (지정 시 구글 시트 조회 생략)")
+    batch_parser.add_argument('--output', '-o', default='output', help="결과 저장 디렉터리 (기본: output)")
+    batch_parser.add_argument('--workers', '-j', type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    batch_parser.add_argument('--insert-prefix', default='', help="INSERT 문 머리 (비우면 VALUES만)")
+    batch_parser.add_argument('--batch-rows', type=int, default=0, help="INSERT 문당 행 수")
+    batch_parser.add_argument('--no-index', action='store_true', help="임포트 이력 확인/기록 안 함 (--account 지정 시 기본 사용)")
+    batch_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='values', help="SQL 출력 형식 (csv/tsv는 COPY 문 + 데이터 파일, --insert-prefix 필요)")
+    batch_parser.add_argument('--mark-mode', choices=MARK_MODES, default=None, help="종합검사 색상 표시 방식 (cell: 셀 서식, conditional: 조건부 서식)")
+    batch_parser.set_defaults(func=run_batch_command)
+
+    sql_parser = subparsers.add_parser('sql', help="큰 엑셀 파일 하나를 청크 단위로 읽어 SQL 파일 생성")
+    sql_parser.add_argument('file', help="엑셀 파일")
+    sql_parser.add_argument('--account', help="계정명 (구글 시트에서 수용가번호길이 조회)")
+    sql_parser.add_argument('--num-len', type=int, help="수용가번호길이 직접 지정 (지정 시 구글 시트 조회 생략)")
+    sql_parser.add_argument('--output', '-o', help="SQL 파일 경로 (기본: 엑셀 파일명.sql)")
+    sql_parser.add_argument('--chunk-rows', type=int, default=READ_CHUNK_ROWS, help=f"한 번에 읽는 행 수 (기본: {READ_CHUNK_ROWS})")
+    sql_parser.add_argument('--reader', default=None, choices=['auto'] + list(EXCEL_READERS), help="엑셀 읽기 백엔드 (기본: auto)")
+    sql_parser.add_argument('--insert-prefix', default='', help="INSERT 문 머리 (비우면 VALUES만)")
+    sql_parser.add_argument('--batch-rows', type=int, default=0, help="INSERT 문당 행 수")
+    sql_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='values', help="SQL 출력 형식 (csv/tsv는 COPY 문 + 데이터 파일, --insert-prefix 필요)")
+    sql_parser.add_argument('--load', metavar='DSN', help="성공 행을 DB에 바로 적재 (PostgreSQL DSN 또는 sqlite:///경로, --insert-prefix 필요)")
+    sql_parser.add_argument('--no-index', action='store_true', help="임포트 이력 확인/기록 안 함 (--account 지정 시 기본 사용)")
+    sql_parser.set_defaults(func=run_sql_command)
+
+    stats_parser = subparsers.add_parser('stats', help="큰 엑셀 파일 하나를 청크 단위로 읽어 통계/교차표 분석")
+    stats_parser.add_argument('file', help="엑셀 파일")
+    stats_parser.add_argument('--chunk-rows', type=int, default=READ_CHUNK_ROWS, help=f"한 번에 읽는 행 수 (기본: {READ_CHUNK_ROWS})")
+    stats_parser.add_argument('--reader', default=None, choices=['auto'] + list(EXCEL_READERS), help="엑셀 읽기 백엔드 (기본: auto)")
+    stats_parser.add_argument('--crosstab-xlsx', metavar='PATH', help=f"교차표 전체를 저장할 엑셀 경로 ({', '.join(a + '×' + b for a, b in STATS_CROSSTABS)})")
+    stats_parser.set_defaults(func=run_stats_command)
+
+    watch_parser = subparsers.add_parser('watch', help="감시 폴더에 들어오는 엑셀 파일 자동 처리 (SQL/종합검사/통계)")
+    watch_parser.add_argument('folder', help="감시할 폴더")
+    watch_parser.add_argument('--account', help="계정명 (구글 시트에서 수용가번호길이 조회)")
+    watch_parser.add_argument('--num-len', type=int, help="수용가번호길이 직접 지정 (지정 시 구글 시트 조회 생략)")
+    watch_parser.add_argument('--output', '-o', default='output', help="결과 저장 디렉터리, 작업 기록도 여기에 둠 (기본: output)")
+    watch_parser.add_argument('--workers', '-j', type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    watch_parser.add_argument('--insert-prefix', default='', help="INSERT 문 머리 (비우면 VALUES만)")
+    watch_parser.add_argument('--batch-rows', type=int, default=0, help="INSERT 문당 행 수")
+    watch_parser.add_argument('--no-index', action='store_true', help="임포트 이력 확인/기록 안 함 (--account 지정 시 기본 사용)")
+    watch_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='values', help="SQL 출력 형식 (csv/tsv는 COPY 문 + 데이터 파일, --insert-prefix 필요)")
+    watch_parser.add_argument('--mark-mode', choices=MARK_MODES, default=None, help="종합검사 색상 표시 방식 (cell: 셀 서식, conditional: 조건부 서식)")
+    watch_parser.add_argument('--poll', type=float, default=WATCH_POLL_SECONDS, help=f"폴더를 다시 훑는 간격(초) (기본: {WATCH_POLL_SECONDS})")
+    watch_parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS, help=f"파일이 이 시간(초) 동안 바뀌지 않아야 처리 (기본: {WATCH_SETTLE_SECONDS})")
+    watch_parser.add_argument('--once', action='store_true', help="지금 있는 파일만 처리하고 종료")
+    watch_parser.set_defaults(func=run_watch_command)
+
+    read_bench_parser = subparsers.add_parser('read-bench', help="엑셀 읽기 백엔드별 읽기 시간 비교")
+    read_bench_parser.add_argument('paths', nargs='+', help="엑셀 파일, 디렉터리 또는 glob 패턴")
+    read_bench_parser.add_argument('--readers', help=f"쉼표로 구분한 백엔드 목록 (기본: 사용 가능한 전체, {'/'.join(EXCEL_READERS)})")
+    read_bench_parser.add_argument('--import-columns', action='store_true', help="SQL 생성용 20개 컬럼만 읽기")
+    read_bench_parser.add_argument('--repeat', type=int, default=1, help="반복 횟수 (최소 시간 표시)")
+    read_bench_parser.set_defaults(func=run_read_bench_command)
+
+    bench_parser = subparsers.add_parser('bench', help="가상 엑셀로 SQL/통계/종합검사 성능 측정 (JSON 기록 및 비교)")
+    bench_parser.add_argument('--rows', default='1k,10k', help="행 수 목록 (예: 1k,10k,100k,1M)")
+    bench_parser.add_argument('--ops', default=','.join(BENCH_OPERATIONS), help=f"측정할 작업 ({','.join(BENCH_OPERATIONS)})")
+    bench_parser.add_argument('--dup-rate', type=float, default=0.01, help="키 컬럼별 중복 비율 (기본: 0.01)")
+    bench_parser.add_argument('--empty-rate', type=float, default=0.01, help="키 컬럼별 빈값 비율 (기본: 0.01)")
+    bench_parser.add_argument('--bad-len-rate', type=float, default=0.01, help="키 컬럼별 자릿수 오류 비율 (기본: 0.01)")
+    bench_parser.add_argument('--status-rate', type=float, default=0.01, help="문제 수용가상태 비율 (기본: 0.01)")
+    bench_parser.add_argument('--num-len', type=int, default=13, help="수용가번호길이 (기본: 13)")
+    bench_parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    bench_parser.add_argument('--repeat', type=int, default=1, help="작업별 반복 횟수 (최소 시간 기록)")
+    bench_parser.add_argument('--dir', default='bench', help="가상 엑셀과 결과 파일 디렉터리 (기본: bench)")
+    bench_parser.add_argument('--output', '-o', help="결과 JSON 경로 (기본: <dir>/bench_result.json)")
+    bench_parser.add_argument('--compare', metavar='BASELINE', help="비교할 이전 결과 JSON")
+    bench_parser.add_argument('--threshold', type=float, default=10.0, help="비교 시 성능 저하로 볼 시간 증가율(%%) (기본: 10)")
+    bench_parser.set_defaults(func=run_bench_command)
+
+    return parser
+
+# =============================================
+# 📌 감시 폴더 (넣어 둔 엑셀 파일 자동 처리)
+# =============================================
+
+WATCH_POLL_SECONDS = 2          # 폴더를 다시 훑는 간격 (초)
+WATCH_SETTLE_SECONDS = 3        # 크기/수정시각이 이 시간 동안 그대로여야 복사가 끝난 것으로 봄
+WATCH_MAX_ATTEMPTS = 3          # 처리 도중 중단(프로세스 종료 등)된 파일을 다시 시도하는 최대 횟수
+WATCH_JOURNAL_NAME = ".watch_journal.sqlite3"   # 출력 디렉터리에 두는 작업 기록
+
+def open_watch_journal(output_dir):
+    """작업 기록 DB 연결 (없으면 생성)
+
+    키는 '파일명:내용 해시'라서 같은 파일은 다시 처리하지 않고, 내용이 바뀌면 새 작업이 된다.
+    상태는 running → done/error. 처리 중 꺼져서 running으로 남은 작업은 다음 실행 때 다시 처리한다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(output_dir, WATCH_JOURNAL_NAME), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        " key TEXT PRIMARY KEY, file TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL,"
+        " started_at REAL, finished_at REAL, seconds REAL, error TEXT, outputs TEXT)"
+    )
+    return conn
+
+def file_content_key(file_path):
+    """'파일명:sha1' 작업 키 (파일을 열 수 없으면 OSError)"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f"{os.path.basename(file_path)}:{digest.hexdigest()}"
+
+def journal_status(conn, key):
+    """작업 상태와 시도 횟수 → (status, attempts), 기록이 없으면 (None, 0)"""
+    row = conn.execute("SELECT status, attempts FROM jobs WHERE key = ?", (key,)).fetchone()
+    return row if row else (None, 0)
+
+def journal_start(conn, key, file_path):
+    with conn:
+        conn.execute(
+            "INSERT INTO jobs (key, file, status, attempts, started_at) VALUES (?, ?, 'running', 1, ?)"
+            " ON CONFLICT(key) DO UPDATE SET file = excluded.file, status = 'running', attempts = attempts + 1,"
+            " started_at = excluded.started_at",
+            (key, file_path, time.time()))
+
+def journal_release(conn, key):
+    """풀이 깨질 때 함께 중단된 작업의 시도 횟수를 되돌림 (어느 파일 때문인지 모르므로)"""
+    with conn:
+        conn.execute("UPDATE jobs SET attempts = attempts - 1 WHERE key = ? AND attempts > 0", (key,))
+
+def journal_finish(conn, key, summary):
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, seconds = ?, error = ?, outputs = ? WHERE key = ?",
+            ('error' if summary['error'] else 'done', time.time(), summary.get('seconds'), summary['error'],
+             json.dumps(summary['outputs'], ensure_ascii=False), key))
+
+def settled_workbooks(watch_dir, seen, now, settle_seconds=WATCH_SETTLE_SECONDS):
+    """복사가 끝난 것으로 보이는 엑셀 파일 → (처리할 파일 목록, 아직 기다리는 파일 수)
+
+    seen({경로: (크기, 수정시각, 처음 본 시각, 작업 키)})은 호출 사이에 유지하는 상태.
+    크기나 수정시각이 바뀌면 처음 본 시각을 다시 재고 작업 키(file_content_key, 아직 없으면 None)를 버린다.
+    """
+    files = collect_workbooks([watch_dir])
+    ready = []
+    for file_path in files:
+        try:
+            info = os.stat(file_path)
+        except OSError:
+            continue
+        signature = (info.st_size, info.st_mtime_ns)
+        previous = seen.get(file_path)
+        if previous is None or previous[:2] != signature:
+            seen[file_path] = signature + (now, None)
+        elif now - previous[2] >= settle_seconds:
+            ready.append(file_path)
+    for file_path in set(seen) - set(files):
+        del seen[file_path]
+    return ready, len(files) - len(ready)
+
+def print_workbook_summary(summary):
+    """파일 하나 처리 결과 한 줄 출력 (일괄 처리/감시 폴더 공용)"""
+    status = f"❌ {summary['error']}" if summary['error'] else "✅"
+    changes = f", 변경 {len(summary['row_changes']['changed'])}행" if summary['row_changes'] else ""
+    print(f"{status} {os.path.basename(summary['file'])}: "
+          f"{summary['rows']}행, 성공 {summary['success']}, 실패 {summary['fail']}{changes} ({summary['seconds']}초)",
+          flush=True)
+
+def run_watch(watch_dir, selected_num_len, output_dir, workers=None, insert_prefix='', batch_rows=0, account=None,
+              mark_mode=None, output_format='values', poll_seconds=WATCH_POLL_SECONDS, settle_seconds=WATCH_SETTLE_SECONDS,
+              once=False, stop_event=None):
+    """watch_dir에 들어오는 엑셀 파일을 프로세스 풀로 처리해 output_dir에 기록 (process_workbook과 같은 출력)
+
+    풀에 넣어 두는 작업은 workers개까지이고 나머지는 다음 훑기에서 넣는다. 작업 기록에서 끝난 파일은 건너뛴다.
+    파일 내용 해시는 크기/수정시각이 그대로면 다시 계산하지 않는다.
+    작업 프로세스가 죽어 풀이 깨지면 함께 돌던 파일은 시도 횟수를 되돌리고 하나씩 따로 다시 처리해서,
+    WATCH_MAX_ATTEMPTS는 실제로 프로세스를 죽인 파일에만 쌓인다.
+    once면 지금 있는 파일을 모두 처리한 뒤 끝내고, 아니면 stop_event가 set되거나 Ctrl+C로 멈출 때까지 돈다.
+    반환: 이번 실행에서 처리한 요약 목록
+    """
+    workers = workers or os.cpu_count() or 1
+    conn = open_watch_journal(output_dir)
+    seen = {}
+    running = {}        # future → (키, 경로)
+    isolated = set()    # 풀이 깨질 때 함께 돌던 키 (하나씩 따로 처리)
+    summaries = []
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while not (stop_event and stop_event.is_set()):
+            # 끝난 작업 기록
+            done = wait(running, timeout=poll_seconds, return_when=FIRST_COMPLETED)[0] if running else set()
+            crashed = []
+            for future in done:
+                key, file_path = running.pop(future)
+                try:
+                    summary = future.result()
+                except BrokenProcessPool:
+                    # 작업 프로세스가 죽었으면 running으로 남겨 두고 다시 시도 (WATCH_MAX_ATTEMPTS까지)
+                    crashed.append(key)
+                    continue
+                isolated.discard(key)
+                journal_finish(conn, key, summary)
+                summaries.append(summary)
+                print_workbook_summary(summary)
+            if crashed:
+                crashed += [key for key, _ in running.values()]
+                if len(crashed) > 1:
+                    for key in crashed:
+                        journal_release(conn, key)
+                    isolated.update(crashed)
+                executor.shutdown(wait=False, cancel_futures=True)
+                running.clear()
+                executor = ProcessPoolExecutor(max_workers=workers)
+
+            # 새 파일 넣기 (풀에 workers개가 찰 때까지)
+            in_flight = {file_path for _, file_path in running.values()}
+            ready, waiting = settled_workbooks(watch_dir, seen, time.monotonic(), settle_seconds)
+            isolated &= {entry[3] for entry in seen.values()} | {key for key, _ in running.values()}
+            for file_path in ready:
+                if file_path in in_flight:
+                    continue
+                key = seen[file_path][3]
+                if key is None:
+                    try:
+                        key = file_content_key(file_path)
+                    except OSError:
+                        waiting += 1    # 다른 프로그램이 열고 있으면 다음에
+                        continue
+                    seen[file_path] = seen[file_path][:3] + (key,)
+                status, attempts = journal_status(conn, key)
+                if status in ('done', 'error'):
+                    isolated.discard(key)
+                    continue
+                if status == 'running' and attempts >= WATCH_MAX_ATTEMPTS:
+                    message = f"처리 도중 {attempts}번 중단되어 건너뜀"
+                    isolated.discard(key)
+                    journal_finish(conn, key, {'error': message, 'outputs': []})
+                    print(f"❌ {os.path.basename(file_path)}: {message}", flush=True)
+                    continue
+                # 따로 처리할 파일이 남아 있으면 그 파일만 풀이 비었을 때 하나씩
+                if len(running) >= workers or (isolated and (key not in isolated or running)):
+                    waiting += 1
+                    continue
+                journal_start(conn, key, file_path)
+                future = executor.submit(process_workbook, file_path, selected_num_len, output_dir, insert_prefix, batch_rows,
+                                         account, mark_mode, output_format)
+                running[future] = (key, file_path)
 
-window = tk.Tk()
-window.title("임포트체커 + 통계 + 중복표시 (v250701)")
-window.geometry("1000x600")
+            if not running:
+                if once and not waiting:
+                    break
+                time.sleep(poll_seconds)
+    finally:
+        # 멈출 때 기다리던 작업은 취소하고 (running으로 남아 다음 실행에서 처리), 처리 중이던 작업은 끝까지 기록
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future, (key, file_path) in running.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                journal_finish(conn, key, future.result())
+                summaries.append(future.result())
+        conn.close()
+    return summaries
 
-# 녹색 램프 프레임 (왼쪽 상단)
-lamp_frame = tk.Frame(window)
-lamp_frame.pack(anchor=tk.NW, padx=10, pady=(10, 0))
+def run_watch_command(args):
+    """감시 폴더 모드 (Ctrl+C로 종료)"""
+    if not os.path.isdir(args.folder):
+        print(f"⚠️ 폴더가 없습니다: {args.folder}", file=sys.stderr)
+        return 1
+    if os.path.abspath(args.folder) == os.path.abspath(args.output):
+        # 결과 파일(_검사.xlsx 등)이 다시 감시 대상이 되지 않도록
+        print("⚠️ 결과 저장 디렉터리는 감시 폴더와 달라야 합니다.", file=sys.stderr)
+        return 2
+    selected_num_len = resolve_num_len(args)
+    if selected_num_len is None or not check_copy_target(args):
+        return 2
 
-# 녹색 램프 (작은 네모박스)
-lamp_canvas = tk.Canvas(lamp_frame, width=20, height=10, bg='white', highlightthickness=1, highlightbackground='black')
-lamp_canvas.pack(side=tk.LEFT)
+    print(f"👀 감시 중: {os.path.abspath(args.folder)} → {os.path.abspath(args.output)} "
+          f"(작업 {args.workers or os.cpu_count()}개, Ctrl+C로 종료)", flush=True)
+    started = time.perf_counter()
+    try:
+        summaries = run_watch(args.folder, selected_num_len, args.output, workers=args.workers,
+                              insert_prefix=args.insert_prefix, batch_rows=args.batch_rows,
+                              account=None if args.no_index else args.account, mark_mode=args.mark_mode,
+                              output_format=args.format, poll_seconds=args.poll, settle_seconds=args.settle, once=args.once)
+    except KeyboardInterrupt:
+        print("\n감시를 멈췄습니다. 남은 파일은 다음 실행 때 이어서 처리합니다.")
+        return 0
+    print_batch_summary(summaries, time.perf_counter() - started)
+    return 1 if any(s['error'] for s in summaries) else 0
+
+# =============================================
+# 📌 벤치마크 (가상 엑셀 생성 + 작업별 시간/메모리/출력 크기)
+# =============================================
+
+BENCH_OPERATIONS = ('sql', 'stats', 'check')
+BENCH_KEY_COLUMNS = ['수용가번호', '계량기번호', '단말 주번호', '단말 부번호', 'IMEI']
+BENCH_ADDRESSES = {
+    '강남구': ['역삼동', '삼성동', '대치동'], '서초구': ['서초동', '방배동', '반포동'],
+    '송파구': ['잠실동', '가락동', '문정동'], '마포구': ['합정동', '서교동', '공덕동'],
+}
+
+def parse_row_count(text):
+    """'1k', '100k', '1M', '2500' → 행 수"""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+def make_bench_frame(rows, selected_num_len=13, dup_rate=0.01, empty_rate=0.01, bad_len_rate=0.01, status_rate=0.01, seed=0):
+    """COLUMNS 배치(+ IMEI, 수용가상태)의 가상 수용가 데이터 생성
+
+    키 컬럼(BENCH_KEY_COLUMNS)마다 dup_rate만큼 다른 행 값 복사, empty_rate만큼 빈값,
+    bad_len_rate만큼 3자리로 잘라 자릿수 오류를 만든다.
+    """
+    rng = np.random.default_rng(seed)
+    idx = np.arange(rows)
+    gu_names = list(BENCH_ADDRESSES)
+    gu = rng.integers(0, len(gu_names), rows)
+    dong = rng.integers(0, 3, rows)
+    bunji = rng.integers(1, 999, rows)
+    old_address = [f"서울시 {gu_names[g]} {BENCH_ADDRESSES[gu_names[g]][d]} {b}" for g, d, b in zip(gu, dong, bunji)]
+    new_address = [f"서울시 {gu_names[g]} 테헤란로{d + 1}길 {b}" for g, d, b in zip(gu, dong, bunji)]
+    install_days = rng.integers(0, 365, rows)
+    base_date = datetime(2024, 1, 1)
+
+    admin_base = 10 ** (selected_num_len - 1)
+    frame = {
+        '수용가명': [f"고객{i}" for i in idx],
+        '수용가번호': [str(admin_base + i % (9 * admin_base)) for i in idx],
+        '구주소': old_address,
+        '신주소': new_address,
+        '경도': np.round(126.8 + rng.random(rows) * 0.4, 6),
+        '위도': np.round(37.4 + rng.random(rows) * 0.3, 6),
+        '업종': rng.choice(['가정용', '일반용', '업무용', '대중탕용'], rows),
+        '소속': rng.choice(['본사', '동부지사', '서부지사'], rows),
+        '블록': [f"{b}블록" for b in rng.integers(1, 51, rows)],
+        '수용가 전화번호': [f"010-{a:04d}-{b:04d}" for a, b in zip(rng.integers(0, 10000, rows), rng.integers(0, 10000, rows))],
+        '수용가 대상 년도': ['2024'] * rows,
+        '검침원': [f"검침원{k:02d}" for k in rng.integers(1, 31, rows)],
+        '검침일': rng.integers(1, 29, rows),
+        '계량기번호': [f"M{i:09d}" for i in idx],
+        '구경': rng.choice([15, 20, 25, 32, 40, 50], rows),
+        '통신': rng.choice(['LTE', 'NB-IoT', 'LoRa'], rows),
+        '단말 부번호': [f"{i:07d}" for i in idx],
+        '단말 주번호': [f"T{i:08d}" for i in idx],
+        '단말 회사': rng.choice(['A사', 'B사', 'C사'], rows),
+        '단말 설치일': [base_date + timedelta(days=int(d)) for d in install_days],
+        'IMEI': [str(350000000000000 + i) for i in idx],
+        '수용가상태': np.where(rng.random(rows) < status_rate, rng.choice(STATUS_CHECKS, rows), '정상'),
+    }
+
+    for col in BENCH_KEY_COLUMNS:
+        values = np.array(frame[col], dtype=object)
+        draw = rng.random(rows)
+        duplicated = draw < dup_rate
+        values[duplicated] = values[rng.integers(0, rows, int(duplicated.sum()))]
+        values[(draw >= dup_rate) & (draw < dup_rate + empty_rate)] = ''
+        bad_len = (draw >= dup_rate + empty_rate) & (draw < dup_rate + empty_rate + bad_len_rate)
+        values[bad_len] = [value[:3] for value in values[bad_len]]
+        frame[col] = values
+
+    return pd.DataFrame(frame)
+
+def write_bench_workbook(file_path, frame):
+    """첫 열 '번호' + frame 컬럼으로 엑셀 저장 (write_only 모드로 빠르게 기록)"""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append(['번호'] + list(frame.columns))
+    for number, row in enumerate(frame.itertuples(index=False, name=None), 1):
+        ws.append((number,) + tuple(value.item() if isinstance(value, np.generic) else value for value in row))
+    wb.save(file_path)
+
+def bench_workbook(bench_dir, rows, settings):
+    """설정별 가상 엑셀 경로 (없으면 생성, 있으면 재사용)"""
+    name = (f"bench_{rows}_n{settings['num_len']}_d{settings['dup_rate']}_e{settings['empty_rate']}"
+            f"_b{settings['bad_len_rate']}_s{settings['status_rate']}_r{settings['seed']}.xlsx")
+    file_path = os.path.join(bench_dir, name)
+    if not os.path.exists(file_path):
+        print(f"📄 가상 엑셀 생성 중: {name}", flush=True)
+        frame = make_bench_frame(rows, settings['num_len'], settings['dup_rate'], settings['empty_rate'],
+                                 settings['bad_len_rate'], settings['status_rate'], settings['seed'])
+        write_bench_workbook(file_path + ".tmp.xlsx", frame)
+        os.replace(file_path + ".tmp.xlsx", file_path)
+    return file_path
+
+def bench_operation(operation, file_path, selected_num_len, output_dir):
+    """작업 하나를 GUI 없이 실행 → {'seconds', 'peak_rss_mb', 'frame_mb', 'output_bytes'}
+
+    최대 메모리를 작업별로 재기 위해 새 프로세스에서 실행한다 (run_benchmark 참고).
+    """
+    stem = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(file_path))[0]}_{operation}")
+    started = time.perf_counter()
+    if operation == 'sql':
+        df, _ = read_import_excel(file_path)
+        write_sql_file(df, selected_num_len, stem + ".sql")
+        outputs = [stem + ".sql", stem + "_수용가목록.txt"]
+    elif operation == 'stats':
+        df = read_stats_excel(file_path)
+        stats_text = format_customer_stats(df)
+        with open(stem + ".txt", 'w', encoding='utf-8') as f:
+            f.write(stats_text)
+        outputs = [stem + ".txt"]
+    else:
+        wb, df = load_check_workbook(file_path)
+        result = run_workbook_checks(df)
+        if result is not None and result['all_problem_rows']:
+            apply_check_marks(wb, df, result)
+            add_problem_sheet(wb, list(result['all_problem_rows']), labels=result['fuzzy_labels'])
+        wb.save(stem + ".xlsx")
+        outputs = [stem + ".xlsx"]
+    return {
+        'seconds': round(time.perf_counter() - started, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'frame_mb': frame_memory_mb(df),
+        'output_bytes': sum(os.path.getsize(path) for path in outputs),
+    }
+
+def run_benchmark(row_counts, operations, bench_dir, settings, repeat=1):
+    """행 수 x 작업별 측정 → 결과 목록 (시간은 반복 중 최소, 메모리는 최대)"""
+    os.makedirs(bench_dir, exist_ok=True)
+    results = []
+    for rows in row_counts:
+        file_path = bench_workbook(bench_dir, rows, settings)
+        for operation in operations:
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    runs.append(executor.submit(bench_operation, operation, file_path, settings['num_len'], bench_dir).result())
+            peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+            result = {
+                'rows': rows,
+                'operation': operation,
+                'seconds': min(run['seconds'] for run in runs),
+                'peak_rss_mb': max(peaks) if peaks else None,
+                'frame_mb': runs[-1]['frame_mb'],
+                'output_bytes': runs[-1]['output_bytes'],
+                'runs': [run['seconds'] for run in runs],
+            }
+            results.append(result)
+            print(f"  {rows:>8}행 {operation:<6} {result['seconds']:9.3f}초  "
+                  f"{result['peak_rss_mb'] or '-':>8} MB  (DataFrame {result['frame_mb']} MB)  {result['output_bytes']:>12,} B", flush=True)
+    return results
+
+def compare_benchmark(results, baseline, threshold):
+    """이전 결과와 비교 출력 → 시간이 threshold(%) 넘게 늘어난 항목 목록"""
+    previous = {(r['rows'], r['operation']): r for r in baseline.get('results', [])}
+    if baseline.get('settings') and baseline['settings'] != results['settings']:
+        print("⚠️ 기준 결과와 생성 설정이 다릅니다. 비교 값은 참고만 하세요.")
+    regressions = []
+    print()
+    print(f"📊 기준 결과 비교 ({baseline.get('created', '?')})")
+    for result in results['results']:
+        before = previous.get((result['rows'], result['operation']))
+        if before is None:
+            continue
+        change = (result['seconds'] - before['seconds']) / before['seconds'] * 100 if before['seconds'] else 0.0
+        mark = "🔴" if change > threshold else ("🟢" if change < -threshold else "  ")
+        print(f"  {mark} {result['rows']:>8}행 {result['operation']:<6} {before['seconds']:9.3f}초 → {result['seconds']:9.3f}초 "
+              f"({change:+.1f}%)  메모리 {before['peak_rss_mb']} → {result['peak_rss_mb']} MB  "
+              f"DataFrame {before.get('frame_mb', '-')} → {result['frame_mb']} MB  "
+              f"출력 {before['output_bytes']:,} → {result['output_bytes']:,} B")
+        if change > threshold:
+            regressions.append(result)
+    return regressions
+
+def run_bench_command(args):
+    row_counts = [parse_row_count(text) for text in args.rows.split(',') if text.strip()]
+    operations = [op.strip() for op in args.ops.split(',') if op.strip()]
+    unknown = [op for op in operations if op not in BENCH_OPERATIONS]
+    if unknown:
+        print(f"⚠️ 알 수 없는 작업: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    settings = {
+        'num_len': args.num_len, 'dup_rate': args.dup_rate, 'empty_rate': args.empty_rate,
+        'bad_len_rate': args.bad_len_rate, 'status_rate': args.status_rate, 'seed': args.seed,
+    }
+
+    print(f"⏱️ 벤치마크: {', '.join(map(str, row_counts))}행 x {', '.join(operations)}")
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'platform': sys.platform,
+        'compact': COMPACT_FRAMES,
+        'settings': settings,
+        'results': run_benchmark(row_counts, operations, args.dir, settings, args.repeat),
+    }
+
+    output_path = args.output or os.path.join(args.dir, "bench_result.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"💾 결과 저장: {output_path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_benchmark(results, baseline, args.threshold):
+            return 1
+    return 0
+
+# =============================================
+# 📌 GUI 구성
+# =============================================
 
 # 램프 상태 변수
 lamp_on = True
@@ -539,21 +3848,6 @@ def toggle_lamp():
     # 1초마다 반복
     window.after(1000, toggle_lamp)
 
-# 램프 시작
-toggle_lamp()
-
-site_frame = tk.Frame(window)
-site_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
-
-site_label = tk.Label(site_frame, text="계정명 선택:")
-site_label.pack(side=tk.LEFT)
-
-exclude_accounts = ['나라장터', '농촌공사', '로우리스', '']
-filtered_df = df[~df['계정명'].isin(exclude_accounts)].copy()
-filtered_df = filtered_df.sort_values('계정명').reset_index(drop=True)
-site_combobox = ttk.Combobox(site_frame, values=list(filtered_df['계정명']), state="readonly")
-site_combobox.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
-
 def on_site_select(event):
     idx = site_combobox.current()
     if idx >= 0:
@@ -561,31 +3855,342 @@ def on_site_select(event):
         service_code = filtered_df.iloc[idx]['서비스코드']
         num_len = filtered_df.iloc[idx]['수용가번호길이']
         struct = filtered_df.iloc[idx]['고객번호구조']
-        messagebox.showinfo("선택한 계정", f"계정명: {account_name}\n서비스코드: {service_code}\n수용가번호길이: {num_len}\n고객번호구조: {struct}")
-site_combobox.bind('<<ComboboxSelected>>', on_site_select)
+        # 검증 계획은 여기서 미리 컴파일해 두고 SQL 변환/종합검사에서 캐시로 재사용
+        try:
+            rules_text = describe_rule_plan(selected_rule_plan())
+        except ValueError:
+            rules_text = "⚠️ 수용가번호길이 값이 올바르지 않습니다."
+        messagebox.showinfo("선택한 계정", f"계정명: {account_name}\n서비스코드: {service_code}\n수용가번호길이: {num_len}\n고객번호구조: {struct}\n\n검증 규칙: {rules_text}")
+
+# 계정 정보 백그라운드 새로고침 결과 전달용
+account_queue = queue.Queue()
+account_refreshing = False
+
+def start_account_refresh(force=False):
+    """백그라운드 스레드에서 계정 캐시 새로고침 (결과는 account_queue로 전달)"""
+    global account_refreshing
+    if account_refreshing:
+        return
+    account_refreshing = True
+
+    def worker():
+        try:
+            load_heavy_modules()
+            cache, changed = refresh_account_cache(force=force)
+            account_queue.put(('ok', cache, changed))
+        except Exception as e:
+            account_queue.put(('error', str(e), False))
+
+    account_status_label.config(text="계정 정보 새로고침 중...")
+    threading.Thread(target=worker, daemon=True).start()
+    window.after(200, poll_account_refresh)
+
+def poll_account_refresh():
+    global account_refreshing
+    try:
+        status, payload, changed = account_queue.get_nowait()
+    except queue.Empty:
+        window.after(200, poll_account_refresh)
+        return
+    account_refreshing = False
+    if status == 'ok':
+        if changed or filtered_df is None or filtered_df.empty:
+            set_accounts(account_cache_to_df(payload))
+        show_account_status(payload)
+    else:
+        account_status_label.config(text=f"⚠️ 계정 정보 새로고침 실패: {payload}")
+
+def set_accounts(df):
+    """계정 목록 교체 (선택되어 있던 계정명은 유지)"""
+    global filtered_df
+    selected = site_combobox.get()
+    filtered_df = filter_accounts(df)
+    names = list(filtered_df['계정명'])
+    site_combobox['values'] = names
+    if selected in names:
+        site_combobox.current(names.index(selected))
+    else:
+        site_combobox.set('')
+
+def show_account_status(cache):
+    fetched = datetime.fromtimestamp(cache['fetched_at']).strftime('%Y-%m-%d %H:%M')
+    account_status_label.config(text=f"계정 정보 {fetched} 기준")
+
+# 시작 시간 측정 (STARTUP_STARTED 기준 초). 창이 처음 그려질 때까지를 STARTUP_TARGET_SECONDS 안으로
+STARTUP_TARGET_SECONDS = 0.3
+startup_times = {}
+startup_queue = queue.Queue()
+startup_exit = False        # --startup-time: 시작 시간만 재고 종료
+
+def on_window_expose(event):
+    """창이 처음 그려지기 시작하면 (한 번만) 나머지 그리기가 끝난 뒤 on_first_paint 실행"""
+    if 'exposed' not in startup_times:
+        startup_times['exposed'] = time.perf_counter() - STARTUP_STARTED
+        window.after_idle(on_first_paint)
+
+def on_first_paint():
+    startup_times['first_paint'] = time.perf_counter() - STARTUP_STARTED
+    start_startup_load()
+
+def start_startup_load():
+    """백그라운드 스레드에서 무거운 모듈과 계정 캐시를 읽음 (결과는 startup_queue로 전달)"""
+    def worker():
+        try:
+            import_seconds = load_heavy_modules()
+            cache = load_account_cache()
+            df = account_cache_to_df(cache) if cache else pd.DataFrame(columns=ACCOUNT_FIELDS)
+            startup_queue.put(('ok', (cache, df, import_seconds)))
+        except Exception as e:
+            startup_queue.put(('error', str(e)))
+
+    threading.Thread(target=worker, daemon=True).start()
+    window.after(50, poll_startup_load)
+
+def poll_startup_load():
+    """계정 목록 채우기 (캐시가 오래되었거나 없으면 백그라운드에서 새로고침)"""
+    try:
+        status, payload = startup_queue.get_nowait()
+    except queue.Empty:
+        window.after(50, poll_startup_load)
+        return
+    if status == 'error':
+        site_combobox.set('')
+        account_status_label.config(text=f"⚠️ 시작 준비 실패: {payload}")
+        return
+    cache, df, import_seconds = payload
+    set_accounts(df)
+    if cache:
+        show_account_status(cache)
+    else:
+        account_status_label.config(text="")
+    startup_times['accounts'] = time.perf_counter() - STARTUP_STARTED
+    report_startup(import_seconds)
+    if startup_exit:
+        window.destroy()
+        return
+    if not is_account_cache_fresh(cache):
+        start_account_refresh()
+
+def report_startup(import_seconds):
+    """시작 시간을 성능 로그와 결과창에 기록"""
+    first_paint = startup_times['first_paint']
+    stages = [{'stage': name, 'seconds': round(seconds, 3), 'rss_mb': None, 'rss_delta_mb': None} for name, seconds in (
+        ('첫 화면', first_paint), ('모듈 읽기', import_seconds), ('계정 목록', startup_times['accounts']))]
+    write_perf_log(make_perf_record("프로그램 시작", 'startup', 'done', startup_times['accounts'], stages))
+
+    mark = "" if first_paint <= STARTUP_TARGET_SECONDS else f" ⚠️ 목표 {STARTUP_TARGET_SECONDS * 1000:.0f}ms 초과"
+    line = (f"⏱️ 시작: 첫 화면 {first_paint * 1000:.0f}ms{mark}, 모듈 읽기 {import_seconds * 1000:.0f}ms, "
+            f"계정 목록 {startup_times['accounts'] * 1000:.0f}ms")
+    store_append(result_store, line + "\n", 'perf')
+    render_result()
+    if startup_exit:
+        print(line)
+
+def run_gui():
+    global window, lamp_canvas, filtered_df, site_combobox, account_status_label
+    global sql_file_var, insert_entry, batch_spinbox, result_text, index_var, conditional_mark_var, output_format_var
+    global profile_next_var, result_store, y_scrollbar, result_position_label, result_search_entry, error_number_entry
+    global job_status_label, job_detail_label, job_progress_bar, job_queue_label
+
+    # 창을 먼저 띄우고, pandas 등 무거운 모듈과 계정 목록은 처음 그려진 뒤 백그라운드에서 읽음
+    window = tk.Tk()
+    window.title("임포트체커 + 통계 + 중복표시 (v250701)")
+    window.geometry("1000x600")
+
+    # 녹색 램프 프레임 (왼쪽 상단)
+    lamp_frame = tk.Frame(window)
+    lamp_frame.pack(anchor=tk.NW, padx=10, pady=(10, 0))
+
+    # 녹색 램프 (작은 네모박스)
+    lamp_canvas = tk.Canvas(lamp_frame, width=20, height=10, bg='white', highlightthickness=1, highlightbackground='black')
+    lamp_canvas.pack(side=tk.LEFT)
+
+    # 램프 시작
+    toggle_lamp()
+
+    site_frame = tk.Frame(window)
+    site_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+    site_label = tk.Label(site_frame, text="계정명 선택:")
+    site_label.pack(side=tk.LEFT)
+
+    filtered_df = None
+    site_combobox = ttk.Combobox(site_frame, values=[], state="readonly")
+    site_combobox.set("계정 정보 불러오는 중...")
+    site_combobox.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+    site_combobox.bind('<<ComboboxSelected>>', on_site_select)
+
+    btn_refresh = tk.Button(site_frame, text="🔄 새로고침", command=lambda: start_account_refresh(force=True))
+    btn_refresh.pack(side=tk.LEFT, padx=(5, 0))
+
+    account_status_label = tk.Label(site_frame, text="")
+    account_status_label.pack(side=tk.LEFT, padx=(5, 0))
+
+    # SQL 파일 저장 옵션
+    sql_option_frame = tk.Frame(window)
+    sql_option_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+    sql_file_var = tk.BooleanVar(value=False)
+    sql_file_check = tk.Checkbutton(sql_option_frame, text="SQL 파일로 저장", variable=sql_file_var)
+    sql_file_check.pack(side=tk.LEFT)
+
+    insert_label = tk.Label(sql_option_frame, text="INSERT 문 머리 (비우면 VALUES만):")
+    insert_label.pack(side=tk.LEFT, padx=(10, 0))
+    insert_entry = tk.Entry(sql_option_frame)
+    insert_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+
+    batch_label = tk.Label(sql_option_frame, text="문장당 행 수:")
+    batch_label.pack(side=tk.LEFT, padx=(10, 0))
+    batch_spinbox = tk.Spinbox(sql_option_frame, from_=0, to=100000, increment=500, width=8)
+    batch_spinbox.delete(0, tk.END)
+    batch_spinbox.insert(0, "1000")
+    batch_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+
+    # 출력 형식: values(VALUES 목록/INSERT 문), csv/tsv(COPY 문 + 데이터 파일, INSERT 문 머리의 테이블 사용)
+    format_label = tk.Label(sql_option_frame, text="형식:")
+    format_label.pack(side=tk.LEFT, padx=(10, 0))
+    output_format_var = tk.StringVar(value='values')
+    format_combobox = ttk.Combobox(sql_option_frame, textvariable=output_format_var, values=OUTPUT_FORMATS, state="readonly", width=7)
+    format_combobox.pack(side=tk.LEFT, padx=(5, 0))
+
+    index_var = tk.BooleanVar(value=True)
+    index_check = tk.Checkbutton(sql_option_frame, text="임포트 이력 확인/기록", variable=index_var)
+    index_check.pack(side=tk.LEFT, padx=(10, 0))
+
+    btn_sql = tk.Button(window, text="엑셀 파일 선택 및 SQL 변환", command=generate_sql_from_excel, bg="lightblue")
+    btn_sql.pack(pady=(10, 5))
+
+    btn_analyze = tk.Button(window, text="엑셀 파일 선택 및 수용가 통계 분석", command=analyze_excel_customer_stats, bg="lightgreen")
+    btn_analyze.pack(pady=(0, 5))
+
+    check_frame = tk.Frame(window)
+    check_frame.pack(pady=(0, 10))
+
+    btn_dup = tk.Button(check_frame, text="🔍 종합검사 (적색/노란색 음영 표시)", command=mark_duplicates_in_place, bg="salmon")
+    btn_dup.pack(side=tk.LEFT)
+
+    # 조건부 서식: 셀 서식을 바꾸지 않고 규칙으로 표시 (큰 파일에서 저장이 빠름)
+    conditional_mark_var = tk.BooleanVar(value=MARK_MODE == 'conditional')
+    conditional_mark_check = tk.Checkbutton(check_frame, text="조건부 서식으로 표시", variable=conditional_mark_var)
+    conditional_mark_check.pack(side=tk.LEFT, padx=(10, 0))
+
+    # 작업 진행상태 (작업 중에도 다른 파일을 대기열에 추가 가능)
+    job_frame = tk.Frame(window)
+    job_frame.pack(fill=tk.X, padx=10)
+
+    job_progress_bar = ttk.Progressbar(job_frame, length=300, mode='determinate')
+    job_progress_bar.pack(side=tk.LEFT)
+
+    job_status_label = tk.Label(job_frame, text="")
+    job_status_label.pack(side=tk.LEFT, padx=(10, 0))
+
+    job_detail_label = tk.Label(job_frame, text="")
+    job_detail_label.pack(side=tk.LEFT, padx=(10, 0))
+
+    btn_cancel_all = tk.Button(job_frame, text="대기 작업 모두 취소", command=cancel_all_jobs)
+    btn_cancel_all.pack(side=tk.RIGHT)
+
+    btn_cancel = tk.Button(job_frame, text="⏹ 현재 작업 취소", command=cancel_current_job)
+    btn_cancel.pack(side=tk.RIGHT, padx=(0, 5))
+
+    job_queue_label = tk.Label(job_frame, text="")
+    job_queue_label.pack(side=tk.RIGHT, padx=(0, 10))
+
+    # 다음 작업 한 번만 cProfile로 실행해 PROFILE_DIR에 저장
+    profile_next_var = tk.BooleanVar(value=False)
+    profile_check = tk.Checkbutton(job_frame, text="다음 작업 프로파일", variable=profile_next_var)
+    profile_check.pack(side=tk.RIGHT, padx=(0, 10))
+
+    # 결과창 도구 (검색/오류 이동/전체 복사·저장)
+    result_tool_frame = tk.Frame(window)
+    result_tool_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+    result_search_entry = tk.Entry(result_tool_frame, width=30)
+    result_search_entry.pack(side=tk.LEFT)
+    result_search_entry.bind('<Return>', lambda event: search_result())
+    result_search_entry.bind('<Shift-Return>', lambda event: search_result(backward=True))
+
+    btn_search_prev = tk.Button(result_tool_frame, text="▲", command=lambda: search_result(backward=True))
+    btn_search_prev.pack(side=tk.LEFT, padx=(5, 0))
+
+    btn_search_next = tk.Button(result_tool_frame, text="▼ 찾기", command=search_result)
+    btn_search_next.pack(side=tk.LEFT, padx=(2, 0))
+
+    btn_error_prev = tk.Button(result_tool_frame, text="◀ 이전 오류", command=lambda: find_in_result(ERROR_LINE_PREFIX, backward=True))
+    btn_error_prev.pack(side=tk.LEFT, padx=(15, 0))
+
+    btn_error_next = tk.Button(result_tool_frame, text="다음 오류 ▶", command=lambda: find_in_result(ERROR_LINE_PREFIX))
+    btn_error_next.pack(side=tk.LEFT, padx=(2, 0))
+
+    error_number_label = tk.Label(result_tool_frame, text="오류 #")
+    error_number_label.pack(side=tk.LEFT, padx=(10, 0))
+
+    error_number_entry = tk.Entry(result_tool_frame, width=8)
+    error_number_entry.pack(side=tk.LEFT)
+    error_number_entry.bind('<Return>', goto_error_number)
+
+    btn_save_result = tk.Button(result_tool_frame, text="💾 전체 저장", command=save_result_output)
+    btn_save_result.pack(side=tk.RIGHT)
+
+    btn_copy_result = tk.Button(result_tool_frame, text="📋 전체 복사", command=copy_result_output)
+    btn_copy_result.pack(side=tk.RIGHT, padx=(0, 5))
+
+    result_position_label = tk.Label(result_tool_frame, text="", fg="gray40")
+    result_position_label.pack(side=tk.RIGHT, padx=(0, 10))
+
+    frame = tk.Frame(window)
+    frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
 
-btn_sql = tk.Button(window, text="엑셀 파일 선택 및 SQL 변환", command=generate_sql_from_excel, bg="lightblue")
-btn_sql.pack(pady=(10, 5))
+    x_scrollbar = tk.Scrollbar(frame, orient=tk.HORIZONTAL)
+    x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
 
-btn_analyze = tk.Button(window, text="엑셀 파일 선택 및 수용가 통계 분석", command=analyze_excel_customer_stats, bg="lightgreen")
-btn_analyze.pack(pady=(0, 5))
+    # 세로 스크롤은 결과창이 아니라 출력 저장소 기준 (보이는 줄만 그림)
+    y_scrollbar = tk.Scrollbar(frame, command=on_result_yscroll)
+    y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-btn_dup = tk.Button(window, text="🔍 종합검사 (적색/노란색 음영 표시)", command=mark_duplicates_in_place, bg="salmon")
-btn_dup.pack(pady=(0, 10))
+    result_text = tk.Text(frame, wrap=tk.NONE, xscrollcommand=x_scrollbar.set)
+    result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-frame = tk.Frame(window)
-frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    x_scrollbar.config(command=result_text.xview)
 
-x_scrollbar = tk.Scrollbar(frame, orient=tk.HORIZONTAL)
-x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+    result_store = new_result_store()
+    result_view['line_height'] = tkfont.Font(font=result_text.cget('font')).metrics('linespace')
+    result_text.tag_configure('perf', foreground='gray40')
+    result_text.tag_configure('error', foreground='red3')
+    result_text.tag_configure('found', background='yellow')
+    result_text.tag_configure('mark', background='light cyan')
+    result_text.tag_bind('fold_head', '<Button-1>', toggle_result_fold)
+    result_text.bind('<Configure>', lambda event: render_result())
+    for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+        result_text.bind(sequence, on_result_wheel)
+    result_text.bind('<Prior>', lambda event: scroll_result(-result_page_size()) or 'break')
+    result_text.bind('<Next>', lambda event: scroll_result(result_page_size()) or 'break')
+    result_text.bind('<Control-Home>', lambda event: scroll_result(top=0) or 'break')
+    result_text.bind('<Control-End>', lambda event: scroll_result(top=visible_count(result_store)) or 'break')
 
-y_scrollbar = tk.Scrollbar(frame)
-y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    threading.Thread(target=job_worker, daemon=True).start()
+    window.after(JOB_POLL_MS, poll_job_events)
+    window.bind('<Expose>', on_window_expose)
 
-result_text = tk.Text(frame, wrap=tk.NONE, xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
-result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    window.mainloop()
 
-x_scrollbar.config(command=result_text.xview)
-y_scrollbar.config(command=result_text.yview)
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.compact:
+        enable_compact_frames()
+    if args.command is None:
+        global startup_exit
+        startup_exit = args.startup_time
+        run_gui()
+        return 0
+    if args.profile:
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(args.func, args)
+        finally:
+            profiler.dump_stats(args.profile)
+            print(f"📈 프로파일 저장: {args.profile}", file=sys.stderr)
+    return args.func(args)
 
-window.mainloop()
+if __name__ == "__main__":
+    sys.exit(main())
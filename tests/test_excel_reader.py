@@ -0,0 +1,61 @@
+# =============================================
+# 📌 openpyxl 스트리밍 읽기 회귀 테스트: pd.read_excel(dtype=str).fillna('')와 같은 결과인지 비교
+# =============================================
+
+import os
+import sys
+from datetime import date, datetime, time
+
+import openpyxl
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import PyRun  # noqa: E402
+
+HEADER = ['번호', 2024, 3.5, 7.0, None, '이름', '이름', True, datetime(2024, 1, 5), 'NA', 'null', 2024]
+ROWS = [
+    [1, 'a', 1.0, 0, 'x', '#N/A', 'NA', True, datetime(2024, 1, 5, 10, 30), '', 1, 'z'],
+    [2, False, 1.5, False, None, '#DIV/0!', 'b', False, date(2024, 1, 6), 'null', True, 0],
+    [None] * 12,
+    [3, 0, 1e20, 1, ' s ', 'null', '', None, time(10, 30), 'None', 1.0, None],
+    [4, 12345678901234567890, -0.0, True, 1 / 3, True, 'c', 1, datetime(2024, 1, 5), 'nan', 2, 2.5],
+    [None] * 12,
+    [5, '0012', 1e-7, 0.0, '=', 'n/a', 'NULL', 0, datetime(1900, 1, 1), ' ', 3, '#REF!'],
+    [None] * 12,
+    [None] * 12,
+]
+# 오류 셀 (값만 읽으면 문자열과 구분할 수 없으므로 pandas와 같으려면 실제 오류 셀이어야 함)
+ERROR_CELLS = ['F3', 'L8']
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(HEADER)
+    for row in ROWS:
+        ws.append(row)
+    for ref in ERROR_CELLS:
+        ws[ref].data_type = 'e'
+    path = str(tmp_path / 'parity.xlsx')
+    wb.save(path)
+    return path
+
+def expected(path, usecols=None):
+    return pd.read_excel(path, dtype=str, usecols=usecols).fillna('')
+
+def test_matches_read_excel(workbook_path):
+    df, _ = PyRun.read_sheet(workbook_path, reader='openpyxl', compact=False)
+    pd.testing.assert_frame_equal(df, expected(workbook_path), check_dtype=False, check_index_type=False)
+
+def test_header_types_kept(workbook_path):
+    columns = list(next(PyRun.iter_sheet_openpyxl(workbook_path)).columns)
+    assert columns == list(expected(workbook_path).columns)
+    assert columns[1] == 2024 and columns[3] == 7 and isinstance(columns[3], int) and columns[11] == '2024.1'
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 100])
+def test_chunks_match(workbook_path, chunk_rows):
+    chunks = list(PyRun.iter_sheet_openpyxl(workbook_path, PyRun.IMPORT_USECOLS[:8], chunk_rows))
+    df = pd.concat(chunks)
+    pd.testing.assert_frame_equal(df, expected(workbook_path, PyRun.IMPORT_USECOLS[:8]),
+                                  check_dtype=False, check_index_type=False)
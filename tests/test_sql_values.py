@@ -0,0 +1,153 @@
+# =============================================
+# 📌 SQL VALUES 회귀 테스트: 벡터화한 prepare_sql_rows + format_sql_values 결과가
+#    예전 df.iterrows() 루프와 글자 하나까지 같은지 비교
+# =============================================
+
+import os
+import random
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import PyRun  # noqa: E402
+
+SITE_SQ = 4
+COMPANY_SQ = 9
+
+# user-019부터 읽을 수 있게 된 날짜 (예전 루프는 오류 행) → 새 결과
+NEWLY_PARSED_DATES = {
+    '45000': '2023-03-15',
+    '45000.5': '2023-03-15',
+    '99999': '2173-10-13',
+    '2024년 1월 5일': '2024-01-05',
+    '2024년1월5일': '2024-01-05',
+}
+
+# 예전 루프는 값을 그대로 '{}'에 넣어 작은따옴표가 있으면 깨진 SQL이 나왔다. 지금은 값 안의 '를 ''로 쓴다.
+# 오류 메시지/수용가번호 목록(success_admin_no_list)에는 원래 값이 그대로 나오므로,
+# 아래 컬럼만 미리 두 번 써 넣은 프레임을 예전 루프에 넣으면 새 결과와 같아야 한다.
+QUOTED_TEXT_COLUMNS = ['수용가명', '구주소', '신주소', '업종', '검침원', '계량기번호', '단말 주번호']
+
+def baseline_values(df, selected_num_len):
+    """기준 커밋의 generate_sql_from_excel 루프 (결과창 출력 대신 값을 반환)"""
+    admin_no_counts = df['수용가번호'].value_counts()
+    duplicated_admin_nos = set(admin_no_counts[admin_no_counts > 1].index)
+
+    values_list = []
+    success_count = 0
+    fail_count = 0
+    success_admin_no_list = []
+
+    validation_cases = [
+        ("수용가번호 길이 검사", lambda row: len(row['수용가번호']) == selected_num_len, "수용가번호 길이 불일치"),
+        ("수용가번호 중복 검사", lambda row: row['수용가번호'] not in duplicated_admin_nos, "수용가번호 중복"),
+        ("수용가 전화번호 길이 검사", lambda row: len(row['수용가 전화번호']) < 14, "수용가 전화번호 13자리 초과"),
+    ]
+
+    for idx_row, row in df.iterrows():
+        try:
+            for case_num, (desc, check_func, err_msg) in enumerate(validation_cases, 1):
+                if not check_func(row):
+                    raise ValueError(f"[CASE #{case_num}] {err_msg} (값: {row['수용가번호']})")
+
+            def safe_float(val, col):
+                if val == '':
+                    raise ValueError(f"{col} 값이 비어있음")
+                return float(val)
+
+            def safe_int(val, col):
+                if val == '':
+                    raise ValueError(f"{col} 값이 비어있음")
+                return int(val)
+
+            values = (
+                row['수용가명'], row['수용가번호'], row['구주소'], row['신주소'],
+                safe_float(row['경도'], '경도'), safe_float(row['위도'], '위도'),
+                row['업종'], SITE_SQ, COMPANY_SQ,
+                row['수용가 전화번호'], row['수용가 대상 년도'], row['검침원'],
+                safe_int(row['검침일'], '검침일'), row['계량기번호'],
+                safe_int(row['구경'], '구경'), row['통신'], row['단말 부번호'],
+                row['단말 주번호'], COMPANY_SQ,
+                f"{pd.to_datetime(row['단말 설치일']).date()}"
+            )
+
+            formatted = "('{}', '{}', '{}', '{}', {}, {}, '{}', {}, {}, '{}', '{}', '{}', {}, '{}', {}, '{}', '{}', '{}', {}, '{}'::timestamp)".format(*values)
+            values_list.append(formatted)
+            success_admin_no_list.append(row['수용가번호'])
+            success_count += 1
+
+        except Exception as e:
+            values_list.append(f"-- [ERROR #{idx_row+1}] {e}")
+            fail_count += 1
+
+    return values_list, success_admin_no_list, success_count, fail_count
+
+def make_frame(rows, seed, dates):
+    """빈값, 숫자가 아닌 값, 중복 수용가번호, 긴 전화번호, 여러 날짜 표기가 섞인 COLUMNS 프레임"""
+    r = random.Random(seed)
+    pick = lambda *values: r.choice(values)
+    data = []
+    for i in range(rows):
+        data.append([
+            pick(f"고객{i}", "", "홍길동", "O'Brien", "''"),
+            pick(f"{r.randrange(10 ** 12, 10 ** 13)}", "123", "1111111111111", "2222222222222", ""),
+            pick("서울시 강남구 역삼동 1", "", "역삼동 1'2"), pick("신주소", "'); DROP TABLE t; --"),
+            pick("127.1", "", "abc", "1e3", " 37.5 ", "127", "-0.0", "nan"),
+            pick("37.5", "", "37,5", "1_0"),
+            pick("가정용", "일반용", "'"), "본사", "1블록",
+            pick("010-1234-5678", "010-1234-56789999", "", "0212345678901"),
+            "2024", pick("검침원01", "검침원'"),
+            pick("15", "", "1.5", "07", " 3 ", "+4", "x"),
+            pick(f"M{i}", f"M'{i}"),
+            pick("15", "x", "", "20.0", "025"),
+            "LTE", f"{i:07d}", pick(f"T{i:08d}", f"T'{i:07d}"), "A사",
+            pick(*dates),
+        ])
+    return pd.DataFrame(data, columns=PyRun.COLUMNS)
+
+def doubled_quotes(df):
+    """QUOTED_TEXT_COLUMNS의 작은따옴표를 두 번 써 넣은 사본 (예전 루프 입력용)"""
+    df = df.copy()
+    for col in QUOTED_TEXT_COLUMNS:
+        df[col] = df[col].str.replace("'", "''", regex=False)
+    return df
+
+SAME_DATES = ("2024-01-05", "2024.01.05", "2024/1/5", "20240105", "", "abc", "2024-01-05 10:00:00",
+              "2024-13-01", "1/5/2024", "2024-02-30", "123456", "4500")
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("selected_num_len", [13, 3])
+def test_values_match_row_loop(seed, selected_num_len):
+    df = make_frame(600, seed, SAME_DATES)
+    assert PyRun.build_sql_values(df, selected_num_len) == baseline_values(doubled_quotes(df), selected_num_len)
+
+def test_empty_frame():
+    df = pd.DataFrame(columns=PyRun.COLUMNS)
+    assert PyRun.build_sql_values(df, 13) == baseline_values(df, 13) == ([], [], 0, 0)
+
+def test_newly_parsed_dates():
+    """엑셀 일련번호와 'YYYY년 M월 D일'만 예전 루프와 다르다 (오류 행 → 날짜)"""
+    df = make_frame(40, 0, tuple(NEWLY_PARSED_DATES))
+    df['수용가번호'] = [f"{10 ** 12 + i}" for i in range(len(df))]
+    for col, value in (('경도', '127.1'), ('위도', '37.5'), ('수용가 전화번호', '010-1234-5678'), ('검침일', '15'), ('구경', '15')):
+        df[col] = value
+    old, _, old_success, _ = baseline_values(df, 13)
+    new, _, new_success, _ = PyRun.build_sql_values(df, 13)
+    assert old_success == 0 and new_success == len(df)
+    for line, raw_date in zip(new, df['단말 설치일']):
+        assert line.endswith(f"'{NEWLY_PARSED_DATES[raw_date]}'::timestamp)")
+    assert all(line.startswith('-- [ERROR #') for line in old)
+
+def test_apostrophes_doubled():
+    """값 안의 작은따옴표는 VALUES 문자열과 수용가번호 목록 SQL에서 ''로 나오고, 반환 목록은 원래 값"""
+    df = make_frame(1, 0, ("2024-01-05",))
+    for col, value in (('수용가번호', "123'567890123"), ('경도', '127.1'), ('위도', '37.5'), ('수용가 전화번호', '010-1234-5678'),
+                       ('검침일', '15'), ('구경', '15'), ('수용가명', "O'Brien"), ('신주소', "'); DROP TABLE t; --")):
+        df[col] = value
+    values, admin_nos, success, _ = PyRun.build_sql_values(df, 13)
+    assert success == 1 and admin_nos == ["123'567890123"]
+    assert values[0].startswith("('O''Brien', '123''567890123', ")
+    assert ", '''); DROP TABLE t; --', " in values[0]
+    assert PyRun.quote_sql_list(admin_nos + ["x"]) == "'123''567890123','x'"